@@ -0,0 +1,69 @@
+"""Measure CLI startup: module import cost and ``--help`` wall time.
+
+Runs ``python -X importtime`` on ``dataset_insights.cli`` and lists the slowest
+imports by cumulative time, then times ``dataset-insights --help`` end to end.
+Heavy dependencies (pandas, numpy, matplotlib, seaborn) should not appear: the
+CLI imports them inside the commands that use them.
+``tests/test_cli.py`` checks the same property on every run.
+
+Usage:
+    python benchmarks/bench_import_time.py [--module dataset_insights.cli] [--top 10] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def help_wall_time(repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "dataset_insights.cli", "--help"],
+            capture_output=True,
+            check=True,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="dataset_insights.cli")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    times = import_times(args.module)
+    print(f"import {args.module}: {times.get(args.module, 0) / 1000:.1f} ms cumulative")
+    for name, micros in sorted(times.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {micros / 1000:>8.1f} ms  {name}")
+    heavy = sorted({name.split(".")[0] for name in times} & {"numpy", "pandas", "matplotlib", "seaborn"})
+    print(f"heavy dependencies imported: {', '.join(heavy) or 'none'}")
+    print(f"--help wall time (best of {args.repeat}): {help_wall_time(args.repeat) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark distinct-token parseability against per-cell parsing.
+
+The previous implementation ran ``pd.to_numeric`` and ``pd.to_datetime(errors="coerce")``
+over every non-empty cell of a text column. Without a format, ``to_datetime`` infers one
+from the first value and, when that fails, hands each cell to dateutil.
+
+``parseable_counts`` parses each distinct token once and weights the result by the
+token's count. Datetimes use the format inferred from the first value, applied
+vectorized, and only fall back to dateutil (per distinct token) when no format can be
+inferred. The two paths must report identical counts; the benchmark checks that.
+
+The synthetic frame looks like a log export: ISO timestamps, a few log levels, hosts,
+status codes, free-text messages and day/month dates.
+
+Usage:
+    python benchmarks/bench_parseability.py [--rows 1000000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from dataset_insights.analyze import distinct_tokens, infer_datetime_format, parseable_counts
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Log-like text columns with a mix of cardinalities and parse outcomes."""
+    rng = np.random.default_rng(seed)
+    seconds = np.sort(rng.integers(0, 30 * 86_400, rows))
+    timestamps = pd.Timestamp("2024-03-01") + pd.to_timedelta(seconds, "s")
+    messages = np.array(
+        [f"request {verb} finished" for verb in ("GET", "PUT", "POST", "DELETE")]
+        + [f"retry {n} of 5" for n in range(1, 6)]
+        + ["cache miss", "connection reset by peer", "ok"]
+    )
+    return pd.DataFrame(
+        {
+            "timestamp": pd.Series(timestamps.strftime("%Y-%m-%dT%H:%M:%S")).astype("str"),
+            "level": pd.Series(rng.choice(["INFO", "WARN", "ERROR", "DEBUG"], rows)).astype("str"),
+            "host": pd.Series(rng.integers(0, 200, rows)).map(lambda v: f"web-{v:03d}").astype("str"),
+            "status": pd.Series(rng.choice(["200", "201", "404", "500", "n/a"], rows)).astype("str"),
+            "message": pd.Series(rng.choice(messages, rows)).astype("str"),
+            "day": pd.Series(
+                (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), "D"))
+                .strftime("%d %b %Y")
+            ).astype("str"),
+        }
+    )
+
+
+def legacy_counts(candidate: pd.Series) -> tuple[int, int]:
+    numeric = int(pd.to_numeric(candidate, errors="coerce").notna().sum())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=UserWarning)
+        datetime = int(pd.to_datetime(candidate, errors="coerce").notna().sum())
+    return numeric, datetime
+
+
+def distinct_counts(candidate: pd.Series) -> tuple[int, int]:
+    tokens, weights = distinct_tokens(candidate)
+    return parseable_counts(tokens, weights, infer_datetime_format(tokens))
+
+
+def _best_of(fn, candidate: pd.Series, repeat: int) -> tuple[float, tuple[int, int]]:
+    best = float("inf")
+    result = (0, 0)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(candidate)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"{args.rows:,} rows x {df.shape[1]} text columns (best of {args.repeat})")
+    print(f"{'column':<10} {'distinct':>9} {'per-cell':>10} {'distinct':>10} {'speedup':>8}")
+    total_legacy = total_distinct = 0.0
+    for col in df.columns:
+        stripped = df[col].str.strip()
+        candidate = stripped.loc[stripped.ne("")]
+        legacy_time, expected = _best_of(legacy_counts, candidate, args.repeat)
+        distinct_time, actual = _best_of(distinct_counts, candidate, args.repeat)
+        if actual != expected:
+            raise SystemExit(f"{col}: distinct-token counts {actual} != per-cell {expected}")
+        total_legacy += legacy_time
+        total_distinct += distinct_time
+        print(
+            f"{col:<10} {candidate.nunique():>9,} {legacy_time:>9.3f}s {distinct_time:>9.3f}s "
+            f"{legacy_time / distinct_time:>7.1f}x"
+        )
+    print(
+        f"{'total':<10} {'':>9} {total_legacy:>9.3f}s {total_distinct:>9.3f}s "
+        f"{total_legacy / total_distinct:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
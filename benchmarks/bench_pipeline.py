@@ -0,0 +1,239 @@
+"""Benchmark every stage of the analyze pipeline on a synthetic CSV.
+
+The CSV comes from ``synthetic.py``, so the same options give the same bytes
+on every commit. The suite times loading (``load_csv``, plus the arrow engine
+when pyarrow is installed), ``coerce_suspicious_to_nan``, each ``compute_*``
+function and the other per-frame checks, the whole of ``analyze_frame``, the
+plot inputs, every report writer and every plot. Each target runs
+``--repeat`` times; the best and median wall times are kept.
+
+``--output`` saves the results as JSON, together with the commit, library
+versions and dataset spec. ``--compare`` prints two saved runs side by side,
+and flags targets that slowed by more than ``--threshold``:
+
+    python benchmarks/bench_pipeline.py --rows 200000 --output before.json
+    git checkout my-branch
+    python benchmarks/bench_pipeline.py --rows 200000 --output after.json
+    python benchmarks/bench_pipeline.py --compare before.json after.json
+
+Usage:
+    python benchmarks/bench_pipeline.py [synthetic.py options] [--repeat 3]
+        [--only SUBSTRING] [--no-plots] [--output results.json]
+    python benchmarks/bench_pipeline.py --compare OLD.json NEW.json [--threshold 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from synthetic import add_spec_arguments, spec_from_args, write_csv
+
+from dataset_insights import __version__
+from dataset_insights.analyze import (
+    analyze_frame,
+    coerce_suspicious_to_nan,
+    compute_correlation,
+    compute_duplicates,
+    compute_missingness,
+    compute_outliers,
+    compute_parseability,
+    compute_quantiles,
+    compute_schema,
+    compute_summary,
+    detect_column_warnings,
+    load_csv,
+    profile_frame,
+)
+from dataset_insights.plotdata import plot_inputs_from_frame
+from dataset_insights.reports import write_reports
+
+RESULTS_SCHEMA_VERSION = 1
+_MIN_FLAGGED_SECONDS = 0.001
+
+
+def _git(*args: str) -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+class _StageTimes:
+    """A ``stage`` callback for ``write_reports`` / ``render_plots`` collecting per-stage runs."""
+
+    def __init__(self) -> None:
+        self.runs: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.runs[name].append(time.perf_counter() - start)
+
+
+def _time(func: Callable[[], object], repeat: int) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run_suite(
+    csv_path: Path, outdir: Path, repeat: int, only: str | None, plots: bool
+) -> dict[str, list[float]]:
+    """Wall times of every target, keyed by target name."""
+    raw = load_csv(csv_path)
+    df, audit = coerce_suspicious_to_nan(raw)
+    profiles = profile_frame(df)
+    quantiles = compute_quantiles(df)
+    result = analyze_frame(df, audit)
+    result.plot_inputs = plot_inputs_from_frame(df, result)
+
+    targets: dict[str, Callable[[], object]] = {"load_csv": lambda: load_csv(csv_path)}
+    if importlib.util.find_spec("pyarrow") is not None:
+        targets["load_csv[arrow]"] = lambda: load_csv(csv_path, engine="arrow")
+    targets.update(
+        {
+            "coerce_suspicious_to_nan": lambda: coerce_suspicious_to_nan(raw),
+            "profile_frame": lambda: profile_frame(df),
+            "compute_quantiles": lambda: compute_quantiles(df),
+            "compute_summary": lambda: compute_summary(df, quantiles),
+            "compute_schema": lambda: compute_schema(df, profiles),
+            "compute_missingness": lambda: compute_missingness(df),
+            "compute_duplicates": lambda: compute_duplicates(df),
+            "compute_outliers": lambda: compute_outliers(df, quantiles),
+            "compute_correlation": lambda: compute_correlation(df),
+            "compute_parseability": lambda: compute_parseability(df, profiles),
+            "detect_column_warnings": lambda: detect_column_warnings(df, profiles=profiles),
+            "analyze_frame": lambda: analyze_frame(df, audit),
+            "plot_inputs_from_frame": lambda: plot_inputs_from_frame(df, result),
+        }
+    )
+    timings = {
+        name: _time(func, repeat) for name, func in targets.items() if only is None or only in name
+    }
+
+    # Writers and plots are timed through their stage hook, one entry per file.
+    stages = _StageTimes()
+    for _ in range(repeat):
+        write_reports(result, outdir, stages.stage)
+    if plots and (only is None or "plot" in only):
+        from dataset_insights.plots import render_plots
+
+        for _ in range(repeat):
+            render_plots(result.plot_inputs, outdir, stages.stage)
+    timings.update((name, runs) for name, runs in stages.runs.items() if only is None or only in name)
+    return timings
+
+
+def _summaries(timings: dict[str, list[float]]) -> dict[str, dict[str, object]]:
+    return {
+        name: {
+            "best_seconds": round(min(runs), 6),
+            "median_seconds": round(statistics.median(runs), 6),
+            "runs": [round(run, 6) for run in runs],
+        }
+        for name, runs in timings.items()
+    }
+
+
+def _print_results(payload: dict) -> None:
+    results = payload["results"]
+    width = max(len("target"), *(len(name) for name in results))
+    print(f"{'target':<{width}} {'best s':>9} {'median s':>9}")
+    for name, row in results.items():
+        print(f"{name:<{width}} {row['best_seconds']:>9.4f} {row['median_seconds']:>9.4f}")
+
+
+def compare(old_path: Path, new_path: Path, threshold: float) -> int:
+    """Print best times of two saved runs; returns 1 if any target slowed past ``threshold``."""
+    old, new = (json.loads(Path(path).read_text()) for path in (old_path, new_path))
+    if old["spec"] != new["spec"]:
+        print("warning: the runs used different dataset specs", file=sys.stderr)
+    names = [*new["results"], *(name for name in old["results"] if name not in new["results"])]
+    width = max(len("target"), *(len(name) for name in names))
+    print(f"{'target':<{width}} {str(old.get('commit'))[:10]:>10} {str(new.get('commit'))[:10]:>10} {'ratio':>7}")
+    slower = 0
+    for name in names:
+        before = old["results"].get(name, {}).get("best_seconds")
+        after = new["results"].get(name, {}).get("best_seconds")
+        if before is None or after is None:
+            cells = [f"{value:.4f}" if value is not None else "-" for value in (before, after)]
+            print(f"{name:<{width}} {cells[0]:>10} {cells[1]:>10} {'-':>7}")
+            continue
+        ratio = after / before if before else float("inf")
+        # Sub-millisecond targets are too noisy to flag.
+        flag = "  slower" if ratio > 1 + threshold and after >= _MIN_FLAGGED_SECONDS else ""
+        slower += bool(flag)
+        print(f"{name:<{width}} {before:>10.4f} {after:>10.4f} {ratio:>6.2f}x{flag}")
+    return 1 if slower else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default=None, help="Run only targets whose name contains this.")
+    parser.add_argument("--no-plots", action="store_true", help="Skip the plot targets.")
+    parser.add_argument("--output", type=Path, default=None, help="Save results as JSON here.")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"))
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Slowdown flagged by --compare (0.1 = 10%%)."
+    )
+    args = parser.parse_args()
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+
+    spec = spec_from_args(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "synthetic.csv"
+        write_csv(spec, csv_path)
+        size = csv_path.stat().st_size
+        timings = run_suite(csv_path, Path(tmp) / "reports", args.repeat, args.only, not args.no_plots)
+
+    payload = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "versions": {
+            "dataset_insights": __version__,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "spec": spec.to_dict(),
+        "csv_bytes": size,
+        "repeat": args.repeat,
+        "results": _summaries(timings),
+    }
+    print(f"dataset: {spec.rows:,} rows x {spec.columns} columns ({size / 2**20:.1f} MiB)")
+    _print_results(payload)
+    if args.output is not None:
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"results written to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Deterministic synthetic CSVs for benchmarks.
+
+``make_frame`` builds a frame from a ``DatasetSpec`` and the same spec and seed
+always give the same bytes, so timings from different commits measure the
+same input. The spec controls:
+
+- rows and columns;
+- the dtype mix, as weights for int, float, text, datetime and bool columns;
+- the null rate;
+- the placeholder rate, for tokens such as ``Unknown`` or ``?!`` that the
+  analysis treats as missing (in text and datetime columns, so that numeric
+  columns still parse as numbers);
+- the duplicate rate, the fraction of rows that repeat an earlier row;
+- the cardinality of text and int columns.
+
+Usage:
+    python benchmarks/synthetic.py OUT.csv [--rows 100000] [--columns 40]
+        [--mix int=2,float=3,text=3,datetime=1,bool=1] [--null-rate 0.05]
+        [--placeholder-rate 0.01] [--duplicate-rate 0.02] [--cardinality 1000] [--seed 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+DTYPES = ("int", "float", "text", "datetime", "bool")
+# Variants the CSV reader keeps (its NA tokens are exact and lowercase), so they reach
+# ``coerce_suspicious_to_nan``.
+PLACEHOLDERS = np.array(["Unknown", "MISSING", " n/a ", "Not Available", "?!", "TBD"])
+
+
+def _default_mix() -> dict[str, float]:
+    return {"int": 2, "float": 3, "text": 3, "datetime": 1, "bool": 1}
+
+
+@dataclass
+class DatasetSpec:
+    rows: int = 100_000
+    columns: int = 40
+    mix: dict[str, float] = field(default_factory=_default_mix)
+    null_rate: float = 0.05
+    placeholder_rate: float = 0.01
+    duplicate_rate: float = 0.02
+    cardinality: int = 1_000
+    seed: int = 0
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+def column_kinds(spec: DatasetSpec) -> list[str]:
+    """Column dtypes in order, split by ``spec.mix`` (largest remainders first) and interleaved."""
+    weights = np.array([max(spec.mix.get(kind, 0.0), 0.0) for kind in DTYPES], dtype=float)
+    if weights.sum() <= 0:
+        raise ValueError("mix needs at least one positive weight")
+    exact = weights / weights.sum() * spec.columns
+    counts = np.floor(exact).astype(int)
+    for index in np.argsort(-(exact - counts), kind="stable")[: spec.columns - counts.sum()]:
+        counts[index] += 1
+    pending = {kind: int(count) for kind, count in zip(DTYPES, counts)}
+    kinds: list[str] = []
+    while len(kinds) < spec.columns:
+        for kind in DTYPES:
+            if pending[kind]:
+                kinds.append(kind)
+                pending[kind] -= 1
+    return kinds
+
+
+def _column(kind: str, rows: int, cardinality: int, rng: np.random.Generator) -> pd.Series:
+    if kind == "int":
+        return pd.Series(rng.integers(0, cardinality, rows), dtype="int64")
+    if kind == "float":
+        return pd.Series(rng.lognormal(3, 1, rows).round(3))
+    if kind == "text":
+        vocabulary = np.array([f"value_{i:06d}" for i in range(cardinality)], dtype=object)
+        return pd.Series(vocabulary[rng.zipf(1.3, rows) % cardinality], dtype=object)
+    if kind == "datetime":
+        seconds = rng.integers(0, 365 * 86_400, rows)
+        stamps = pd.Timestamp("2024-01-01") + pd.to_timedelta(seconds, "s")
+        return pd.Series(stamps.strftime("%Y-%m-%d %H:%M:%S"), dtype=object)
+    return pd.Series(rng.random(rows) < 0.5)
+
+
+def make_frame(spec: DatasetSpec) -> pd.DataFrame:
+    """The synthetic frame for ``spec``, as it would be written to CSV (dirty values included)."""
+    rng = np.random.default_rng(spec.seed)
+    data: dict[str, pd.Series] = {}
+    for position, kind in enumerate(column_kinds(spec)):
+        series = _column(kind, spec.rows, max(spec.cardinality, 1), rng)
+        nulls = rng.random(spec.rows) < spec.null_rate
+        placeholders = ~nulls & (rng.random(spec.rows) < spec.placeholder_rate)
+        if kind in ("text", "datetime") and placeholders.any():
+            series = series.astype(object)
+            series[placeholders] = PLACEHOLDERS[rng.integers(0, len(PLACEHOLDERS), placeholders.sum())]
+        data[f"{kind}_{position}"] = series.mask(nulls)
+    frame = pd.DataFrame(data)
+
+    repeats = int(spec.rows * spec.duplicate_rate)
+    if repeats and spec.rows > 1:
+        size = min(repeats, spec.rows - 1)
+        targets = np.sort(rng.choice(np.arange(1, spec.rows), size=size, replace=False))
+        sources = (rng.random(len(targets)) * targets).astype(np.int64)  # an earlier row
+        order = np.arange(spec.rows)
+        for target, source in zip(targets, sources):
+            order[target] = order[source]  # sources settle first, so copies stay exact
+        frame = frame.take(order).reset_index(drop=True)
+    return frame
+
+
+def write_csv(spec: DatasetSpec, path) -> None:
+    make_frame(spec).to_csv(path, index=False)
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """``"int=2,text=1"`` -> ``{"int": 2.0, "text": 1.0}``; unnamed dtypes get weight 0."""
+    mix = {kind: 0.0 for kind in DTYPES}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        kind, _, weight = item.partition("=")
+        if kind not in mix:
+            raise argparse.ArgumentTypeError(f"unknown dtype {kind!r}; choose from {', '.join(DTYPES)}")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument("--rows", type=int, default=defaults.rows)
+    parser.add_argument("--columns", type=int, default=defaults.columns)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=defaults.mix,
+        help="Column dtype weights, e.g. int=2,float=3,text=3,datetime=1,bool=1.",
+    )
+    parser.add_argument("--null-rate", type=float, default=defaults.null_rate)
+    parser.add_argument("--placeholder-rate", type=float, default=defaults.placeholder_rate)
+    parser.add_argument("--duplicate-rate", type=float, default=defaults.duplicate_rate)
+    parser.add_argument("--cardinality", type=int, default=defaults.cardinality)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec(
+        rows=args.rows,
+        columns=args.columns,
+        mix=args.mix,
+        null_rate=args.null_rate,
+        placeholder_rate=args.placeholder_rate,
+        duplicate_rate=args.duplicate_rate,
+        cardinality=args.cardinality,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out", help="CSV file to write.")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    spec = spec_from_args(args)
+    write_csv(spec, args.out)
+    print(f"wrote {args.out}: {spec.rows:,} rows x {spec.columns} columns")
+
+
+if __name__ == "__main__":
+    main()
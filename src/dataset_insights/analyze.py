@@ -2,54 +2,71 @@
 
 from __future__ import annotations
 
+import codecs
 import csv
+import importlib.util
+import io
+import json
 import re
 import sys
 import warnings
 from collections import Counter
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
+import numpy as np
 import pandas as pd
 
+from .checks import (
+    OUTLIER_MIN_NONNULL,
+    PARSEABILITY_ACTIONABLE_HIGH,
+    PARSEABILITY_ACTIONABLE_LOW,
+    PARSEABILITY_COLUMNS,
+    QualityIssue,
+    coerce_issue,
+    column_issues,
+    iqr_bounds,
+    missingness_frame,
+    outlier_row,
+    outliers_frame,
+    parseability_issues,
+    parseability_row,
+    unique_examples,
+)
+# Thresholds and columns of checks.py, still importable from here as before.
+from .checks import (  # noqa: F401
+    CONSTANT_COLUMN_THRESHOLD,
+    HIGH_CARDINALITY_MIN_NONNULL,
+    HIGH_CARDINALITY_THRESHOLD,
+    MISSING_CRITICAL_THRESHOLD,
+    MISSING_WARN_THRESHOLD,
+    MIXED_TYPE_NUMERIC_THRESHOLD,
+    OUTLIER_COLUMNS,
+)
+from .defaults import CSV_ENGINES
+from .duplicates import DuplicateStats, count_duplicates, hash_rows
+from .readers import csv_source, is_columnar, open_columnar, open_input, pin_dtypes
+from .sketches import HyperLogLog, KLLSketch
 
-@dataclass
-class QualityIssue:
-    """A single data-quality finding produced by domain-agnostic checks."""
-
-    rule: str
-    severity: str
-    column: str | None
-    count: int
-    pct: float
-    examples: list[str] = field(default_factory=list)
-    message: str = ""
-    suggestion: str = ""
+if TYPE_CHECKING:
+    from .plotdata import PlotInputs
+    from .sample import SampleInfo
 
-    def to_dict(self) -> dict[str, Any]:
-        return {
-            "rule": self.rule,
-            "severity": self.severity,
-            "column": self.column,
-            "count": self.count,
-            "pct": round(self.pct, 2),
-            "examples": self.examples,
-            "message": self.message,
-            "suggestion": self.suggestion,
-        }
+# Wraps one named step of a run; ``metrics.RunMetrics.stage`` times it for
+# ``analyze --profile-run``, and the default ``nullcontext`` does nothing.
+Stage = Callable[[str], AbstractContextManager[Any]]
+
+try:
+    from pandas.tseries.api import guess_datetime_format as _guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format as _guess_datetime_format
 
 
 DUPLICATE_EXAMPLE_CAP = 5
-OUTLIER_MIN_NONNULL = 10
-HIGH_CARDINALITY_THRESHOLD = 0.95
-HIGH_CARDINALITY_MIN_NONNULL = 20
-CONSTANT_COLUMN_THRESHOLD = 1
-MIXED_TYPE_NUMERIC_THRESHOLD = 0.50
-PARSEABILITY_ACTIONABLE_LOW = 20.0
-PARSEABILITY_ACTIONABLE_HIGH = 95.0
-MISSING_CRITICAL_THRESHOLD = 50.0  # percent missing → critical issue
-MISSING_WARN_THRESHOLD = 20.0      # percent missing → warn issue
 
 
 EXTRA_NA_VALUES = [
@@ -142,12 +159,6 @@ def _is_suspicious_keyword(value: object) -> bool:
     return isinstance(value, str) and value in SUSPICIOUS_KEYWORDS
 
 
-def _to_example_text(value: object) -> str:
-    if value is None:
-        return "None"
-    return str(value)
-
-
 def _to_serializable_scalar(value: object) -> object:
     try:
         if bool(pd.isna(value)):
@@ -160,25 +171,76 @@ def _to_serializable_scalar(value: object) -> object:
     return str(value)
 
 
-def _read_raw_header(path: Path, encoding: str) -> list[str]:
-    with path.open("r", encoding=encoding, newline="") as handle:
-        reader = csv.reader(handle)
-        return next(reader, [])
+SNIFF_BYTES = 2**20
+_SNIFF_LINES = 50
+_DELIMITERS = (",", ";", "\t", "|")
 
 
-def inspect_header_issues(path: str | Path) -> list[QualityIssue]:
-    """Read raw CSV headers and flag blank / duplicate names."""
-    path_obj = Path(path)
-    headers: list[str] = []
-    for encoding in ("utf-8", "latin-1"):
+@dataclass
+class CSVFormat:
+    """Encoding, delimiter and raw header of a CSV, sniffed from its first bytes.
+
+    ``header_text`` is the header record exactly as written (quotes included).
+    """
+
+    encoding: str
+    delimiter: str
+    header: list[str]
+    header_text: str
+
+
+def _sniff_delimiter(lines: list[str]) -> str:
+    """Comma, unless the header has no comma and another delimiter splits every
+    sampled line into the same number (> 1) of fields."""
+    sample = lines[:_SNIFF_LINES]
+    if not sample or len(next(csv.reader(sample[:1]), [])) > 1:
+        return ","
+    for delimiter in _DELIMITERS[1:]:
+        widths = {len(row) for row in csv.reader(sample, delimiter=delimiter) if row}
+        if len(widths) == 1 and widths.pop() > 1:
+            return delimiter
+    return ","
+
+
+def sniff_csv(path: str | Path, encoding: str | None = None) -> CSVFormat:
+    """Sniff encoding (UTF-8, else Latin-1), delimiter and header from the first
+    ``SNIFF_BYTES`` of ``path`` (decompressed); ``encoding`` skips the encoding check.
+
+    UTF-8 is a guess when only the prefix was checked: invalid bytes later in the
+    file surface as ``UnicodeDecodeError`` from the parse.
+    """
+    with open_input(path) as handle:
+        prefix = handle.read(SNIFF_BYTES)
+        complete = not handle.read(1)
+    if encoding is None:
         try:
-            headers = _read_raw_header(path_obj, encoding=encoding)
-            break
+            text = codecs.getincrementaldecoder("utf-8")().decode(prefix, final=complete)
+            encoding = "utf-8"
         except UnicodeDecodeError:
-            continue
-        except Exception:
-            return []
+            encoding = "latin-1"
+    if encoding != "utf-8":
+        text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(prefix, final=complete)
+
+    lines = text.splitlines(keepends=True)
+    if not complete:
+        lines = lines[:-1]  # may stop mid-line
+    delimiter = _sniff_delimiter(lines)
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = next(reader, [])
+    return CSVFormat(encoding, delimiter, header, "".join(lines[: reader.line_num]))
+
+
+def inspect_header_issues(path: str | Path) -> list[QualityIssue]:
+    """Read raw CSV headers and flag blank / duplicate names."""
+    try:
+        headers = sniff_csv(path).header
+    except Exception:
+        return []
+    return header_issues(headers)
+
 
+def header_issues(headers: list[str]) -> list[QualityIssue]:
+    """Flag blank / duplicate names in a raw CSV header (see ``sniff_csv``)."""
     if not headers:
         return []
 
@@ -227,104 +289,580 @@ def inspect_header_issues(path: str | Path) -> list[QualityIssue]:
     return issues
 
 
-def _coerce_issue(value: QualityIssue | dict[str, Any]) -> QualityIssue | None:
-    if isinstance(value, QualityIssue):
-        return value
-    if not isinstance(value, dict):
-        return None
+def csv_column_names(fmt: CSVFormat) -> list[str]:
+    """Column names as pandas reads them from the sniffed header: repeats renamed
+    ``name.1``, blanks ``Unnamed: N``."""
+    if not fmt.header_text:
+        return []
+    header = pd.read_csv(io.StringIO(fmt.header_text), nrows=0, sep=fmt.delimiter)
+    return [str(name) for name in header.columns]
 
-    try:
-        return QualityIssue(
-            rule=str(value.get("rule", "")),
-            severity=str(value.get("severity", "info")),
-            column=cast(str | None, value.get("column")),
-            count=int(value.get("count", 0)),
-            pct=float(value.get("pct", 0.0)),
-            examples=[str(v) for v in cast(list[Any], value.get("examples", []))],
-            message=str(value.get("message", "")),
-            suggestion=str(value.get("suggestion", "")),
-        )
-    except Exception:
-        return None
+
+@dataclass
+class ColumnSelection:
+    """Columns to analyze and the dtypes declared for them.
+
+    ``include`` and ``exclude`` are glob patterns (``fnmatch``, case-sensitive)
+    matched against column names as the reports show them; no ``include``
+    patterns means every column. ``dtypes`` maps column names to pandas dtype
+    names. Entries for columns that are not read are ignored, so one dtypes
+    file can serve several selections.
+    """
+
+    include: list[str] = field(default_factory=list)
+    exclude: list[str] = field(default_factory=list)
+    dtypes: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def select(self, names: list[str]) -> tuple[list[str], dict[str, Any], list[str]]:
+        """Split ``names`` into the columns to read (in file order), their declared
+        dtypes, and the skipped columns.
+
+        Raises ``CSVLoadError`` when an include pattern matches no column or no
+        column is left.
+        """
+        for pattern in self.include:
+            if not any(fnmatchcase(name, pattern) for name in names):
+                raise CSVLoadError(f"column pattern {pattern!r} matches no column")
+        kept: list[str] = []
+        skipped: list[str] = []
+        for name in names:
+            included = not self.include or any(fnmatchcase(name, p) for p in self.include)
+            if included and not any(fnmatchcase(name, p) for p in self.exclude):
+                kept.append(name)
+            else:
+                skipped.append(name)
+        if not kept:
+            raise CSVLoadError("no columns left to analyze after the column selection")
+        declared = {
+            name: pd.api.types.pandas_dtype(self.dtypes[name]) for name in kept if name in self.dtypes
+        }
+        return kept, declared, skipped
+
+
+def read_dtypes_file(path: str | Path) -> dict[str, str]:
+    """Column dtypes from a JSON file: an object mapping column names to pandas
+    dtype names, or the ``schema.json`` of an earlier run (skipped columns are
+    ignored). Raises ValueError for any other content or an unknown dtype."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, list):
+        if not all(isinstance(entry, dict) and "column" in entry for entry in data):
+            raise ValueError("a dtypes list must be schema.json entries with a 'column' key")
+        data = {entry["column"]: entry.get("dtype") for entry in data if not entry.get("skipped")}
+    if not isinstance(data, dict):
+        raise ValueError("dtypes must be a JSON object mapping column names to dtypes")
+    return check_dtypes(data)
+
+
+def check_dtypes(dtypes: dict[Any, Any]) -> dict[str, str]:
+    """``dtypes`` as column name -> dtype name; raises ValueError for an unknown dtype."""
+    for name, dtype in dtypes.items():
+        try:
+            pd.api.types.pandas_dtype(dtype)
+        except TypeError:
+            raise ValueError(f"unknown dtype {dtype!r} for column {name!r}") from None
+    return {str(name): str(dtype) for name, dtype in dtypes.items()}
+
+
+def is_text_dtype(dtype: Any) -> bool:
+    """Object and string dtypes, and categoricals of text, which hold the same
+    values and get the same checks."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    return pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+
+
+def is_datetime_dtype(dtype: Any) -> bool:
+    """datetime64 dtypes, with or without a time zone, as typed date and timestamp
+    columns of Parquet / Arrow files load. Every value of such a column counts as
+    datetime-parseable."""
+    return pd.api.types.is_datetime64_any_dtype(dtype)
+
+
+def head_values(non_null_series: pd.Series, count: int) -> list[Any]:
+    """The first ``count`` values, with datetimes as text so they serialize to JSON."""
+    head = non_null_series.head(count)
+    return head.astype(str).tolist() if is_datetime_dtype(head.dtype) else head.tolist()
+
+
+def _is_placeholder_token(value: object) -> bool:
+    normalized = _normalize_missing_candidate(value)
+    return normalized == _PUNCT_ONLY_TOKEN or _is_suspicious_keyword(normalized)
 
 
 def coerce_suspicious_to_nan(
-    df: pd.DataFrame, max_examples: int = 5
+    df: pd.DataFrame, max_examples: int = 5, inplace: bool = False
 ) -> tuple[pd.DataFrame, dict[str, dict[str, int | list[str]]]]:
     """Coerce suspicious placeholder tokens to missing values.
 
+    Each text column is factorized once and every distinct token is classified
+    once, so the cost scales with cardinality rather than row count. Only
+    columns that contain placeholders are rewritten: by default into a shallow
+    copy of ``df`` (untouched columns share memory with the input), or into
+    ``df`` itself when ``inplace=True``.
+
     Returns:
         (cleaned_df, audit) where audit is:
         {column: {"count": <int>, "examples": [<unique_examples>]}}
     """
-    cleaned = df.copy()
-    cleaned.attrs = dict(df.attrs)
+    cleaned = df if inplace else df.copy(deep=False)
+    if not inplace:
+        cleaned.attrs = dict(df.attrs)
     audit: dict[str, dict[str, int | list[str]]] = {}
 
-    text_columns = cleaned.select_dtypes(include=["object", "string"]).columns
-    for col in text_columns:
-        series = cast(pd.Series, cleaned[col])
-        normalized = series.map(_normalize_missing_candidate)
-        mask = normalized.eq(_PUNCT_ONLY_TOKEN) | normalized.map(_is_suspicious_keyword)
-        mask_series = pd.Series(mask, index=series.index, dtype=bool)
-        flagged_count = int(mask_series.to_numpy(dtype=bool).sum())
-        if flagged_count == 0:
+    for position, col in enumerate(df.columns):
+        dtype = df.dtypes.iloc[position]
+        if not is_text_dtype(dtype):
             continue
 
-        examples: list[str] = []
-        seen: set[str] = set()
-        for value in series.loc[mask_series].tolist():
-            as_text = str(value)
-            if as_text in seen:
-                continue
-            seen.add(as_text)
-            examples.append(as_text)
-            if len(examples) >= max_examples:
-                break
+        series = cast(pd.Series, df.iloc[:, position])
+        codes, uniques = pd.factorize(series)
+        flagged = np.fromiter(
+            (_is_placeholder_token(value) for value in uniques), dtype=bool, count=len(uniques)
+        )
+        if not flagged.any():
+            continue
+
+        mask = np.zeros(len(series), dtype=bool)
+        present = codes >= 0
+        mask[present] = flagged[codes[present]]
 
-        cleaned.loc[mask_series, col] = pd.NA
-        audit[col] = {"count": flagged_count, "examples": examples}
+        # factorize keeps first-seen order, so these match a row-order scan.
+        examples = unique_examples(list(uniques[flagged]), max_examples)
+        cleaned.isetitem(position, series.mask(mask, pd.NA))
+        audit[col] = {"count": int(mask.sum()), "examples": examples}
 
     return cleaned, audit
 
 
-def load_csv(path: str | Path) -> pd.DataFrame:
-    """Load a CSV file and validate it is non-empty.
+# pandas' default NA tokens, which the arrow engine must list explicitly.
+_DEFAULT_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+    "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
 
-    Raises SystemExit with a clear message on invalid input.
+
+def _arrow_types(dtype: dict[str, Any]) -> dict[str, Any]:
+    """Declared numeric and boolean dtypes as Arrow types, for the parser itself;
+    the rest are applied after conversion."""
+    import pyarrow as pa
+
+    return {
+        name: pa.from_numpy_dtype(value)
+        for name, value in dtype.items()
+        if isinstance(value, np.dtype) and value.kind in "biuf"
+    }
+
+
+def _read_csv_arrow(
+    path: Path,
+    fmt: CSVFormat,
+    usecols: list[str] | None = None,
+    dtype: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    """Parse with pyarrow's multithreaded reader, matching ``pd.read_csv`` semantics.
+
+    Header names are taken from pandas so duplicates are mangled the same way,
+    only pandas' boolean tokens are treated as booleans, all-null columns become
+    float64, and date inference is undone so date-like text reaches the
+    parseability checks unchanged. Text columns come back as ``string[pyarrow]``.
+    Only ``usecols`` (default: all) are converted, and declared ``dtype``
+    entries are honoured. Raises UnicodeDecodeError when the data is not valid
+    in ``fmt.encoding``.
     """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    encoding = fmt.encoding
+    # The header as sniffed, parsed by pandas so names are mangled the same way.
+    source = io.StringIO(fmt.header_text) if fmt.header_text else path
+    header = pd.read_csv(source, nrows=0, sep=fmt.delimiter, encoding=encoding)
+    names = [str(name) for name in header.columns]
+    with csv_source(path) as source:
+        table = pa_csv.read_csv(
+            source,
+            read_options=pa_csv.ReadOptions(
+                column_names=names, skip_rows=1, encoding=encoding, use_threads=True
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=fmt.delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                null_values=_DEFAULT_NA_VALUES + EXTRA_NA_VALUES,
+                strings_can_be_null=True,
+                true_values=["True", "TRUE", "true"],
+                false_values=["False", "FALSE", "false"],
+                timestamp_parsers=[],
+                include_columns=usecols or [],
+                column_types=_arrow_types(dtype or {}),
+            ),
+        )
+    for index, column in enumerate(table.schema):
+        if pa.types.is_binary(column.type):
+            raise UnicodeDecodeError(encoding, b"", 0, 1, f"invalid text in column '{column.name}'")
+        if pa.types.is_date(column.type):
+            table = table.set_column(index, column.name, table.column(index).cast(pa.string()))
+        elif pa.types.is_null(column.type):
+            table = table.set_column(index, column.name, table.column(index).cast(pa.float64()))
+
+    text_dtype = pd.StringDtype("pyarrow")
+    df = table.to_pandas(
+        types_mapper={pa.string(): text_dtype, pa.large_string(): text_dtype}.get
+    )
+    return pin_dtypes(df, dtype) if dtype else df
+
+
+def _read_csv_c(
+    path: Path,
+    fmt: CSVFormat,
+    usecols: list[str] | None = None,
+    dtype: dict[str, Any] | None = None,
+) -> pd.DataFrame:
+    with csv_source(path) as source:
+        return pd.read_csv(
+            source,
+            encoding=fmt.encoding,
+            sep=fmt.delimiter,
+            na_values=EXTRA_NA_VALUES,
+            usecols=usecols,
+            dtype=dtype,
+        )
+
+
+class CSVLoadError(ValueError):
+    """An input file that cannot be analyzed: missing, unparseable, empty, or
+    needing an engine or reader that is not installed. The message is meant for
+    the user."""
+
+
+@contextmanager
+def exit_on_load_error() -> Iterator[None]:
+    """Turn ``CSVLoadError`` into an ``Error: ...`` line on stderr and exit status 1."""
+    try:
+        yield
+    except CSVLoadError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def read_csv_checked(
+    path: str | Path,
+    engine: str = "c",
+    stage: Stage = nullcontext,
+    selection: ColumnSelection | None = None,
+) -> pd.DataFrame:
+    """``load_csv`` that raises ``CSVLoadError`` instead of exiting, for callers
+    that analyze many files in one process."""
     path = Path(path)
     if not path.exists():
-        print(f"Error: file not found: {path}", file=sys.stderr)
-        sys.exit(1)
+        raise CSVLoadError(f"file not found: {path}")
+
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"engine must be one of {CSV_ENGINES}, got {engine!r}")
+    if is_columnar(path):
+        return _read_columnar_checked(path, stage, selection)
+    if engine == "arrow" and importlib.util.find_spec("pyarrow") is None:
+        raise CSVLoadError(
+            "the arrow engine requires pyarrow; "
+            "install it with: pip install 'dataset-insights[arrow]'"
+        )
+    read = _read_csv_arrow if engine == "arrow" else _read_csv_c
+
+    def read_selected(fmt: CSVFormat) -> pd.DataFrame:
+        if selection is None:
+            return read(path, fmt)
+        kept, declared, skipped = selection.select(csv_column_names(fmt))
+        df = read(path, fmt, kept if skipped else None, declared or None)
+        df.attrs["skipped_columns"] = skipped
+        return df
+
+    # One bounded read settles encoding, delimiter and the raw header, so a
+    # Latin-1 file is normally parsed once rather than failing as UTF-8 first.
+    with stage("load.sniff"):
+        try:
+            fmt = sniff_csv(path)
+        except ImportError as exc:  # .zst without a decompressor
+            raise CSVLoadError(str(exc)) from exc
+        except Exception as exc:
+            raise CSVLoadError(f"could not read CSV: {exc}") from exc
 
-    try:
-        df = pd.read_csv(path, na_values=EXTRA_NA_VALUES)
-    except UnicodeDecodeError:
+    with stage("load.read_csv"):
         try:
-            df = pd.read_csv(path, encoding="latin-1", na_values=EXTRA_NA_VALUES)
+            df = read_selected(fmt)
+        except UnicodeDecodeError:
+            # Valid UTF-8 prefix, invalid bytes further on.
+            try:
+                fmt = sniff_csv(path, encoding="latin-1")
+                df = read_selected(fmt)
+            except CSVLoadError:
+                raise
+            except Exception as exc:
+                raise CSVLoadError(f"could not parse CSV: {exc}") from exc
+        except CSVLoadError:
+            raise
         except Exception as exc:
-            print(f"Error: could not parse CSV: {exc}", file=sys.stderr)
-            sys.exit(1)
-    except Exception as exc:
-        print(f"Error: could not parse CSV: {exc}", file=sys.stderr)
-        sys.exit(1)
+            raise CSVLoadError(f"could not parse CSV: {exc}") from exc
 
     if df.empty or len(df.columns) == 0:
-        print("Error: CSV is empty or has no data rows.", file=sys.stderr)
-        sys.exit(1)
+        raise CSVLoadError("CSV is empty or has no data rows.")
+
+    with stage("load.inspect_header"):
+        df.attrs["header_issues"] = header_issues(fmt.header)
+    return df
+
+
+def _read_columnar_checked(path: Path, stage: Stage, selection: ColumnSelection | None) -> pd.DataFrame:
+    """Read a Parquet or Arrow IPC file whole; no text parsing, no engine choice."""
+    with stage("load.read_columnar"):
+        try:
+            source = open_columnar(path)
+            if selection is None:
+                df = source.read()
+            else:
+                kept, declared, skipped = selection.select(source.names)
+                df = pin_dtypes(source.read(kept if skipped else None), declared)
+                df.attrs["skipped_columns"] = skipped
+        except CSVLoadError:
+            raise
+        except ImportError as exc:
+            raise CSVLoadError(str(exc)) from exc
+        except Exception as exc:
+            raise CSVLoadError(f"could not read {path.name}: {exc}") from exc
+
+    if df.empty or len(df.columns) == 0:
+        raise CSVLoadError(f"{path.name} has no rows.")
 
-    df.attrs["header_issues"] = inspect_header_issues(path)
+    with stage("load.inspect_header"):
+        df.attrs["header_issues"] = header_issues(source.schema.names)
     return df
 
 
-def compute_summary(df: pd.DataFrame) -> dict:
-    """Return shape, dtypes, and descriptive stats for numeric columns."""
+def load_csv(
+    path: str | Path,
+    engine: str = "c",
+    stage: Stage = nullcontext,
+    selection: ColumnSelection | None = None,
+) -> pd.DataFrame:
+    """Load a CSV file and validate it is non-empty.
+
+    Compressed CSVs (``.gz``, ``.bz2``, ``.xz``, ``.zst``) are decompressed as
+    they are parsed. Parquet and Arrow IPC / Feather files are read through
+    pyarrow instead of parsed (see ``readers``). ``engine="arrow"`` parses with
+    pyarrow (an optional dependency) on multiple threads and stores text as
+    ``string[pyarrow]`` instead of Python objects.
+
+    ``selection`` reads only some columns, with declared dtypes; the rest are
+    listed in ``df.attrs["skipped_columns"]``. Raises SystemExit with a clear
+    message on invalid input.
+    """
+    with exit_on_load_error():
+        return read_csv_checked(path, engine, stage, selection)
+
+
+SAMPLE_VALUE_COUNT = 3
+
+
+@dataclass
+class ColumnProfile:
+    """Per-column statistics gathered in one pass and shared by every per-column check.
+
+    Text-only fields (whitespace and parseability counts) stay at their defaults for
+    non-text columns, or when the profile was built with ``text_checks=False``.
+    Datetime columns are fully datetime-parseable by type.
+    """
+
+    name: Any
+    dtype: str
+    total_rows: int
+    non_null: int
+    unique_count: int
+    head_values: list[Any]
+    is_text: bool
+    is_datetime: bool = False
+    whitespace_count: int = 0
+    whitespace_examples: list[str] = field(default_factory=list)
+    non_empty_count: int = 0
+    numeric_count: int = 0
+    datetime_count: int = 0
+
+    @property
+    def missing_count(self) -> int:
+        return self.total_rows - self.non_null
+
+    def parseability_row(self) -> dict[str, Any]:
+        return parseability_row(
+            str(self.name),
+            self.non_null,
+            self.non_empty_count,
+            self.numeric_count,
+            self.datetime_count,
+        )
+
+
+# Strings pandas skips when picking the value to infer a datetime format from.
+NAT_STRINGS = frozenset({"NaT", "nat", "NAT", "nan", "NaN", "NAN"})
+
+
+def distinct_tokens(candidate: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Distinct values of ``candidate`` in first-appearance order, with their counts."""
+    codes, uniques = pd.factorize(candidate)
+    tokens = np.asarray(uniques, dtype=object)
+    return tokens, np.bincount(codes, minlength=len(tokens))
+
+
+def infer_datetime_format(tokens: np.ndarray) -> str | None:
+    """The strftime format ``pd.to_datetime`` would infer for a column with these values.
+
+    Like pandas, the format is guessed from the first value that is not a NaT
+    string; ``None`` means each value would be parsed individually by dateutil.
+    """
+    for token in tokens:
+        if isinstance(token, str) and token not in NAT_STRINGS:
+            return _guess_datetime_format(token)
+    return None
+
+
+def parseable_counts(
+    tokens: np.ndarray, weights: np.ndarray, datetime_format: str | None
+) -> tuple[int, int]:
+    """Numeric- and datetime-parseable cell counts from distinct tokens and their counts.
+
+    Each distinct token is parsed once. Datetimes are parsed vectorized with
+    ``datetime_format``; only when it is ``None`` does every distinct token fall
+    back to dateutil. Counts equal whole-column ``pd.to_numeric`` /
+    ``pd.to_datetime(errors="coerce")`` on the expanded values.
+    """
+    values = pd.Series(tokens, dtype=object)
+    numeric_mask = pd.to_numeric(values, errors="coerce").notna().to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=UserWarning)
+        parsed = pd.to_datetime(
+            values, errors="coerce", format="mixed" if datetime_format is None else datetime_format
+        )
+    datetime_mask = parsed.notna().to_numpy()
+    return int(weights[numeric_mask].sum()), int(weights[datetime_mask].sum())
+
+
+def _approx_unique_count(non_null_series: pd.Series) -> int:
+    sketch = HyperLogLog()
+    sketch.update(non_null_series)
+    # An estimate can overshoot; a column never has more distinct values than rows.
+    return min(sketch.count(), len(non_null_series))
+
+
+def profile_column(
+    series: pd.Series, text_checks: bool = True, approx_distinct: bool = False
+) -> ColumnProfile:
+    """Profile one column: drop nulls once, then derive every per-column statistic.
+
+    For text columns the values are cast and stripped once; the stripped values
+    feed both the whitespace check and numeric/datetime parseability. With
+    ``approx_distinct`` the unique count is a HyperLogLog estimate (about 0.8%
+    relative error) instead of an exact hash-table count.
+    """
+    non_null_series = series.dropna()
+    non_null = int(len(non_null_series))
+    profile = ColumnProfile(
+        name=series.name,
+        dtype=str(series.dtype),
+        total_rows=int(len(series)),
+        non_null=non_null,
+        unique_count=(
+            _approx_unique_count(non_null_series)
+            if approx_distinct
+            else int(non_null_series.nunique(dropna=True))
+        ),
+        head_values=head_values(non_null_series, SAMPLE_VALUE_COUNT),
+        is_text=is_text_dtype(series.dtype),
+        is_datetime=is_datetime_dtype(series.dtype),
+    )
+    if profile.is_datetime and text_checks:
+        profile.non_empty_count = profile.datetime_count = non_null
+        return profile
+    if not (profile.is_text and text_checks) or non_null == 0:
+        return profile
+
+    text_series = non_null_series.astype(str)
+    stripped = text_series.str.strip()
+    whitespace_mask = text_series.ne(stripped)
+    profile.whitespace_count = int(whitespace_mask.sum())
+    if profile.whitespace_count > 0:
+        profile.whitespace_examples = unique_examples(
+            text_series.loc[whitespace_mask].tolist(), 3
+        )
+
+    candidate = stripped.loc[stripped.ne("")]
+    profile.non_empty_count = int(len(candidate))
+    if profile.non_empty_count > 0:
+        tokens, weights = distinct_tokens(candidate)
+        profile.numeric_count, profile.datetime_count = parseable_counts(
+            tokens, weights, infer_datetime_format(tokens)
+        )
+    return profile
+
+
+def profile_frame(
+    df: pd.DataFrame, text_checks: bool = True, approx_distinct: bool = False
+) -> list[ColumnProfile]:
+    """Profile every column of ``df`` in column order."""
+    return [
+        profile_column(cast(pd.Series, df[col]), text_checks, approx_distinct)
+        for col in df.columns
+    ]
+
+
+QUARTILES = (0.25, 0.5, 0.75)
+
+
+def compute_quantiles(
+    df: pd.DataFrame,
+    probs: tuple[float, ...] = QUARTILES,
+    rank_error: float | None = None,
+) -> pd.DataFrame:
+    """Quantiles of every numeric column, indexed by ``probs`` with one column per
+    numeric column.
+
+    Exact by default: a single vectorized ``DataFrame.quantile`` call over all
+    numeric columns. With ``rank_error`` each column is summarized by a
+    ``KLLSketch`` sized for that normalized rank error instead of being sorted.
+    """
+    numeric_df = df.select_dtypes(include="number")
+    if rank_error is None:
+        return numeric_df.quantile(list(probs))
+
+    estimates: dict[Any, list[float]] = {}
+    for position, col in enumerate(numeric_df.columns):
+        sketch = KLLSketch.for_error(rank_error)
+        sketch.update(numeric_df.iloc[:, position].dropna().to_numpy(dtype=np.float64))
+        estimates[col] = sketch.quantiles(probs)
+    return pd.DataFrame(estimates, index=list(probs), columns=numeric_df.columns, dtype="float64")
+
+
+def compute_summary(df: pd.DataFrame, quantiles: pd.DataFrame | None = None) -> dict:
+    """Return shape, dtypes, and descriptive stats for numeric columns.
+
+    Pass ``quantiles`` from ``compute_quantiles`` to reuse quartiles already computed
+    for other checks.
+    """
     numeric_df = df.select_dtypes(include="number")
     if numeric_df.empty:
         desc: dict[str, dict[str, float | int | None]] = {}
     else:
-        desc = cast(dict[str, dict[str, float | int | None]], numeric_df.describe().to_dict())
+        if quantiles is None:
+            quantiles = compute_quantiles(numeric_df)
+        stats = pd.DataFrame(
+            {
+                "count": numeric_df.count().astype("float64"),
+                "mean": numeric_df.mean(),
+                "std": numeric_df.std(),
+                "min": numeric_df.min(),
+                "25%": quantiles.loc[0.25],
+                "50%": quantiles.loc[0.5],
+                "75%": quantiles.loc[0.75],
+                "max": numeric_df.max(),
+            }
+        )
+        desc = cast(dict[str, dict[str, float | int | None]], stats.T.to_dict())
         skewness = numeric_df.skew(numeric_only=True)
         for col in numeric_df.columns:
             value = skewness.get(col, None)
@@ -350,24 +888,20 @@ def compute_summary(df: pd.DataFrame) -> dict:
     }
 
 
-def compute_schema(df: pd.DataFrame) -> list[dict]:
+def compute_schema(df: pd.DataFrame, profiles: list[ColumnProfile] | None = None) -> list[dict]:
     """Return per-column metadata: name, dtype, unique count, sample values."""
-    schema = []
-    for col in df.columns:
-        series = cast(pd.Series, df[col])
-        sample = series.dropna().head(3).tolist()
-        unique_count = int(series.nunique(dropna=True))
-        missing_count = int(series.isna().to_numpy(dtype=bool).sum())
-        schema.append(
-            {
-                "column": col,
-                "dtype": str(series.dtype),
-                "unique_count": unique_count,
-                "missing_count": missing_count,
-                "sample_values": sample,
-            }
-        )
-    return schema
+    if profiles is None:
+        profiles = profile_frame(df, text_checks=False)
+    return [
+        {
+            "column": profile.name,
+            "dtype": profile.dtype,
+            "unique_count": profile.unique_count,
+            "missing_count": profile.missing_count,
+            "sample_values": profile.head_values,
+        }
+        for profile in profiles
+    ]
 
 
 def compute_missingness(df: pd.DataFrame, normalize_suspicious: bool = True) -> pd.DataFrame:
@@ -382,87 +916,101 @@ def compute_missingness(df: pd.DataFrame, normalize_suspicious: bool = True) ->
     else:
         cleaned = df
 
-    missing_count = cleaned.isna().sum()
-    missing_pct = (missing_count / len(cleaned) * 100).round(2)
-    result = pd.DataFrame(
-        {
-            "column": cleaned.columns,
-            "missing_count": missing_count.values,
-            "missing_pct": missing_pct.values,
-        }
+    return missingness_frame(cleaned.isna().sum(), len(cleaned))
+
+
+def _missingness_from_profiles(profiles: list[ColumnProfile]) -> pd.DataFrame:
+    missing_count = pd.Series(
+        [profile.missing_count for profile in profiles],
+        index=[profile.name for profile in profiles],
+        dtype="int64",
     )
-    return result.sort_values("missing_pct", ascending=False).reset_index(drop=True)
+    total_rows = profiles[0].total_rows if profiles else 0
+    return missingness_frame(missing_count, total_rows)
 
 
-def compute_duplicates(df: pd.DataFrame, max_examples: int = DUPLICATE_EXAMPLE_CAP) -> dict[str, Any]:
-    """Compute duplicate-row metrics and return capped sample rows.
+def compute_correlation(df: pd.DataFrame) -> pd.DataFrame | None:
+    """Return the Pearson correlation matrix, or None with fewer than 2 numeric columns."""
+    numeric_df = df.select_dtypes(include="number")
+    if numeric_df.shape[1] < 2:
+        return None
+    return numeric_df.corr()
+
+
+def duplicate_example_records(
+    example_rows: pd.DataFrame, max_examples: int = DUPLICATE_EXAMPLE_CAP
+) -> list[dict[str, object]]:
+    """JSON-serializable records of the first ``max_examples`` duplicate example rows."""
+    examples: list[dict[str, object]] = []
+    for _, row in example_rows.head(max_examples).iterrows():
+        examples.append(
+            {str(col): _to_serializable_scalar(val) for col, val in row.to_dict().items()}
+        )
+    return examples
+
+
+def duplicates_summary(
+    stats: DuplicateStats,
+    example_rows: pd.DataFrame | list[dict[str, object]],
+    max_examples: int = DUPLICATE_EXAMPLE_CAP,
+) -> dict[str, Any]:
+    """Build the duplicate report dict from row-hash statistics and the example rows
+    found at ``stats.example_positions`` (as a frame, or as records from
+    ``duplicate_example_records``).
 
     Duplicate semantics are explicit:
     - duplicate_rows_excluding_first: rows beyond first occurrence in duplicate groups
     - duplicate_group_count: number of distinct row groups with count > 1
     - duplicate_row_pct: duplicate_rows_excluding_first / total_rows * 100
     """
-    total_rows = int(len(df))
-    if total_rows == 0:
-        return {
-            "total_rows": 0,
-            "duplicate_rows_excluding_first": 0,
-            "duplicate_group_count": 0,
-            "duplicate_row_pct": 0.0,
-            "example_limit": max_examples,
-            "example_rows": [],
-            "omitted_count": 0,
-            "truncated": False,
-        }
-
-    duplicate_mask = df.duplicated(keep="first")
-    duplicate_rows_excluding_first = int(duplicate_mask.sum())
-
-    value_counts = df.value_counts(dropna=False)
-    duplicate_group_count = int((value_counts > 1).sum())
-    duplicate_row_pct = round(duplicate_rows_excluding_first / total_rows * 100, 2)
-
-    example_rows: list[dict[str, object]] = []
-    if duplicate_rows_excluding_first > 0:
-        sample = df.loc[duplicate_mask].head(max_examples)
-        for _, row in sample.iterrows():
-            row_dict = {
-                str(col): _to_serializable_scalar(val)
-                for col, val in row.to_dict().items()
-            }
-            example_rows.append(row_dict)
+    if isinstance(example_rows, pd.DataFrame):
+        examples = duplicate_example_records(example_rows, max_examples)
+    else:
+        examples = list(example_rows[:max_examples])
 
-    omitted_count = max(duplicate_rows_excluding_first - len(example_rows), 0)
+    total_rows = stats.total_rows
+    omitted_count = max(stats.duplicate_rows - len(examples), 0)
     return {
         "total_rows": total_rows,
-        "duplicate_rows_excluding_first": duplicate_rows_excluding_first,
-        "duplicate_group_count": duplicate_group_count,
-        "duplicate_row_pct": duplicate_row_pct,
+        "duplicate_rows_excluding_first": stats.duplicate_rows,
+        "duplicate_group_count": stats.group_count,
+        "duplicate_row_pct": (
+            round(stats.duplicate_rows / total_rows * 100, 2) if total_rows else 0.0
+        ),
         "example_limit": max_examples,
-        "example_rows": example_rows,
+        "example_rows": examples,
         "omitted_count": omitted_count,
         "truncated": omitted_count > 0,
     }
 
 
-def compute_outliers(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute IQR-based outlier counts per numeric column.
+def compute_duplicates(
+    df: pd.DataFrame,
+    max_examples: int = DUPLICATE_EXAMPLE_CAP,
+    row_hashes: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """Compute duplicate-row metrics and return capped sample rows.
 
-    Columns with too few non-null values are skipped.
+    Rows are compared through one 64-bit hash per row (see ``duplicates.py``), so
+    only a ``uint64`` array is sorted instead of building hash tables of whole rows.
+    Pass ``row_hashes`` when they are already known.
     """
-    columns = [
-        "column",
-        "non_null_count",
-        "q1",
-        "q3",
-        "iqr",
-        "lower_bound",
-        "upper_bound",
-        "outlier_count",
-        "outlier_pct",
-    ]
+    if row_hashes is None:
+        row_hashes = hash_rows(df)
+    stats = count_duplicates(row_hashes, max_examples)
+    return duplicates_summary(stats, df.iloc[stats.example_positions], max_examples)
 
+
+def compute_outliers(df: pd.DataFrame, quantiles: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Compute IQR-based outlier counts per numeric column.
+
+    Columns with too few non-null values are skipped. Pass ``quantiles`` from
+    ``compute_quantiles`` to reuse quartiles already computed for the summary.
+    """
     numeric_df = df.select_dtypes(include="number")
+    if quantiles is None:
+        quantiles = compute_quantiles(numeric_df, probs=(0.25, 0.75))
+
     rows: list[dict[str, Any]] = []
     for col in numeric_df.columns:
         series = cast(pd.Series, numeric_df[col]).dropna()
@@ -470,304 +1018,70 @@ def compute_outliers(df: pd.DataFrame) -> pd.DataFrame:
         if non_null < OUTLIER_MIN_NONNULL:
             continue
 
-        q1 = float(series.quantile(0.25))
-        q3 = float(series.quantile(0.75))
-        iqr = q3 - q1
-        lower_bound = q1 - 1.5 * iqr
-        upper_bound = q3 + 1.5 * iqr
+        q1 = float(quantiles.at[0.25, col])
+        q3 = float(quantiles.at[0.75, col])
+        lower_bound, upper_bound = iqr_bounds(q1, q3)
 
         mask = (series < lower_bound) | (series > upper_bound)
-        outlier_count = int(mask.sum())
-        outlier_pct = round(outlier_count / non_null * 100, 2)
-
-        rows.append(
-            {
-                "column": str(col),
-                "non_null_count": non_null,
-                "q1": q1,
-                "q3": q3,
-                "iqr": iqr,
-                "lower_bound": lower_bound,
-                "upper_bound": upper_bound,
-                "outlier_count": outlier_count,
-                "outlier_pct": outlier_pct,
-            }
-        )
-
-    if not rows:
-        return pd.DataFrame(columns=columns)
-
-    result = pd.DataFrame(rows, columns=columns)
-    return result.sort_values(["outlier_pct", "outlier_count"], ascending=False).reset_index(
-        drop=True
-    )
-
-
-def compute_parseability(df: pd.DataFrame) -> pd.DataFrame:
-    """Compute numeric/datetime parseability rates for text columns."""
-    columns = [
-        "column",
-        "non_null_count",
-        "non_empty_count",
-        "numeric_parseable_count",
-        "numeric_parse_pct",
-        "datetime_parseable_count",
-        "datetime_parse_pct",
+        rows.append(outlier_row(str(col), non_null, q1, q3, int(mask.sum())))
+
+    return outliers_frame(rows)
+
+
+def compute_parseability(
+    df: pd.DataFrame, profiles: list[ColumnProfile] | None = None
+) -> pd.DataFrame:
+    """Compute numeric/datetime parseability rates for text and datetime columns."""
+    if profiles is None:
+        checked = [
+            col for col, dtype in df.dtypes.items() if is_text_dtype(dtype) or is_datetime_dtype(dtype)
+        ]
+        profiles = [profile_column(cast(pd.Series, df[col])) for col in checked]
+    rows = [
+        profile.parseability_row() for profile in profiles if profile.is_text or profile.is_datetime
     ]
-    rows: list[dict[str, Any]] = []
-
-    text_columns = df.select_dtypes(include=["object", "string"]).columns
-    for col in text_columns:
-        series = cast(pd.Series, df[col]).dropna().astype(str)
-        non_null_count = int(len(series))
-        stripped = series.str.strip()
-        non_empty_mask = stripped.ne("")
-        candidate = stripped.loc[non_empty_mask]
-        non_empty_count = int(len(candidate))
-
-        if non_empty_count == 0:
-            numeric_count = 0
-            datetime_count = 0
-        else:
-            numeric_values = pd.to_numeric(candidate, errors="coerce")
-            numeric_count = int(numeric_values.notna().sum())
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", category=UserWarning)
-                datetime_values = pd.to_datetime(candidate, errors="coerce")
-            datetime_count = int(datetime_values.notna().sum())
-
-        numeric_pct = round((numeric_count / non_empty_count * 100), 2) if non_empty_count else 0.0
-        datetime_pct = (
-            round((datetime_count / non_empty_count * 100), 2) if non_empty_count else 0.0
-        )
-
-        rows.append(
-            {
-                "column": str(col),
-                "non_null_count": non_null_count,
-                "non_empty_count": non_empty_count,
-                "numeric_parseable_count": numeric_count,
-                "numeric_parse_pct": numeric_pct,
-                "datetime_parseable_count": datetime_count,
-                "datetime_parse_pct": datetime_pct,
-            }
-        )
-
-    return pd.DataFrame(rows, columns=columns)
+    return pd.DataFrame(rows, columns=PARSEABILITY_COLUMNS)
 
 
 def detect_column_warnings(
     df: pd.DataFrame,
     actionable_low: float = PARSEABILITY_ACTIONABLE_LOW,
     actionable_high: float = PARSEABILITY_ACTIONABLE_HIGH,
+    profiles: list[ColumnProfile] | None = None,
 ) -> tuple[list[QualityIssue], pd.DataFrame]:
     """Detect broad, domain-agnostic quality issues.
 
     Parseability rates are always returned as metrics, while warnings are emitted
-    only when they are actionable.
+    only when they are actionable. Pass ``profiles`` from ``profile_frame`` to reuse
+    column statistics already gathered for other checks.
     """
     issues: list[QualityIssue] = []
 
     header_issues_raw = cast(list[Any], df.attrs.get("header_issues", []))
     for raw_issue in header_issues_raw:
-        issue = _coerce_issue(raw_issue)
+        issue = coerce_issue(raw_issue)
         if issue is not None:
             issues.append(issue)
 
-    total_rows = len(df)
-    for col in df.columns:
-        series = cast(pd.Series, df[col])
-        non_null = int(series.notna().sum())
-        missing_count = total_rows - non_null
-
-        if total_rows > 0 and missing_count > 0:
-            missing_pct = round(missing_count / total_rows * 100, 2)
-            if missing_pct >= MISSING_CRITICAL_THRESHOLD:
-                issues.append(
-                    QualityIssue(
-                        rule="high_missing",
-                        severity="critical",
-                        column=str(col),
-                        count=missing_count,
-                        pct=missing_pct,
-                        examples=[],
-                        message=(
-                            f"Column '{col}' is {missing_pct:.2f}% missing "
-                            f"({missing_count}/{total_rows} values)."
-                        ),
-                        suggestion=(
-                            "Investigate data source; consider imputing or dropping this column."
-                        ),
-                    )
-                )
-            elif missing_pct >= MISSING_WARN_THRESHOLD:
-                issues.append(
-                    QualityIssue(
-                        rule="high_missing",
-                        severity="warn",
-                        column=str(col),
-                        count=missing_count,
-                        pct=missing_pct,
-                        examples=[],
-                        message=(
-                            f"Column '{col}' is {missing_pct:.2f}% missing "
-                            f"({missing_count}/{total_rows} values)."
-                        ),
-                        suggestion="Review missingness pattern; consider imputation or deletion.",
-                    )
-                )
-
-        if non_null == 0:
-            continue
-
-        is_text = pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
-
-        non_null_series = series.dropna()
-        unique_count = int(non_null_series.nunique(dropna=True))
-        unique_ratio = unique_count / non_null
-
-        if unique_count <= CONSTANT_COLUMN_THRESHOLD:
-            examples = [_to_example_text(v) for v in non_null_series.head(3).tolist()]
-            issues.append(
-                QualityIssue(
-                    rule="constant_column",
-                    severity="warn",
-                    column=str(col),
-                    count=unique_count,
-                    pct=round(unique_ratio * 100, 2),
-                    examples=examples,
-                    message=f"Column '{col}' has a single repeated value.",
-                    suggestion="Drop it or verify whether upstream ingestion collapsed variation.",
-                )
-            )
-
-        if (
-            is_text
-            and non_null >= HIGH_CARDINALITY_MIN_NONNULL
-            and unique_ratio >= HIGH_CARDINALITY_THRESHOLD
-        ):
-            issues.append(
-                QualityIssue(
-                    rule="high_cardinality_column",
-                    severity="info",
-                    column=str(col),
-                    count=unique_count,
-                    pct=round(unique_ratio * 100, 2),
-                    examples=[_to_example_text(v) for v in non_null_series.head(3).tolist()],
-                    message=(
-                        f"Column '{col}' has high cardinality ({unique_count}/{non_null} unique)."
-                    ),
-                    suggestion="Treat as identifier/free text or encode with care for modeling.",
-                )
-            )
-
-        if is_text:
-            text_series = non_null_series.astype(str)
-            stripped = text_series.str.strip()
-            whitespace_mask = text_series.ne(stripped)
-            whitespace_count = int(whitespace_mask.sum())
-            if whitespace_count > 0:
-                examples = []
-                seen_examples: set[str] = set()
-                for value in text_series.loc[whitespace_mask].tolist():
-                    if value in seen_examples:
-                        continue
-                    seen_examples.add(value)
-                    examples.append(value)
-                    if len(examples) >= 3:
-                        break
-                issues.append(
-                    QualityIssue(
-                        rule="leading_trailing_whitespace",
-                        severity="warn",
-                        column=str(col),
-                        count=whitespace_count,
-                        pct=round(whitespace_count / non_null * 100, 2),
-                        examples=examples,
-                        message=(
-                            f"Column '{col}' contains leading/trailing whitespace in text values."
-                        ),
-                        suggestion="Trim whitespace before grouping, joining, or deduplicating.",
-                    )
-                )
-
-    parseability = compute_parseability(df)
-    for row in parseability.to_dict(orient="records"):
-        column = str(row["column"])
-        non_empty_count = int(row["non_empty_count"])
-        numeric_count = int(row["numeric_parseable_count"])
-        numeric_pct = float(row["numeric_parse_pct"])
-        datetime_count = int(row["datetime_parseable_count"])
-        datetime_pct = float(row["datetime_parse_pct"])
-
-        if non_empty_count == 0:
-            continue
-
-        partial_numeric = 0 < numeric_count < non_empty_count
-        partial_datetime = 0 < datetime_count < non_empty_count
-
-        if partial_numeric and numeric_pct >= MIXED_TYPE_NUMERIC_THRESHOLD * 100:
-            issues.append(
-                QualityIssue(
-                    rule="mixed_type_numeric_text",
-                    severity="warn",
-                    column=column,
-                    count=numeric_count,
-                    pct=numeric_pct,
-                    examples=[],
-                    message=(
-                        f"Column '{column}' is text but {numeric_pct:.2f}% of non-empty values are numeric-parseable."
-                    ),
-                    suggestion="Normalize mixed tokens and cast to numeric if semantically appropriate.",
-                )
+    if profiles is None:
+        profiles = profile_frame(df)
+
+    for profile in profiles:
+        issues.extend(
+            column_issues(
+                str(profile.name),
+                profile.total_rows,
+                profile.non_null,
+                profile.unique_count,
+                profile.is_text,
+                profile.head_values,
+                profile.whitespace_count,
+                profile.whitespace_examples,
             )
-            continue
-
-        if numeric_count == non_empty_count and non_empty_count > 0:
-            issues.append(
-                QualityIssue(
-                    rule="convertible_numeric_text",
-                    severity="info",
-                    column=column,
-                    count=numeric_count,
-                    pct=numeric_pct,
-                    examples=[],
-                    message=(
-                        f"Column '{column}' is text but fully numeric-parseable ({numeric_pct:.2f}%)."
-                    ),
-                    suggestion="Consider casting this column to numeric dtype.",
-                )
-            )
-            continue
-
-        numeric_actionable = partial_numeric and actionable_low <= numeric_pct <= actionable_high
-        datetime_actionable = (
-            partial_datetime and actionable_low <= datetime_pct <= actionable_high
         )
-        if numeric_actionable or datetime_actionable:
-            parts = []
-            if numeric_actionable:
-                parts.append(f"numeric parseability {numeric_pct:.2f}%")
-            if datetime_actionable:
-                parts.append(f"datetime parseability {datetime_pct:.2f}%")
-
-            issues.append(
-                QualityIssue(
-                    rule="partial_parseability",
-                    severity="info",
-                    column=column,
-                    count=non_empty_count,
-                    pct=max(numeric_pct, datetime_pct),
-                    examples=[],
-                    message=(
-                        f"Column '{column}' has partial parseability ({'; '.join(parts)})."
-                    ),
-                    suggestion=(
-                        "Inspect token patterns and standardize formats before converting dtype."
-                    ),
-                )
-            )
 
+    parseability = compute_parseability(df, profiles)
+    issues.extend(parseability_issues(parseability, actionable_low, actionable_high))
     return issues, parseability
 
 
@@ -778,3 +1092,108 @@ def summarize_quality_issues(issues: list[QualityIssue]) -> dict[str, int]:
         if issue.severity in counts:
             counts[issue.severity] += 1
     return counts
+
+
+def duplicate_rows_issue(duplicates: dict[str, Any] | None) -> QualityIssue | None:
+    """Return a ``duplicate_rows`` issue when duplicate metrics report any duplicates."""
+    if duplicates is None:
+        return None
+
+    duplicate_count = int(duplicates.get("duplicate_rows_excluding_first", 0))
+    duplicate_pct = float(duplicates.get("duplicate_row_pct", 0.0))
+    if duplicate_count == 0:
+        return None
+
+    return QualityIssue(
+        rule="duplicate_rows",
+        severity="warn",
+        column=None,
+        count=duplicate_count,
+        pct=duplicate_pct,
+        examples=[],
+        message=(
+            f"Detected {duplicate_count} duplicate row(s) beyond first occurrence "
+            f"({duplicate_pct:.2f}% of rows)."
+        ),
+        suggestion="Review deduplication logic or enforce primary keys upstream.",
+    )
+
+
+@dataclass
+class AnalysisResult:
+    """All computed artifacts for one dataset, ready to hand to the report writers.
+
+    ``duplicates`` is None when duplicate detection was not run (for example when
+    merging profile states). ``plot_inputs`` is set by runs that keep no rows
+    (streaming, merged states); in memory the CLI builds them from the frame.
+    ``skipped_columns`` lists columns left out by a ``ColumnSelection``.
+    ``sample`` describes the row sample the result was computed from, if any.
+    Its missingness, outlier and parseability frames then carry ``_ci_low`` /
+    ``_ci_high`` columns, and ``issue_intervals`` holds the confidence interval
+    of each quality issue's ``pct`` (None for issues that are not a share of rows).
+    """
+
+    summary: dict
+    schema: list[dict]
+    missingness: pd.DataFrame
+    duplicates: dict[str, Any] | None
+    outliers: pd.DataFrame
+    quality_issues: list[QualityIssue]
+    parseability: pd.DataFrame
+    correlation: pd.DataFrame | None
+    suspicious_audit: dict[str, dict[str, int | list[str]]] = field(default_factory=dict)
+    plot_inputs: PlotInputs | None = None
+    skipped_columns: list[str] = field(default_factory=list)
+    sample: SampleInfo | None = None
+    issue_intervals: list[list[float] | None] | None = None
+
+
+def analyze_frame(
+    df: pd.DataFrame,
+    suspicious_audit: dict[str, dict[str, int | list[str]]] | None = None,
+    quantile_error: float | None = None,
+    approx_distinct: bool = False,
+    stage: Stage = nullcontext,
+) -> AnalysisResult:
+    """Run every in-memory check on an already-normalized DataFrame.
+
+    Quartiles are exact unless ``quantile_error`` asks for sketch estimates (see
+    ``compute_quantiles``); outlier counts are always exact for the chosen bounds.
+    ``approx_distinct`` estimates unique counts with HyperLogLog (see ``profile_column``).
+    Each step runs inside ``stage("analyze.<step>")``.
+    """
+    with stage("analyze.profile_frame"):
+        profiles = profile_frame(df, approx_distinct=approx_distinct)
+    with stage("analyze.compute_quantiles"):
+        quantiles = compute_quantiles(df, rank_error=quantile_error)
+    with stage("analyze.compute_duplicates"):
+        duplicates = compute_duplicates(df)
+    with stage("analyze.detect_column_warnings"):
+        quality_issues, parseability = detect_column_warnings(df, profiles=profiles)
+    duplicate_issue = duplicate_rows_issue(duplicates)
+    if duplicate_issue is not None:
+        quality_issues.append(duplicate_issue)
+
+    with stage("analyze.compute_summary"):
+        summary = compute_summary(df, quantiles)
+    with stage("analyze.compute_schema"):
+        schema = compute_schema(df, profiles)
+    with stage("analyze.compute_missingness"):
+        missingness = _missingness_from_profiles(profiles)
+    with stage("analyze.compute_outliers"):
+        outliers = compute_outliers(df, quantiles)
+    with stage("analyze.compute_correlation"):
+        correlation = compute_correlation(df)
+
+    return AnalysisResult(
+        summary=summary,
+        schema=schema,
+        missingness=missingness,
+        duplicates=duplicates,
+        outliers=outliers,
+        quality_issues=quality_issues,
+        parseability=parseability,
+        correlation=correlation,
+        suspicious_audit=dict(suspicious_audit or {}),
+        skipped_columns=list(df.attrs.get("skipped_columns", [])),
+    )
@@ -0,0 +1,277 @@
+"""Batch analysis: many CSV files in one invocation (``analyze-many``).
+
+Files are analyzed on one long-lived pool of worker processes. The parent
+imports pandas (and matplotlib, unless plots are off) before the pool forks,
+so interpreter start-up and imports are paid once per batch instead of once
+per file. Every file gets its own output directory, mirroring its path below
+the files' common parent.
+
+Failures stay with their file. Invalid input raises ``CSVLoadError`` instead of
+exiting, any other exception is recorded against the file, and files caught in
+a crashed worker are retried once, each on a fresh single-worker pool. The
+outcome of every file is collected into ``index.json`` and ``index.csv`` in
+the batch output directory.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import multiprocessing
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .analyze import AnalysisResult, ColumnSelection, CSVLoadError, summarize_quality_issues
+from .cache import ResultCache
+from .defaults import DEFAULT_CACHE_MAX_BYTES, DEFAULT_CHUNK_SIZE, DEFAULT_SKETCH_K
+from .pipeline import AnalysisOptions, run_analysis, use_cache
+from .reports import write_reports
+
+
+INDEX_COLUMNS = [
+    "csv",
+    "outdir",
+    "status",
+    "error",
+    "rows",
+    "columns",
+    "critical",
+    "warn",
+    "info",
+    "duplicate_rows",
+    "cached",
+    "seconds",
+]
+_COUNT_COLUMNS = ("rows", "columns", "critical", "warn", "info", "duplicate_rows")
+
+
+@dataclass
+class BatchOptions:
+    """Per-file analysis options, matching the ``analyze`` flags of the same names.
+
+    ``cache=None`` uses the result cache unless ``stream`` is set.
+    """
+
+    engine: str = "c"
+    stream: bool = False
+    chunksize: int = DEFAULT_CHUNK_SIZE
+    sketch_k: int = DEFAULT_SKETCH_K
+    quantile_error: float | None = None
+    approx_distinct: bool = False
+    plots: bool = True
+    cache: bool | None = None
+    cache_dir: str | None = None
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    selection: ColumnSelection | None = None
+
+    def analysis(self) -> AnalysisOptions:
+        """The ``AnalysisOptions`` of each file's run."""
+        return AnalysisOptions(
+            engine=self.engine,
+            stream=self.stream,
+            chunksize=self.chunksize,
+            sketch_k=self.sketch_k,
+            quantile_error=self.quantile_error,
+            approx_distinct=self.approx_distinct,
+            selection=self.selection,
+        )
+
+
+def read_manifest(path: str | Path) -> list[Path]:
+    """CSV paths listed one per line; blank lines and ``#`` comments are skipped and
+    relative paths are taken from the manifest's directory."""
+    manifest = Path(path)
+    paths = []
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        entry = line.strip()
+        if entry and not entry.startswith("#"):
+            paths.append(manifest.parent / Path(entry).expanduser())
+    return paths
+
+
+def expand_patterns(patterns: Iterable[str]) -> tuple[list[Path], list[str]]:
+    """Files matching the glob patterns (``**`` recurses), plus the patterns that
+    matched nothing. Plain paths to existing files match themselves."""
+    paths: list[Path] = []
+    unmatched: list[str] = []
+    for pattern in patterns:
+        matches = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        files = [match for match in matches if match.is_file()]
+        if files:
+            paths.extend(files)
+        else:
+            unmatched.append(pattern)
+    return paths, unmatched
+
+
+def output_dirs(paths: list[Path], outdir: Path) -> list[Path]:
+    """One output directory per file: its path below the files' common parent, without
+    the suffix. Names that would still collide get ``-2``, ``-3``, ... appended."""
+    if not paths:
+        return []
+    resolved = [path.resolve() for path in paths]
+    root = Path(os.path.commonpath([path.parent for path in resolved]))
+    taken: set[Path] = set()
+    dirs = []
+    for path in resolved:
+        candidate = outdir / path.relative_to(root).with_suffix("")
+        unique, n = candidate, 1
+        while unique in taken:
+            n += 1
+            unique = candidate.with_name(f"{candidate.name}-{n}")
+        taken.add(unique)
+        dirs.append(unique)
+    return dirs
+
+
+def _analyze(csv_path: Path, options: BatchOptions) -> tuple[AnalysisResult, bool]:
+    """Analyze one file as ``analyze`` would; returns the result and whether it came
+    from the result cache. Raises ``CSVLoadError`` on invalid input."""
+    if not csv_path.is_file():
+        raise CSVLoadError(f"file not found: {csv_path}")
+    cached = use_cache(options.cache, options.stream)
+    cache = ResultCache(options.cache_dir, options.cache_max_bytes) if cached else None
+    return run_analysis(csv_path, options.analysis(), cache, plot_inputs=options.plots)
+
+
+def analyze_file(
+    csv_path: str | Path, outdir: str | Path, options: BatchOptions, paths: bool = False
+) -> dict[str, Any]:
+    """Analyze one file and write its reports (and plots) to ``outdir``.
+
+    Never raises for a bad file: returns an index record whose ``status`` is
+    ``"ok"`` or ``"failed"`` (with ``error`` set). With ``paths``, the record
+    also maps every report and plot name to its file (None when skipped).
+    """
+    csv_path, out = Path(csv_path), Path(outdir)
+    record: dict[str, Any] = {column: None for column in INDEX_COLUMNS}
+    record.update(csv=str(csv_path), outdir=str(out), status="failed", cached=False)
+    written: dict[str, Path | None] = {}
+    start = time.perf_counter()
+    try:
+        result, record["cached"] = _analyze(csv_path, options)
+        written.update(write_reports(result, out))
+        if options.plots and result.plot_inputs is not None:
+            from .plots import render_plots
+
+            written.update(render_plots(result.plot_inputs, out))
+    except CSVLoadError as exc:
+        record["error"] = str(exc)
+    except Exception as exc:
+        record["error"] = f"{type(exc).__name__}: {exc}"
+    else:
+        severity = summarize_quality_issues(result.quality_issues)
+        record.update(
+            status="ok",
+            rows=result.summary["shape"]["rows"],
+            columns=result.summary["shape"]["columns"],
+            duplicate_rows=(
+                result.duplicates["duplicate_rows_excluding_first"]
+                if result.duplicates is not None
+                else None
+            ),
+            **severity,
+        )
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    if paths:
+        record["files"] = {name: str(path) if path else None for name, path in written.items()}
+    return record
+
+
+def worker_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for ``analyze_file``, forked where possible so workers start with
+    the parent's imports."""
+    use_fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if use_fork else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _crashed(csv_path: Path, out: Path) -> dict[str, Any]:
+    record: dict[str, Any] = {column: None for column in INDEX_COLUMNS}
+    record.update(
+        csv=str(csv_path),
+        outdir=str(out),
+        status="failed",
+        cached=False,
+        error="worker process died while analyzing this file",
+    )
+    return record
+
+
+def run_batch(
+    paths: list[Path],
+    outdir: str | Path,
+    options: BatchOptions,
+    jobs: int = 1,
+    on_record: Callable[[dict[str, Any]], None] | None = None,
+) -> list[dict[str, Any]]:
+    """Analyze ``paths`` with at most ``jobs`` files in flight; returns one index
+    record per file, in input order.
+
+    ``on_record`` is called with each record as it completes.
+    """
+    dirs = output_dirs(paths, Path(outdir))
+    records: list[dict[str, Any] | None] = [None] * len(paths)
+
+    def finish(index: int, record: dict[str, Any]) -> None:
+        records[index] = record
+        if on_record is not None:
+            on_record(record)
+
+    if jobs <= 1 or len(paths) < 2:
+        for index, (path, out) in enumerate(zip(paths, dirs)):
+            finish(index, analyze_file(path, out, options))
+        return [record for record in records if record is not None]
+
+    if options.plots:
+        import_module(".plots", __package__)  # imported once here, inherited by forked workers
+
+    crashed: list[int] = []
+    with worker_pool(min(jobs, len(paths))) as pool:
+        futures: dict[Future, int] = {
+            pool.submit(analyze_file, path, out, options): index
+            for index, (path, out) in enumerate(zip(paths, dirs))
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                finish(index, future.result())
+            except BrokenProcessPool:
+                crashed.append(index)
+
+    # A dead worker fails every pending file; rerun those alone to find the culprit.
+    for index in sorted(crashed):
+        with worker_pool(1) as solo:
+            try:
+                finish(index, solo.submit(analyze_file, paths[index], dirs[index], options).result())
+            except BrokenProcessPool:
+                finish(index, _crashed(paths[index], dirs[index]))
+    return [record for record in records if record is not None]
+
+
+def write_index(records: list[dict[str, Any]], outdir: str | Path) -> tuple[Path, Path]:
+    """Write the batch index as ``index.json`` (with totals) and ``index.csv``."""
+    out = Path(outdir)
+    out.mkdir(parents=True, exist_ok=True)
+    failed = sum(record["status"] != "ok" for record in records)
+    payload = {
+        "files": len(records),
+        "ok": len(records) - failed,
+        "failed": failed,
+        "results": records,
+    }
+    json_path = out / "index.json"
+    json_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    csv_path = out / "index.csv"
+    counts = {column: "Int64" for column in _COUNT_COLUMNS}  # empty for failed files
+    pd.DataFrame(records, columns=INDEX_COLUMNS).astype(counts).to_csv(csv_path, index=False)
+    return json_path, csv_path
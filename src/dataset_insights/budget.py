@@ -0,0 +1,269 @@
+"""Memory plans for ``analyze --memory-budget``.
+
+``plan_memory`` parses a prefix of the file (``PLAN_PREFIX_BYTES``, after
+decompression) and projects the in-memory footprint of the whole run: the
+frame, plus the float64 copies of the numeric columns that quantiles and
+correlations make, plus the row hashes behind duplicate detection. The row
+count is exact for Parquet / Arrow files. For CSVs it is scaled up from the
+prefix (by the compression ratio for compressed files).
+
+The plan makes the frame smaller in two ways. Neither changes any statistic:
+
+- text columns with few distinct values in the prefix are parsed as
+  ``category``, which the checks treat like text;
+- integer columns are downcast after the parse, to the smallest integer
+  dtype that holds their values (declaring a small dtype to the parser would
+  wrap values that do not fit).
+
+Floats stay float64, since float32 sums would change means and deviations.
+
+If the projection still exceeds the budget, the plan switches to streaming
+with default dtypes. It splits the budget between the chunks and the
+buffered duplicate hashes.
+"""
+
+from __future__ import annotations
+
+import io
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .analyze import (
+    EXTRA_NA_VALUES,
+    ColumnSelection,
+    CSVLoadError,
+    csv_column_names,
+    sniff_csv,
+)
+from .defaults import DEFAULT_CHUNK_SIZE
+from .readers import COMPRESSIONS, compression, is_columnar, open_columnar
+
+PLAN_PREFIX_BYTES = 4 * 2**20
+# Parse as category when at most this share of a text column's prefix values is distinct ...
+CATEGORY_MAX_DISTINCT_RATIO = 0.5
+# ... and the category column is projected at most this share of the text column's size.
+CATEGORY_MAX_SIZE_RATIO = 0.5
+MIN_STREAM_CHUNK_ROWS = 1_000
+# Bytes per row the checks add on top of the frame: row hashes, their sort order
+# and duplicate flags, plus a float64 copy of every numeric column.
+_ROW_OVERHEAD_BYTES = 24
+_NUMERIC_COPY_BYTES = 8
+
+
+@dataclass
+class MemoryPlan:
+    """How ``analyze`` loads a file under a memory budget, and the projections
+    behind the choice. ``mode`` is ``"memory"`` or ``"stream"``; ``chunksize`` and
+    ``duplicate_memory`` apply to streaming."""
+
+    budget_bytes: int
+    mode: str
+    rows: int
+    rows_exact: bool
+    default_bytes: int
+    projected_bytes: int
+    categories: list[str] = field(default_factory=list)
+    downcast: dict[str, str] = field(default_factory=dict)
+    chunksize: int = DEFAULT_CHUNK_SIZE
+    duplicate_memory: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def selection(self, selection: ColumnSelection | None) -> ColumnSelection:
+        """``selection`` with the planned categories declared; dtypes the user
+        declared win."""
+        base = selection or ColumnSelection()
+        categories = {name: "category" for name in self.categories}
+        return ColumnSelection(base.include, base.exclude, {**categories, **base.dtypes})
+
+    def describe(self) -> list[str]:
+        """Console lines for the plan."""
+        about = "" if self.rows_exact else "~"
+        lines = [
+            f"  {about}{self.rows:,} rows; projected peak {_size(self.default_bytes)} with default "
+            f"dtypes, {_size(self.projected_bytes)} as planned (budget {_size(self.budget_bytes)})"
+        ]
+        if self.categories:
+            lines.append(f"  Text as category: {', '.join(self.categories)}")
+        if self.downcast:
+            lines.append(
+                "  Integers downcast: "
+                + ", ".join(f"{name} ({dtype})" for name, dtype in self.downcast.items())
+            )
+        if self.mode == "memory":
+            lines.append("  Plan: load in memory")
+        else:
+            lines.append(
+                f"  Plan: stream in chunks of {self.chunksize:,} rows, with "
+                f"{_size(self.duplicate_memory)} of duplicate hashes in memory"
+            )
+        return lines
+
+
+def _size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def downcast_integers(df: pd.DataFrame) -> dict[str, str]:
+    """Downcast every integer column of ``df`` in place to the smallest integer
+    dtype holding its values; returns the new dtypes of the columns that changed."""
+    changed: dict[str, str] = {}
+    for position, dtype in enumerate(df.dtypes):
+        if not pd.api.types.is_integer_dtype(dtype):
+            continue
+        column = pd.to_numeric(df.iloc[:, position], downcast="integer")
+        if column.dtype != dtype:
+            df.isetitem(position, column)
+            changed[str(df.columns[position])] = str(column.dtype)
+    return changed
+
+
+def _csv_prefix(path: Path, selection: ColumnSelection | None) -> tuple[pd.DataFrame, int, bool]:
+    """Frame of the prefix, and the file's row count (estimated unless the prefix
+    is the whole file)."""
+    fmt = sniff_csv(path)
+    usecols, declared = None, {}
+    if selection is not None:
+        kept, declared, skipped = selection.select(csv_column_names(fmt))
+        usecols = kept if skipped else None
+
+    size = path.stat().st_size
+    suffix = compression(path)
+    with ExitStack() as stack:
+        raw = stack.enter_context(open(path, "rb"))
+        handle = stack.enter_context(COMPRESSIONS[suffix](raw)) if suffix else raw
+        prefix = handle.read(PLAN_PREFIX_BYTES)
+        complete = not handle.read(1)
+        consumed = raw.tell()
+    # Decompressed bytes in the whole file, from the ratio over the prefix.
+    total = len(prefix) if complete else len(prefix) * size / max(consumed, 1)
+
+    if not complete:
+        prefix = prefix[: prefix.rfind(b"\n") + 1]
+    while True:
+        try:
+            frame = pd.read_csv(
+                io.BytesIO(prefix),
+                encoding=fmt.encoding,
+                sep=fmt.delimiter,
+                na_values=EXTRA_NA_VALUES,
+                usecols=usecols,
+                dtype=declared or None,
+                encoding_errors="replace",
+            )
+            break
+        except pd.errors.ParserError:
+            # Cut inside a quoted field that spans lines: drop the last line.
+            cut = prefix[:-1].rfind(b"\n") + 1
+            if complete or cut <= len(fmt.header_text):
+                raise
+            prefix = prefix[:cut]
+    if complete:
+        return frame, len(frame), True
+    data_bytes = len(prefix) - len(fmt.header_text.encode(fmt.encoding))
+    return frame, round(len(frame) * (total - len(fmt.header_text)) / max(data_bytes, 1)), False
+
+
+def _columnar_prefix(path: Path, selection: ColumnSelection | None) -> tuple[pd.DataFrame, int, bool]:
+    source = open_columnar(path)
+    columns, declared = None, {}
+    if selection is not None:
+        kept, declared, skipped = selection.select(source.names)
+        columns = kept if skipped else None
+    dtypes = {**source.dtypes(columns), **declared}
+    rows = max(1, min(source.num_rows, PLAN_PREFIX_BYTES // 64))
+    frame = next(source.iter_frames(rows, columns=columns, dtypes=dtypes), None)
+    if frame is None:
+        frame = pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+    return frame, source.num_rows, True
+
+
+def _category_bytes(series: pd.Series, rows: int) -> int | None:
+    """Projected size of a text column parsed as category, or None when it has too
+    many distinct values."""
+    non_null = series.dropna()
+    if non_null.empty or non_null.nunique() > CATEGORY_MAX_DISTINCT_RATIO * len(non_null):
+        return None
+    categorical = series.astype("category")
+    codes = categorical.cat.codes.dtype.itemsize
+    categories = int(categorical.cat.categories.memory_usage(deep=True))
+    return codes * rows + categories
+
+
+def plan_memory(
+    path: str | Path, budget_bytes: int, selection: ColumnSelection | None = None
+) -> MemoryPlan:
+    """Project the footprint of analyzing ``path`` (only the columns ``selection``
+    keeps) and choose dtypes and mode to fit ``budget_bytes``. Raises
+    ``CSVLoadError`` when the prefix cannot be read."""
+    path = Path(path)
+    if not path.exists():
+        raise CSVLoadError(f"file not found: {path}")
+    try:
+        if is_columnar(path):
+            frame, rows, exact = _columnar_prefix(path, selection)
+        else:
+            frame, rows, exact = _csv_prefix(path, selection)
+    except CSVLoadError:
+        raise
+    except ImportError as exc:
+        raise CSVLoadError(str(exc)) from exc
+    except Exception as exc:
+        raise CSVLoadError(f"could not read {path.name}: {exc}") from exc
+
+    sampled = max(len(frame), 1)
+    declared = selection.dtypes if selection is not None else {}
+    default_bytes = planned_bytes = 0
+    categories: list[str] = []
+    downcast: dict[str, str] = {}
+    numeric = 0
+    for name in frame.columns:
+        series = frame[name]
+        column_bytes = int(series.memory_usage(deep=True, index=False) * rows / sampled)
+        default_bytes += column_bytes
+        planned = column_bytes
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            numeric += 1
+            if pd.api.types.is_integer_dtype(series.dtype):
+                smaller = pd.to_numeric(series, downcast="integer").dtype
+                if smaller != series.dtype:
+                    downcast[str(name)] = str(smaller)
+                    planned = smaller.itemsize * rows
+        elif str(name) not in declared and pd.api.types.is_string_dtype(series):
+            category_bytes = _category_bytes(series, rows)
+            if category_bytes is not None and category_bytes <= CATEGORY_MAX_SIZE_RATIO * column_bytes:
+                categories.append(str(name))
+                planned = category_bytes
+        planned_bytes += planned
+
+    overhead = rows * (_ROW_OVERHEAD_BYTES + _NUMERIC_COPY_BYTES * numeric)
+    plan = MemoryPlan(
+        budget_bytes=budget_bytes,
+        mode="memory",
+        rows=rows,
+        rows_exact=exact,
+        default_bytes=default_bytes + overhead,
+        projected_bytes=planned_bytes + overhead,
+        categories=categories,
+        downcast=downcast,
+    )
+    if plan.projected_bytes > budget_bytes:
+        # Chunks keep the default dtypes (the streaming pass pins one dtype per
+        # column for the whole file). A chunk is parsed, normalized and profiled
+        # with about three copies alive; half the budget goes to chunks and a
+        # quarter to duplicate hashes.
+        row_bytes = max(default_bytes / max(rows, 1), 1)
+        plan.mode = "stream"
+        plan.chunksize = int(min(max(budget_bytes / 2 / 3 / row_bytes, MIN_STREAM_CHUNK_ROWS), DEFAULT_CHUNK_SIZE))
+        plan.duplicate_memory = max(budget_bytes // 4, 2**20)
+        plan.categories, plan.downcast = [], {}
+    return plan
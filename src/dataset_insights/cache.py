@@ -0,0 +1,130 @@
+"""Content-addressed cache of analysis results for repeated ``analyze`` runs.
+
+An entry is keyed on the SHA-256 of the CSV's bytes plus the tool version and
+every option that changes the result. A later run on identical content with
+the same options can re-emit the reports (and plots, from the cached plot
+inputs) without reading the CSV again.
+
+Entries are pickled ``AnalysisResult`` objects in a directory readable by the
+current user only. They are trusted local files, unlike the shareable state
+files of ``state.py``, which never unpickle. Each hit refreshes the entry's
+modification time, and the least recently used entries are evicted once the
+directory outgrows its size budget. Writes are atomic, so concurrent runs
+never see a partial entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from . import __version__
+from .defaults import DEFAULT_CACHE_MAX_BYTES
+
+if TYPE_CHECKING:
+    from .analyze import AnalysisResult
+
+
+CACHE_FORMAT_VERSION = 4
+_HASH_BLOCK_BYTES = 2**20
+_ENTRY_SUFFIX = ".result.pkl"
+
+
+def default_cache_dir() -> Path:
+    """``$XDG_CACHE_HOME/dataset-insights``, falling back to ``~/.cache/dataset-insights``."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "dataset-insights"
+
+
+def file_digest(path: str | Path) -> str:
+    """Hex SHA-256 of a file's contents, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while block := handle.read(_HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Size-bounded, least-recently-used store of ``AnalysisResult`` objects and
+    the per-column parts of ``column_cache.py``."""
+
+    def __init__(
+        self, directory: str | Path | None = None, max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, path: str | Path, options: dict[str, Any]) -> str:
+        """Cache key for ``path``'s content analyzed with ``options``."""
+        return self.entry_key({"content": file_digest(path), "options": options})
+
+    def entry_key(self, identity: dict[str, Any]) -> str:
+        """Cache key for any JSON-serializable ``identity``, scoped to this format and
+        tool version."""
+        identity = {"format": CACHE_FORMAT_VERSION, "version": __version__, **identity}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Any:
+        """The cached object for ``key``, or None. Unreadable entries are dropped."""
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as handle:
+                result = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            entry.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(entry)  # mark as most recently used
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: AnalysisResult) -> None:
+        """Store ``result`` under ``key``, then evict least recently used entries."""
+        self.put_many({key: result})
+
+    def put_many(self, entries: dict[str, Any]) -> None:
+        """Store each picklable object under its key, then evict once."""
+        if not entries:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        for key, value in entries.items():
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, self._entry(key))
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        self._evict(keep=set(entries))
+
+    def _evict(self, keep: set[str]) -> None:
+        entries = []
+        for entry in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed by a concurrent run
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        kept = {self._entry(key) for key in keep}
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            if entry in kept:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
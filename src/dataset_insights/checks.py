@@ -0,0 +1,386 @@
+"""Quality rules and the report rows built from column statistics.
+
+The in-memory path (``analyze.py``), merged profile states (``state.py``) and
+the parallel path (``parallel.py``) each gather per-column statistics their own
+way, then build their issues and their missingness, outlier and parseability
+tables here, so every path reports a column the same way.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+import pandas as pd
+
+
+@dataclass
+class QualityIssue:
+    """A single data-quality finding produced by domain-agnostic checks."""
+
+    rule: str
+    severity: str
+    column: str | None
+    count: int
+    pct: float
+    examples: list[str] = field(default_factory=list)
+    message: str = ""
+    suggestion: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rule": self.rule,
+            "severity": self.severity,
+            "column": self.column,
+            "count": self.count,
+            "pct": round(self.pct, 2),
+            "examples": self.examples,
+            "message": self.message,
+            "suggestion": self.suggestion,
+        }
+
+
+OUTLIER_MIN_NONNULL = 10
+HIGH_CARDINALITY_THRESHOLD = 0.95
+HIGH_CARDINALITY_MIN_NONNULL = 20
+CONSTANT_COLUMN_THRESHOLD = 1
+MIXED_TYPE_NUMERIC_THRESHOLD = 0.50
+PARSEABILITY_ACTIONABLE_LOW = 20.0
+PARSEABILITY_ACTIONABLE_HIGH = 95.0
+MISSING_CRITICAL_THRESHOLD = 50.0  # percent missing → critical issue
+MISSING_WARN_THRESHOLD = 20.0      # percent missing → warn issue
+
+
+def _to_example_text(value: object) -> str:
+    if value is None:
+        return "None"
+    return str(value)
+
+
+def unique_examples(values: list[Any], limit: int) -> list[str]:
+    """Return up to ``limit`` distinct values (as text) in first-seen order."""
+    examples: list[str] = []
+    seen: set[str] = set()
+    for value in values:
+        as_text = str(value)
+        if as_text in seen:
+            continue
+        seen.add(as_text)
+        examples.append(as_text)
+        if len(examples) >= limit:
+            break
+    return examples
+
+
+def coerce_issue(value: QualityIssue | dict[str, Any]) -> QualityIssue | None:
+    """``value`` as a ``QualityIssue`` (e.g. from its ``to_dict``), or None if it is not one."""
+    if isinstance(value, QualityIssue):
+        return value
+    if not isinstance(value, dict):
+        return None
+
+    try:
+        return QualityIssue(
+            rule=str(value.get("rule", "")),
+            severity=str(value.get("severity", "info")),
+            column=cast(str | None, value.get("column")),
+            count=int(value.get("count", 0)),
+            pct=float(value.get("pct", 0.0)),
+            examples=[str(v) for v in cast(list[Any], value.get("examples", []))],
+            message=str(value.get("message", "")),
+            suggestion=str(value.get("suggestion", "")),
+        )
+    except Exception:
+        return None
+
+
+def missingness_frame(missing_count: pd.Series, total_rows: int) -> pd.DataFrame:
+    """Build the sorted missingness table from per-column missing counts."""
+    missing_pct = (missing_count / total_rows * 100).round(2)
+    result = pd.DataFrame(
+        {
+            "column": missing_count.index,
+            "missing_count": missing_count.values,
+            "missing_pct": missing_pct.values,
+        }
+    )
+    return result.sort_values("missing_pct", ascending=False).reset_index(drop=True)
+
+
+OUTLIER_COLUMNS = [
+    "column",
+    "non_null_count",
+    "q1",
+    "q3",
+    "iqr",
+    "lower_bound",
+    "upper_bound",
+    "outlier_count",
+    "outlier_pct",
+]
+
+
+def iqr_bounds(q1: float, q3: float) -> tuple[float, float]:
+    """Lower and upper outlier fences, 1.5 IQR beyond the quartiles."""
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+def outlier_row(col: str, non_null: int, q1: float, q3: float, outlier_count: int) -> dict[str, Any]:
+    """One ``outliers.csv`` row from a column's quartiles and outlier count."""
+    lower_bound, upper_bound = iqr_bounds(q1, q3)
+    return {
+        "column": str(col),
+        "non_null_count": non_null,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound,
+        "outlier_count": outlier_count,
+        "outlier_pct": round(outlier_count / non_null * 100, 2),
+    }
+
+
+def outliers_frame(rows: list[dict[str, Any]]) -> pd.DataFrame:
+    """The outlier table from ``outlier_row`` rows, highest outlier rate first."""
+    if not rows:
+        return pd.DataFrame(columns=OUTLIER_COLUMNS)
+
+    result = pd.DataFrame(rows, columns=OUTLIER_COLUMNS)
+    return result.sort_values(["outlier_pct", "outlier_count"], ascending=False).reset_index(
+        drop=True
+    )
+
+
+PARSEABILITY_COLUMNS = [
+    "column",
+    "non_null_count",
+    "non_empty_count",
+    "numeric_parseable_count",
+    "numeric_parse_pct",
+    "datetime_parseable_count",
+    "datetime_parse_pct",
+]
+
+
+def parseability_row(
+    col: str,
+    non_null_count: int,
+    non_empty_count: int,
+    numeric_count: int,
+    datetime_count: int,
+) -> dict[str, Any]:
+    """One parseability table row from a column's parseable counts."""
+    numeric_pct = round((numeric_count / non_empty_count * 100), 2) if non_empty_count else 0.0
+    datetime_pct = (
+        round((datetime_count / non_empty_count * 100), 2) if non_empty_count else 0.0
+    )
+    return {
+        "column": str(col),
+        "non_null_count": non_null_count,
+        "non_empty_count": non_empty_count,
+        "numeric_parseable_count": numeric_count,
+        "numeric_parse_pct": numeric_pct,
+        "datetime_parseable_count": datetime_count,
+        "datetime_parse_pct": datetime_pct,
+    }
+
+
+def column_issues(
+    col: str,
+    total_rows: int,
+    non_null: int,
+    unique_count: int,
+    is_text: bool,
+    head_values: list[Any],
+    whitespace_count: int,
+    whitespace_examples: list[str],
+) -> list[QualityIssue]:
+    """Build per-column quality issues from precomputed column statistics.
+
+    Shared by the in-memory and streaming paths so both emit identical issues.
+    """
+    issues: list[QualityIssue] = []
+    missing_count = total_rows - non_null
+
+    if total_rows > 0 and missing_count > 0:
+        missing_pct = round(missing_count / total_rows * 100, 2)
+        if missing_pct >= MISSING_CRITICAL_THRESHOLD:
+            issues.append(
+                QualityIssue(
+                    rule="high_missing",
+                    severity="critical",
+                    column=str(col),
+                    count=missing_count,
+                    pct=missing_pct,
+                    examples=[],
+                    message=(
+                        f"Column '{col}' is {missing_pct:.2f}% missing "
+                        f"({missing_count}/{total_rows} values)."
+                    ),
+                    suggestion=(
+                        "Investigate data source; consider imputing or dropping this column."
+                    ),
+                )
+            )
+        elif missing_pct >= MISSING_WARN_THRESHOLD:
+            issues.append(
+                QualityIssue(
+                    rule="high_missing",
+                    severity="warn",
+                    column=str(col),
+                    count=missing_count,
+                    pct=missing_pct,
+                    examples=[],
+                    message=(
+                        f"Column '{col}' is {missing_pct:.2f}% missing "
+                        f"({missing_count}/{total_rows} values)."
+                    ),
+                    suggestion="Review missingness pattern; consider imputation or deletion.",
+                )
+            )
+
+    if non_null == 0:
+        return issues
+
+    unique_ratio = unique_count / non_null
+
+    if unique_count <= CONSTANT_COLUMN_THRESHOLD:
+        examples = [_to_example_text(v) for v in head_values]
+        issues.append(
+            QualityIssue(
+                rule="constant_column",
+                severity="warn",
+                column=str(col),
+                count=unique_count,
+                pct=round(unique_ratio * 100, 2),
+                examples=examples,
+                message=f"Column '{col}' has a single repeated value.",
+                suggestion="Drop it or verify whether upstream ingestion collapsed variation.",
+            )
+        )
+
+    if (
+        is_text
+        and non_null >= HIGH_CARDINALITY_MIN_NONNULL
+        and unique_ratio >= HIGH_CARDINALITY_THRESHOLD
+    ):
+        issues.append(
+            QualityIssue(
+                rule="high_cardinality_column",
+                severity="info",
+                column=str(col),
+                count=unique_count,
+                pct=round(unique_ratio * 100, 2),
+                examples=[_to_example_text(v) for v in head_values],
+                message=(
+                    f"Column '{col}' has high cardinality ({unique_count}/{non_null} unique)."
+                ),
+                suggestion="Treat as identifier/free text or encode with care for modeling.",
+            )
+        )
+
+    if whitespace_count > 0:
+        issues.append(
+            QualityIssue(
+                rule="leading_trailing_whitespace",
+                severity="warn",
+                column=str(col),
+                count=whitespace_count,
+                pct=round(whitespace_count / non_null * 100, 2),
+                examples=whitespace_examples,
+                message=(
+                    f"Column '{col}' contains leading/trailing whitespace in text values."
+                ),
+                suggestion="Trim whitespace before grouping, joining, or deduplicating.",
+            )
+        )
+
+    return issues
+
+
+def parseability_issues(
+    parseability: pd.DataFrame,
+    actionable_low: float,
+    actionable_high: float,
+) -> list[QualityIssue]:
+    """Turn parseability metrics into actionable mixed-type / conversion issues."""
+    issues: list[QualityIssue] = []
+    for row in parseability.to_dict(orient="records"):
+        column = str(row["column"])
+        non_empty_count = int(row["non_empty_count"])
+        numeric_count = int(row["numeric_parseable_count"])
+        numeric_pct = float(row["numeric_parse_pct"])
+        datetime_count = int(row["datetime_parseable_count"])
+        datetime_pct = float(row["datetime_parse_pct"])
+
+        if non_empty_count == 0:
+            continue
+
+        partial_numeric = 0 < numeric_count < non_empty_count
+        partial_datetime = 0 < datetime_count < non_empty_count
+
+        if partial_numeric and numeric_pct >= MIXED_TYPE_NUMERIC_THRESHOLD * 100:
+            issues.append(
+                QualityIssue(
+                    rule="mixed_type_numeric_text",
+                    severity="warn",
+                    column=column,
+                    count=numeric_count,
+                    pct=numeric_pct,
+                    examples=[],
+                    message=(
+                        f"Column '{column}' is text but {numeric_pct:.2f}% of non-empty values are numeric-parseable."
+                    ),
+                    suggestion="Normalize mixed tokens and cast to numeric if semantically appropriate.",
+                )
+            )
+            continue
+
+        if numeric_count == non_empty_count and non_empty_count > 0:
+            issues.append(
+                QualityIssue(
+                    rule="convertible_numeric_text",
+                    severity="info",
+                    column=column,
+                    count=numeric_count,
+                    pct=numeric_pct,
+                    examples=[],
+                    message=(
+                        f"Column '{column}' is text but fully numeric-parseable ({numeric_pct:.2f}%)."
+                    ),
+                    suggestion="Consider casting this column to numeric dtype.",
+                )
+            )
+            continue
+
+        numeric_actionable = partial_numeric and actionable_low <= numeric_pct <= actionable_high
+        datetime_actionable = (
+            partial_datetime and actionable_low <= datetime_pct <= actionable_high
+        )
+        if numeric_actionable or datetime_actionable:
+            parts = []
+            if numeric_actionable:
+                parts.append(f"numeric parseability {numeric_pct:.2f}%")
+            if datetime_actionable:
+                parts.append(f"datetime parseability {datetime_pct:.2f}%")
+
+            issues.append(
+                QualityIssue(
+                    rule="partial_parseability",
+                    severity="info",
+                    column=column,
+                    count=non_empty_count,
+                    pct=max(numeric_pct, datetime_pct),
+                    examples=[],
+                    message=(
+                        f"Column '{column}' has partial parseability ({'; '.join(parts)})."
+                    ),
+                    suggestion=(
+                        "Inspect token patterns and standardize formats before converting dtype."
+                    ),
+                )
+            )
+
+    return issues
@@ -2,39 +2,29 @@
 
 from __future__ import annotations
 
+import os
+from contextlib import nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
 
-from .analyze import (
-    QualityIssue,
-    coerce_suspicious_to_nan,
-    compute_duplicates,
-    compute_missingness,
-    compute_outliers,
-    compute_schema,
-    compute_summary,
-    detect_column_warnings,
-    load_csv,
-    summarize_quality_issues,
-)
-from .plots import (
-    plot_box_plots,
-    plot_correlation_heatmap,
-    plot_distribution_histogram,
-    plot_missingness_bar,
-)
-from .reports import (
-    write_correlation_csv,
-    write_data_quality_json,
-    write_duplicates_csv,
-    write_missingness_csv,
-    write_outliers_csv,
-    write_schema_json,
-    write_summary_md,
-    write_summary_statistics_csv,
+from .cache import ResultCache
+from .defaults import (
+    CSV_ENGINES,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_DUPLICATE_MEMORY_BUDGET,
+    DEFAULT_SKETCH_K,
+    RANK_ERROR_FACTOR,
 )
 
+# pandas, numpy and matplotlib are imported inside the commands that need them,
+# so --help, --version and --no-plots runs do not pay for them.
+if TYPE_CHECKING:
+    from .analyze import AnalysisResult, ColumnSelection, Stage
+    from .plotdata import PlotInputs
+
 
 @click.group()
 @click.version_option(package_name="dataset-insights")
@@ -51,126 +41,863 @@ def main():
     help="Directory to write output files.",
     type=click.Path(),
 )
-def analyze(csv_path: str, outdir: str):
-    """Analyze a CSV file and write reports + diagnostic plots to OUTDIR."""
-    max_examples = 3
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help=(
+        "Read the CSV in bounded chunks instead of loading it whole."
+    ),
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help=(
+        "For append-only files: parse only rows appended since the last --incremental "
+        "run into OUTDIR, falling back to a full run if earlier bytes changed.  "
+        "Statistics as in --stream."
+    ),
+)
+@click.option(
+    "--chunksize",
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Rows per chunk in --stream, --incremental and one-pass --sample runs.",
+)
+@click.option(
+    "--duplicate-memory",
+    default=DEFAULT_DUPLICATE_MEMORY_BUDGET // 2**20,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="MiB of row hashes kept in memory in --stream mode before spilling to temp files.",
+)
+@click.option(
+    "--memory-budget",
+    default=None,
+    type=click.IntRange(min=1),
+    help=(
+        "MiB the analysis may use.  A prefix of the file projects the footprint; "
+        "low-cardinality text is read as category and integers are downcast, and "
+        "the run streams (with --chunksize and --duplicate-memory sized to the "
+        "budget) when the projection still does not fit."
+    ),
+)
+@click.option(
+    "--jobs",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Worker processes for column-parallel analysis (ignored with --stream).",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(CSV_ENGINES),
+    default="c",
+    show_default=True,
+    help=(
+        "CSV parser: pandas' C parser, or pyarrow's multithreaded reader with "
+        "Arrow-backed text columns (needs the 'arrow' extra; ignored with --stream "
+        "and for Parquet / Arrow files)."
+    ),
+)
+@click.option(
+    "--columns",
+    multiple=True,
+    help=(
+        "Analyze only columns matching these glob patterns (repeat the option or "
+        "separate with commas, e.g. 'price_*,id'); other columns are never parsed."
+    ),
+)
+@click.option(
+    "--exclude-columns",
+    multiple=True,
+    help="Skip columns matching these glob patterns (applied after --columns).",
+)
+@click.option(
+    "--dtypes",
+    "dtypes_path",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help=(
+        "JSON file of column dtypes, {\"column\": \"float64\", ...} or an earlier "
+        "schema.json; those columns are parsed with these types instead of inferred."
+    ),
+)
+@click.option(
+    "--sample",
+    "sample_rows",
+    default=None,
+    type=click.IntRange(min=1),
+    help=(
+        "Analyze a uniform random sample of N rows; reports give 95% confidence "
+        "intervals for the whole file.  Large uncompressed CSVs are sampled by seeking."
+    ),
+)
+@click.option(
+    "--sample-frac",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    help="Analyze a random sample of about this fraction of the rows (e.g. 0.01).",
+)
+@click.option(
+    "--sample-seed",
+    default=0,
+    show_default=True,
+    type=int,
+    help="Random seed for --sample / --sample-frac.",
+)
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help=(
+        "Estimate quartiles with KLL sketches at this normalized rank error "
+        "(e.g. 0.001) instead of exact sorting.  [default: exact in memory; "
+        f"{RANK_ERROR_FACTOR / DEFAULT_SKETCH_K:.5f} in streaming mode]"
+    ),
+)
+@click.option(
+    "--approx-distinct",
+    is_flag=True,
+    default=False,
+    help=(
+        "Estimate unique counts with HyperLogLog sketches (about 0.8% relative error, "
+        "16 KiB per column) instead of exact hash sets."
+    ),
+)
+@click.option(
+    "--no-plots",
+    is_flag=True,
+    default=False,
+    help="Write reports only; skip the plots (and never import matplotlib).",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=None,
+    help=(
+        "Read and write the result cache; --no-cache recomputes everything.  "
+        "[default: on, except with --stream, where the cache key costs an extra "
+        "full read of the file]"
+    ),
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="DATASET_INSIGHTS_CACHE_DIR",
+    type=click.Path(file_okay=False),
+    help=(
+        "Result cache directory (env: DATASET_INSIGHTS_CACHE_DIR).  "
+        "[default: $XDG_CACHE_HOME/dataset-insights]"
+    ),
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+    show_default=True,
+    envvar="DATASET_INSIGHTS_CACHE_SIZE",
+    type=click.IntRange(min=0),
+    help="MiB the result cache may use before least recently used entries are evicted.",
+)
+@click.option(
+    "--profile-run",
+    is_flag=True,
+    default=False,
+    help=(
+        "Record wall time, CPU time and peak memory for every stage (load, checks, "
+        "each report and plot) in OUTDIR/run_metrics.json.  Implies --no-cache; "
+        "plots render in this process."
+    ),
+)
+def analyze(
+    csv_path: str,
+    outdir: str,
+    stream: bool,
+    incremental: bool,
+    chunksize: int,
+    duplicate_memory: int,
+    memory_budget: int | None,
+    jobs: int,
+    engine: str,
+    columns: tuple[str, ...],
+    exclude_columns: tuple[str, ...],
+    dtypes_path: str | None,
+    sample_rows: int | None,
+    sample_frac: float | None,
+    sample_seed: int,
+    quantile_error: float | None,
+    approx_distinct: bool,
+    no_plots: bool,
+    cache: bool | None,
+    cache_dir: str | None,
+    cache_size: int,
+    profile_run: bool,
+):
+    """Analyze a CSV file and write reports + diagnostic plots to OUTDIR.
+
+    The CSV may be compressed (.gz, .bz2, .xz, .zst); Parquet (.parquet) and
+    Arrow IPC / Feather (.arrow, .feather) files are read without text parsing.
+
+    Results are cached by file content and options (with --stream only when
+    --cache is given), so re-running on an unchanged file only re-writes the
+    reports. After an edit, only the columns whose values changed are profiled
+    again.
+    """
     out = Path(outdir)
+    selection = _column_selection(columns, exclude_columns, dtypes_path)
+    sampled = sample_rows is not None or sample_frac is not None
+    if sample_rows is not None and sample_frac is not None:
+        raise click.UsageError("--sample and --sample-frac are mutually exclusive.")
+    if sampled and (stream or incremental):
+        raise click.UsageError("--sample and --sample-frac analyze in memory; drop --stream / --incremental.")
+    if memory_budget is not None and (stream or incremental or sampled):
+        raise click.UsageError(
+            "--memory-budget chooses between in-memory and streaming analysis; "
+            "drop --stream / --incremental / --sample."
+        )
 
-    click.echo(f"Loading {csv_path} ...")
-    df = load_csv(csv_path)
-    df, suspicious_audit = coerce_suspicious_to_nan(df)
-    click.echo(f"  {df.shape[0]:,} rows x {df.shape[1]} columns")
+    metrics = None
+    stage: Stage = nullcontext
+    if profile_run:
+        from .metrics import RunMetrics
+
+        metrics = RunMetrics()
+        stage = metrics.stage
+
+    plan = None
+    duplicate_memory_bytes = duplicate_memory * 2**20
+    if memory_budget is not None:
+        from .analyze import exit_on_load_error
+        from .budget import plan_memory
+
+        with stage("plan_memory"), exit_on_load_error():
+            plan = plan_memory(csv_path, memory_budget * 2**20, selection)
+        click.echo("Memory plan:")
+        for line in plan.describe():
+            click.echo(line)
+        if plan.mode == "stream":
+            stream, chunksize, duplicate_memory_bytes = True, plan.chunksize, plan.duplicate_memory
+        elif plan.categories:
+            selection = plan.selection(selection)
+
+    from .pipeline import AnalysisOptions, use_cache
+
+    options = AnalysisOptions(
+        engine=engine,
+        stream=stream,
+        chunksize=chunksize,
+        sketch_k=_sketch_k(quantile_error),
+        quantile_error=quantile_error,
+        approx_distinct=approx_distinct,
+        selection=selection,
+        sample_rows=sample_rows,
+        sample_frac=sample_frac,
+        sample_seed=sample_seed,
+        downcast=plan is not None,
+        jobs=jobs,
+        duplicate_memory=duplicate_memory_bytes,
+    )
+    # --incremental keeps its own checkpoint in OUTDIR instead of the result cache,
+    # and --profile-run measures a full computation.
+    cached = use_cache(cache, stream) and not (incremental or profile_run)
+    result_cache = ResultCache(cache_dir, cache_size * 2**20) if cached else None
+
+    if incremental:
+        from .incremental import CHECKPOINT_DIRNAME, analyze_incremental
+
+        click.echo(f"Analyzing {csv_path} incrementally ...")
+        with stage("incremental"):
+            result, note = analyze_incremental(
+                csv_path,
+                out / CHECKPOINT_DIRNAME,
+                chunksize=chunksize,
+                sketch_k=options.sketch_k,
+                approx_distinct=approx_distinct,
+                selection=selection,
+            )
+        click.echo(f"  {note}")
+    else:
+        from .analyze import exit_on_load_error
+        from .pipeline import run_analysis
 
-    if suspicious_audit:
+        with exit_on_load_error():
+            result, _ = run_analysis(
+                csv_path, options, result_cache, plot_inputs=not no_plots, stage=stage, echo=click.echo
+            )
+
+    shape = result.summary["shape"]
+    click.echo(f"  {shape['rows']:,} rows x {shape['columns']} columns")
+    if result.sample is not None:
+        about = "" if result.sample.population_exact else "an estimated "
+        click.echo(
+            f"  Random sample of {about}{result.sample.population_rows:,} rows "
+            f"({result.sample.method} sampling, {result.sample.fraction:.2%})"
+        )
+    if result.skipped_columns:
+        click.echo(f"  Skipped {len(result.skipped_columns):,} columns (listed in schema.json)")
+
+    if result.suspicious_audit:
         total_suspicious = 0
-        for entry in suspicious_audit.values():
+        for entry in result.suspicious_audit.values():
             raw_count = entry.get("count")
             if isinstance(raw_count, int):
                 total_suspicious += raw_count
         click.echo(f"  Detected {total_suspicious:,} suspicious values treated as missing")
 
-    # --- Compute ---
-    summary = compute_summary(df)
-    schema = compute_schema(df)
-    missingness = compute_missingness(df, normalize_suspicious=False)
-    duplicates = compute_duplicates(df)
-    outliers = compute_outliers(df)
-    quality_issues, parseability = detect_column_warnings(df)
-
-    duplicate_count = int(duplicates.get("duplicate_rows_excluding_first", 0))
-    duplicate_pct = float(duplicates.get("duplicate_row_pct", 0.0))
-    if duplicate_count > 0:
-        quality_issues.append(
-            QualityIssue(
-                rule="duplicate_rows",
-                severity="warn",
-                column=None,
-                count=duplicate_count,
-                pct=duplicate_pct,
-                examples=[],
-                message=(
-                    f"Detected {duplicate_count} duplicate row(s) beyond first occurrence "
-                    f"({duplicate_pct:.2f}% of rows)."
-                ),
-                suggestion="Review deduplication logic or enforce primary keys upstream.",
-            )
+    plot_inputs = None if no_plots else result.plot_inputs
+    if metrics is None:
+        _write_reports_and_plots(result, plot_inputs, out)
+    else:
+        _write_reports_and_plots_serially(result, plot_inputs, out, stage)
+
+    _echo_console_summary(result, out)
+
+    if metrics is not None:
+        from .metrics import format_stage_table, write_run_metrics
+
+        mode = "incremental" if incremental else "stream" if stream else "memory"
+        payload = metrics.finish(
+            csv=str(csv_path),
+            mode=mode,
+            options={
+                "engine": None if mode != "memory" else engine,
+                "jobs": jobs if mode == "memory" else None,
+                "chunksize": None if mode == "memory" else chunksize,
+                "quantile_error": quantile_error,
+                "approx_distinct": approx_distinct,
+                "columns": selection.to_dict() if selection else None,
+                "sample": result.sample.to_dict() if result.sample else None,
+                "memory_plan": plan.to_dict() if plan else None,
+                "plots": not no_plots,
+            },
+            rows=shape["rows"],
+            columns=shape["columns"],
         )
+        click.echo("\nRun metrics:")
+        for line in format_stage_table(payload):
+            click.echo(line)
+        click.echo(f"Run metrics written to: {write_run_metrics(payload, out)}")
 
-    # --- Write reports ---
-    click.echo("\nWriting reports ...")
-    p1 = write_summary_md(
-        summary,
-        out,
-        quality_issues=quality_issues,
-        missingness=missingness,
-        duplicates=duplicates,
-        outliers=outliers,
+
+@main.command()
+@click.argument("csv_path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--state-out",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Where to write the state file.  [default: <csv name>.state.npz]",
+)
+@click.option(
+    "--chunksize",
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Rows per chunk while reading the CSV.",
+)
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help=(
+        "Estimate quartiles with KLL sketches at this normalized rank error "
+        "(e.g. 0.001) instead of exact sorting.  [default: exact in memory; "
+        f"{RANK_ERROR_FACTOR / DEFAULT_SKETCH_K:.5f} in streaming mode]"
+    ),
+)
+@click.option(
+    "--approx-distinct",
+    is_flag=True,
+    default=False,
+    help=(
+        "Estimate unique counts with HyperLogLog sketches (about 0.8% relative error, "
+        "16 KiB per column) instead of exact hash sets."
+    ),
+)
+def profile(
+    csv_path: str,
+    state_out: str | None,
+    chunksize: int,
+    quantile_error: float | None,
+    approx_distinct: bool,
+):
+    """Profile one CSV partition into a mergeable state file (no reports)."""
+    target = Path(state_out) if state_out else Path(f"{Path(csv_path).stem}.state.npz")
+
+    from .stream import profile_csv
+
+    click.echo(f"Profiling {csv_path} ...")
+    state = profile_csv(
+        csv_path,
+        chunksize=chunksize,
+        sketch_k=_sketch_k(quantile_error),
+        approx_distinct=approx_distinct,
     )
-    click.echo(f"  {p1}")
+    click.echo(f"  {state.total_rows:,} rows x {len(state.columns)} columns")
+    path = state.save(target)
+    click.echo(f"State written to: {path}")
 
-    p1b = write_summary_statistics_csv(summary, out)
-    if p1b:
-        click.echo(f"  {p1b}")
-    else:
-        click.echo("  Skipped: summary_statistics.csv (no numeric columns)")
 
-    p2 = write_schema_json(schema, out)
-    click.echo(f"  {p2}")
+@main.command()
+@click.argument(
+    "state_paths",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+)
+@click.option(
+    "--outdir",
+    default="reports",
+    show_default=True,
+    help="Directory to write output files.",
+    type=click.Path(),
+)
+@click.option(
+    "--no-plots",
+    is_flag=True,
+    default=False,
+    help="Write reports only; skip the plots (and never import matplotlib).",
+)
+def merge(state_paths: tuple[str, ...], outdir: str, no_plots: bool):
+    """Merge partition state files (in the given order) and write reports to OUTDIR."""
+    from .state import DatasetProfileState
+
+    out = Path(outdir)
 
-    p3 = write_missingness_csv(missingness, out)
-    click.echo(f"  {p3}")
+    click.echo(f"Merging {len(state_paths)} profile state(s) ...")
+    try:
+        merged = DatasetProfileState.load(state_paths[0])
+        for state_path in state_paths[1:]:
+            merged.merge(DatasetProfileState.load(state_path))
+    except (OSError, ValueError, KeyError) as exc:
+        raise click.ClickException(f"could not merge profile states: {exc}") from exc
 
-    p3b = write_correlation_csv(df, out)
-    if p3b:
-        click.echo(f"  {p3b}")
-    else:
-        click.echo("  Skipped: correlation.csv (fewer than 2 numeric columns)")
+    result = merged.to_result()
+    shape = result.summary["shape"]
+    click.echo(f"  {shape['rows']:,} rows x {shape['columns']} columns")
+
+    _write_reports_and_plots(result, None if no_plots else result.plot_inputs, out)
+
+    _echo_console_summary(result, out)
+
+
+@main.command("analyze-many")
+@click.argument("patterns", nargs=-1)
+@click.option(
+    "--manifest",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Text file listing one CSV path per line (relative to the manifest; '#' comments).",
+)
+@click.option(
+    "--outdir",
+    default="reports",
+    show_default=True,
+    help="Batch directory: one subdirectory per file, plus index.json and index.csv.",
+    type=click.Path(),
+)
+@click.option(
+    "--jobs",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Files analyzed at once, each in its own worker process.  [default: CPU count]",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Read each CSV in bounded chunks instead of loading it whole.",
+)
+@click.option(
+    "--chunksize",
+    default=DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Rows per chunk in --stream mode.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(CSV_ENGINES),
+    default="c",
+    show_default=True,
+    help="CSV parser (ignored with --stream); see analyze --help.",
+)
+@click.option(
+    "--columns",
+    multiple=True,
+    help="Analyze only columns matching these glob patterns; see analyze --help.",
+)
+@click.option(
+    "--exclude-columns",
+    multiple=True,
+    help="Skip columns matching these glob patterns.",
+)
+@click.option(
+    "--dtypes",
+    "dtypes_path",
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON file of column dtypes; see analyze --help.",
+)
+@click.option(
+    "--quantile-error",
+    default=None,
+    type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+    help="Estimate quartiles with KLL sketches at this normalized rank error.",
+)
+@click.option(
+    "--approx-distinct",
+    is_flag=True,
+    default=False,
+    help="Estimate unique counts with HyperLogLog sketches.",
+)
+@click.option(
+    "--no-plots",
+    is_flag=True,
+    default=False,
+    help="Write reports only; skip the plots (and never import matplotlib).",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=None,
+    help=(
+        "Read and write the result cache; --no-cache recomputes everything.  "
+        "[default: on, except with --stream, where the cache key costs an extra "
+        "full read of the file]"
+    ),
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="DATASET_INSIGHTS_CACHE_DIR",
+    type=click.Path(file_okay=False),
+    help="Result cache directory (env: DATASET_INSIGHTS_CACHE_DIR).",
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+    show_default=True,
+    envvar="DATASET_INSIGHTS_CACHE_SIZE",
+    type=click.IntRange(min=0),
+    help="MiB the result cache may use before least recently used entries are evicted.",
+)
+def analyze_many(
+    patterns: tuple[str, ...],
+    manifest: str | None,
+    outdir: str,
+    jobs: int | None,
+    stream: bool,
+    chunksize: int,
+    engine: str,
+    columns: tuple[str, ...],
+    exclude_columns: tuple[str, ...],
+    dtypes_path: str | None,
+    quantile_error: float | None,
+    approx_distinct: bool,
+    no_plots: bool,
+    cache: bool | None,
+    cache_dir: str | None,
+    cache_size: int,
+):
+    """Analyze every CSV matching PATTERNS (globs; ** recurses) and/or listed in
+    --manifest, on one pool of worker processes.
+
+    A file that fails is recorded in the index and does not stop the batch;
+    the exit status is 1 if any file failed.
+    """
+    from .batch import BatchOptions, expand_patterns, read_manifest, run_batch, write_index
+
+    paths, unmatched = expand_patterns(patterns)
+    if manifest is not None:
+        paths.extend(read_manifest(manifest))
+    for pattern in unmatched:
+        click.echo(f"Warning: no files match {pattern}", err=True)
+    paths = list(dict.fromkeys(path.resolve() for path in paths))
+    if not paths:
+        raise click.UsageError("no CSV files given; pass glob patterns or --manifest.")
+
+    options = BatchOptions(
+        engine=engine,
+        stream=stream,
+        chunksize=chunksize,
+        sketch_k=_sketch_k(quantile_error),
+        quantile_error=quantile_error,
+        approx_distinct=approx_distinct,
+        plots=not no_plots,
+        cache=cache,
+        cache_dir=cache_dir,
+        cache_max_bytes=cache_size * 2**20,
+        selection=_column_selection(columns, exclude_columns, dtypes_path),
+    )
+    jobs = jobs or os.cpu_count() or 1
+    click.echo(f"Analyzing {len(paths):,} files on {min(jobs, len(paths))} worker(s) ...")
+
+    done = 0
+
+    def report(record: dict) -> None:
+        nonlocal done
+        done += 1
+        prefix = f"  [{done}/{len(paths)}]"
+        if record["status"] == "ok":
+            source = " (cached)" if record["cached"] else ""
+            click.echo(
+                f"{prefix} {record['csv']}: {record['rows']:,} rows x {record['columns']} "
+                f"columns{source}"
+            )
+        else:
+            click.echo(f"{prefix} {record['csv']}: FAILED: {record['error']}")
 
-    p4 = write_duplicates_csv(duplicates, out)
-    click.echo(f"  {p4}")
+    records = run_batch(paths, outdir, options, jobs=jobs, on_record=report)
+    json_path, csv_path = write_index(records, outdir)
+    failed = sum(record["status"] != "ok" for record in records)
+    click.echo(f"\nDone. {len(records) - failed:,} of {len(records):,} files analyzed.")
+    click.echo(f"Index written to: {json_path} and {csv_path}")
+    if failed:
+        raise click.ClickException(f"{failed:,} of {len(records):,} files failed; see {json_path}")
 
-    p5 = write_outliers_csv(outliers, out)
-    click.echo(f"  {p5}")
 
-    p6 = write_data_quality_json(quality_issues, parseability, duplicates, out)
-    click.echo(f"  {p6}")
+@main.command()
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    show_default=True,
+    help="Loopback address to listen on (other addresses are refused).",
+)
+@click.option("--port", default=8765, show_default=True, type=click.IntRange(min=0, max=65535))
+@click.option(
+    "--socket",
+    "socket_path",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix socket instead of TCP (mode 0600).",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Worker processes running jobs.  [default: CPU count]",
+)
+@click.option(
+    "--max-queue",
+    default=64,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Unfinished jobs accepted before requests get 503.",
+)
+@click.option(
+    "--outdir",
+    default="reports",
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help="Root for job output directories; jobs write only under OUTDIR/jobs.",
+)
+@click.option(
+    "--data-dir",
+    "data_dirs",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Serve only files under this directory (repeatable).  [default: any file]",
+)
+@click.option(
+    "--no-plots",
+    is_flag=True,
+    default=False,
+    help="Default jobs to reports only (and never import matplotlib).",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Default jobs to recomputing everything without the result cache.",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    envvar="DATASET_INSIGHTS_CACHE_DIR",
+    type=click.Path(file_okay=False),
+    help="Result cache directory (env: DATASET_INSIGHTS_CACHE_DIR).",
+)
+@click.option(
+    "--cache-size",
+    default=DEFAULT_CACHE_MAX_BYTES // 2**20,
+    show_default=True,
+    envvar="DATASET_INSIGHTS_CACHE_SIZE",
+    type=click.IntRange(min=0),
+    help="MiB the result cache may use before least recently used entries are evicted.",
+)
+def serve(
+    host: str,
+    port: int,
+    socket_path: str | None,
+    workers: int | None,
+    max_queue: int,
+    outdir: str,
+    data_dirs: tuple[str, ...],
+    no_plots: bool,
+    no_cache: bool,
+    cache_dir: str | None,
+    cache_size: int,
+):
+    """Run a profiling daemon that accepts analyze jobs over localhost HTTP or a
+    Unix socket, with pandas (and matplotlib) kept loaded in its workers.
+
+    POST /analyze {"csv": PATH} runs a job and returns its report paths;
+    GET /jobs/<id> polls one; GET /health reports status. Stop with Ctrl-C or
+    SIGTERM.
+    """
+    import signal
+
+    from .batch import BatchOptions
+    from .server import JobQueue, check_loopback, make_server
+
+    if socket_path is None:
+        try:
+            check_loopback(host)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc), param_hint="--host") from None
+
+    defaults = BatchOptions(
+        plots=not no_plots,
+        cache=False if no_cache else None,
+        cache_dir=cache_dir,
+        cache_max_bytes=cache_size * 2**20,
+    )
+    workers = workers or os.cpu_count() or 1
+    queue = JobQueue(
+        outdir, workers=workers, max_queued=max_queue, defaults=defaults, data_dirs=list(data_dirs)
+    )
+    try:
+        server = make_server(queue, host, port, socket_path)
+    except ValueError as exc:
+        queue.close()
+        raise click.BadParameter(str(exc), param_hint="--socket") from None
+    except OSError as exc:
+        queue.close()
+        raise click.ClickException(f"cannot listen: {exc}") from None
+
+    server_pid = os.getpid()
+
+    def stop(signum, frame):
+        if os.getpid() != server_pid:  # a forked worker inherited this handler
+            os._exit(128 + signum)
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    where = socket_path if socket_path is not None else "http://%s:%d" % server.server_address[:2]
+    click.echo(f"Serving on {where} with {workers} worker(s). Press Ctrl-C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        click.echo("\nShutting down ...")
+    finally:
+        server.server_close()
+        queue.close()
+        if socket_path is not None and Path(socket_path).is_socket():
+            Path(socket_path).unlink()
+
+
+def _patterns(values: tuple[str, ...]) -> list[str]:
+    return [pattern.strip() for value in values for pattern in value.split(",") if pattern.strip()]
+
+
+def _column_selection(
+    columns: tuple[str, ...], exclude_columns: tuple[str, ...], dtypes_path: str | None
+) -> ColumnSelection | None:
+    """The selection given by --columns, --exclude-columns and --dtypes; None when unused."""
+    if not (columns or exclude_columns or dtypes_path):
+        return None
+    from .analyze import ColumnSelection, read_dtypes_file
+
+    dtypes: dict[str, str] = {}
+    if dtypes_path is not None:
+        try:
+            dtypes = read_dtypes_file(dtypes_path)
+        except (OSError, ValueError) as exc:
+            raise click.BadParameter(str(exc), param_hint="'--dtypes'") from exc
+    return ColumnSelection(_patterns(columns), _patterns(exclude_columns), dtypes)
+
+
+def _sketch_k(quantile_error: float | None) -> int:
+    from .sketches import k_for_error
+
+    return DEFAULT_SKETCH_K if quantile_error is None else k_for_error(quantile_error)
+
+
+def _write_reports_and_plots(
+    result: AnalysisResult, plot_inputs: PlotInputs | None, out: Path
+) -> None:
+    if plot_inputs is None:
+        click.echo("\nWriting reports ...")
+        _write_reports(result, out)
+        click.echo("\nSkipped plots (--no-plots).")
+        return
+
+    from .plots import plot_executor, submit_plots
+
+    # Plots render in worker processes while the reports are written.
+    with plot_executor() as executor:
+        plot_futures = submit_plots(executor, plot_inputs, out)
+        click.echo("\nWriting reports ...")
+        _write_reports(result, out)
+        click.echo("\nGenerating plots ...")
+        _echo_plots(plot_inputs, {name: future.result() for name, future in plot_futures.items()})
+
+
+def _write_reports_and_plots_serially(
+    result: AnalysisResult, plot_inputs: PlotInputs | None, out: Path, stage: Stage
+) -> None:
+    """``_write_reports_and_plots`` in this process, one ``stage`` per report and plot."""
+    click.echo("\nWriting reports ...")
+    _write_reports(result, out, stage)
+    if plot_inputs is None:
+        click.echo("\nSkipped plots (--no-plots).")
+        return
+
+    from .plots import render_plots
 
-    # --- Generate plots ---
     click.echo("\nGenerating plots ...")
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    if not numeric_cols:
-        click.echo("  Warning: no numeric columns found -- skipping histogram and heatmap.")
+    _echo_plots(plot_inputs, render_plots(plot_inputs, out, stage))
 
-    p7 = plot_distribution_histogram(df, out)
-    if p7:
-        click.echo(f"  {p7}")
-    else:
-        click.echo("  Skipped: distribution_histogram.png (no numeric columns)")
 
-    p8 = plot_correlation_heatmap(df, out)
-    if p8:
-        click.echo(f"  {p8}")
-    else:
-        click.echo("  Skipped: correlation_heatmap.png (fewer than 2 numeric columns)")
+def _write_reports(result: AnalysisResult, out: Path, stage: Stage = nullcontext) -> None:
+    from .reports import SKIPPED_REPORT_REASONS, write_reports
 
-    p9 = plot_missingness_bar(df, out)
-    click.echo(f"  {p9}")
+    for name, path in write_reports(result, out, stage).items():
+        if path:
+            click.echo(f"  {path}")
+        else:
+            click.echo(f"  Skipped: {name} ({SKIPPED_REPORT_REASONS[name]})")
+
+
+def _echo_plots(inputs: PlotInputs, paths: dict[str, Path | None]) -> None:
+    if not inputs.histograms:
+        click.echo("  Warning: no numeric columns found -- skipping histogram and heatmap.")
+
+    skip_reasons = {
+        "distribution_histogram": "no numeric columns",
+        "correlation_heatmap": "fewer than 2 numeric columns",
+        "box_plot": "no numeric columns",
+    }
+    for name, path in paths.items():
+        if path:
+            click.echo(f"  {path}")
+        else:
+            click.echo(f"  Skipped: {name}.png ({skip_reasons[name]})")
 
-    p10 = plot_box_plots(df, out, outliers=outliers)
-    if p10:
-        click.echo(f"  {p10}")
-    else:
-        click.echo("  Skipped: box_plot.png (no numeric columns)")
 
-    # --- Console summary ---
-    missing_count_values = missingness["missing_count"].to_numpy(dtype="int64")
+def _echo_console_summary(result: AnalysisResult, out: Path) -> None:
+    from .analyze import summarize_quality_issues
+
+    max_examples = 3
+    missing_count_values = result.missingness["missing_count"].to_numpy(dtype="int64")
     total_missing = int(missing_count_values.sum())
     cols_with_missing = int((missing_count_values > 0).sum())
     click.echo(
-        f"\nDone. {cols_with_missing}/{df.shape[1]} columns have missing data "
+        f"\nDone. {cols_with_missing}/{result.summary['shape']['columns']} columns have missing data "
         f"({total_missing:,} total missing values)."
     )
 
+    suspicious_audit = result.suspicious_audit
     if suspicious_audit:
         click.echo("Suspicious values treated as missing:")
         for column, entry in suspicious_audit.items():
@@ -184,7 +911,7 @@ def analyze(csv_path: str, outdir: str):
             else:
                 click.echo(f"  {column}: {count} values")
 
-    severity_counts = summarize_quality_issues(quality_issues)
+    severity_counts = summarize_quality_issues(result.quality_issues)
     total_issues = sum(severity_counts.values())
     if total_issues:
         click.echo(
@@ -196,7 +923,7 @@ def analyze(csv_path: str, outdir: str):
 
         highlighted = [
             issue
-            for issue in quality_issues
+            for issue in result.quality_issues
             if issue.severity in {"critical", "warn"}
         ]
         for issue in highlighted[:8]:
@@ -0,0 +1,146 @@
+"""Column-level result cache: re-profile only the columns whose values changed.
+
+Each column is fingerprinted from its name, dtype, length and per-row value
+hashes. These are the same hashes duplicate detection combines into row
+hashes, so they are computed once per run. The per-column outputs (schema
+entry, summary statistics, missing count, outliers, parseability and column
+quality issues) are cached under the fingerprint in the ``ResultCache``
+directory. An unchanged column is therefore never profiled again, even when
+other columns of the file were edited.
+
+The correlation matrix is cached per header. On the next run with the same
+header, only the pairs that involve a changed numeric column are recomputed.
+Each pair uses the same pairwise-complete Pearson formula as
+``DataFrame.corr``, so the matrix equals a full recompute. Duplicate rows span
+all columns and are recounted every run from the column hashes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .analyze import AnalysisResult, compute_correlation, compute_duplicates
+from .cache import ResultCache
+from .duplicates import column_hashes, combine_column_hashes
+from .parallel import assemble_result, profile_column_groups
+
+
+def column_fingerprints(df: pd.DataFrame) -> tuple[list[str], list[np.ndarray]]:
+    """Hex fingerprint of each column, and the value hashes it was built from."""
+    hashes = [column_hashes(df.iloc[:, position]) for position in range(df.shape[1])]
+    fingerprints = []
+    for position, values in enumerate(hashes):
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps([str(df.columns[position]), str(df.dtypes.iloc[position]), len(df)]).encode()
+        )
+        digest.update(values.tobytes())
+        fingerprints.append(digest.hexdigest())
+    return fingerprints, hashes
+
+
+def _pair_correlation(numeric_df: pd.DataFrame, left: int, right: int) -> float:
+    """Pearson correlation of two column positions, evaluated in frame order so the
+    floating-point result matches the full ``DataFrame.corr`` matrix bit for bit."""
+    if left == right:
+        return float(numeric_df.iloc[:, [left]].corr().iloc[0, 0])
+    first, second = sorted((left, right))
+    return float(numeric_df.iloc[:, [first, second]].corr().iloc[0, 1])
+
+
+def update_correlation(
+    df: pd.DataFrame,
+    fingerprints: dict[str, str],
+    previous: dict[str, Any] | None,
+) -> pd.DataFrame | None:
+    """The correlation matrix of ``df``, reusing the entries of ``previous`` whose two
+    columns kept their fingerprint.
+
+    ``previous`` is the record this function's caller stored for the last run
+    with the same header (``{"fingerprints": ..., "correlation": ...}``). The
+    full matrix is recomputed when there is none or when at least half of the
+    numeric columns changed.
+    """
+    numeric_df = df.select_dtypes(include="number")
+    if numeric_df.shape[1] < 2:
+        return None
+    if previous is None or previous["correlation"] is None or df.columns.has_duplicates:
+        return compute_correlation(df)
+
+    names = list(numeric_df.columns)
+    old_fingerprints: dict[str, str] = previous["fingerprints"]
+    old_matrix: pd.DataFrame = previous["correlation"]
+    changed = [
+        name
+        for name in names
+        if old_fingerprints.get(str(name)) != fingerprints[str(name)] or name not in old_matrix.index
+    ]
+    if 2 * len(changed) >= len(names):
+        return compute_correlation(df)
+
+    matrix = old_matrix.reindex(index=names, columns=names)
+    changed_positions = [names.index(name) for name in changed]
+    done: set[int] = set()
+    for left in changed_positions:
+        for right in range(len(names)):
+            if right in done:
+                continue
+            value = _pair_correlation(numeric_df, left, right)
+            matrix.iloc[left, right] = value
+            matrix.iloc[right, left] = value
+        done.add(left)
+    return matrix
+
+
+def analyze_frame_cached(
+    df: pd.DataFrame,
+    cache: ResultCache,
+    suspicious_audit: dict[str, dict[str, int | list[str]]] | None = None,
+    jobs: int = 1,
+    quantile_error: float | None = None,
+    approx_distinct: bool = False,
+) -> AnalysisResult:
+    """``analyze_frame`` that profiles only columns missing from ``cache``.
+
+    Produces the same result as ``analyze_frame``. Freshly profiled columns and
+    the correlation matrix are written back to ``cache``. With ``jobs > 1``
+    the missing columns are profiled on worker processes.
+    """
+    options = {"quantile_error": quantile_error, "approx_distinct": approx_distinct}
+    fingerprints, hashes = column_fingerprints(df)
+    keys = [cache.entry_key({"column": fingerprint, "options": options}) for fingerprint in fingerprints]
+    parts: list[dict[str, Any] | None] = [cache.get(key) for key in keys]
+    stale = [position for position, part in enumerate(parts) if part is None]
+
+    by_name = {str(name): fingerprint for name, fingerprint in zip(df.columns, fingerprints)}
+    correlation_key = cache.entry_key({"correlation": [str(name) for name in df.columns]})
+    previous = cache.get(correlation_key)
+
+    def frame_wide() -> tuple[dict[str, Any], pd.DataFrame | None]:
+        row_hashes = combine_column_hashes(hashes, n_rows=len(df), n_columns=df.shape[1])
+        return compute_duplicates(df, row_hashes=row_hashes), update_correlation(df, by_name, previous)
+
+    fresh, computed = profile_column_groups(
+        df,
+        [[position] for position in stale],
+        jobs,
+        quantile_error,
+        approx_distinct,
+        parent_work=frame_wide,
+    )
+    assert computed is not None
+    duplicates, correlation = computed
+
+    updates: dict[str, Any] = {}
+    for position, part in zip(stale, fresh):
+        parts[position] = part
+        updates[keys[position]] = part
+    if previous is None or previous["fingerprints"] != by_name:
+        updates[correlation_key] = {"fingerprints": by_name, "correlation": correlation}
+    cache.put_many(updates)
+    return assemble_result(df, parts, duplicates, correlation, suspicious_audit)
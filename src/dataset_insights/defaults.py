@@ -0,0 +1,12 @@
+"""Defaults shared by the CLI options and the analysis modules.
+
+This module imports nothing, so building the CLI (``--help``, ``--version``)
+does not load pandas, numpy or matplotlib.
+"""
+
+CSV_ENGINES = ("c", "arrow")
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_DUPLICATE_MEMORY_BUDGET = 256 * 2**20  # bytes of buffered hashes and positions
+DEFAULT_SKETCH_K = 2048
+RANK_ERROR_FACTOR = 1.7
+DEFAULT_CACHE_MAX_BYTES = 512 * 2**20  # result cache size before LRU eviction
@@ -0,0 +1,324 @@
+"""Duplicate-row detection from 64-bit row hashes, in memory or out of core.
+
+Every row is reduced to one 64-bit hash built from per-column value hashes, so
+counting duplicates needs one sort of a ``uint64`` array instead of hash tables
+of whole rows. Missing values hash identically whatever their representation
+(``None``, ``NaN``, ``pd.NA``) and ``-0.0`` equals ``0.0``, matching
+``DataFrame.duplicated``.
+
+``DuplicateCounter`` accepts rows chunk by chunk. Hashes (with row positions)
+are buffered up to a memory budget and then spilled to disk in hash-range
+partitions; each partition is counted on its own at the end, so duplicate
+statistics work on files larger than memory. A partition too large for the
+budget (a file many times the budget, or skewed hashes) is split again on the
+next hash bits before it is loaded. With 64-bit hashes the chance of
+any collision is about ``n**2 / 2**65`` (under 0.03% for a billion rows).
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .defaults import DEFAULT_DUPLICATE_MEMORY_BUDGET
+
+
+_SPILL_PARTITION_BITS = 6
+_HASH_BITS = 64
+_NA_HASH = np.uint64(0x9E3779B97F4A7C15)
+_BYTES_PER_ROW = 16  # uint64 hash + int64 position
+
+
+def column_hashes(series: pd.Series) -> np.ndarray:
+    """One ``uint64`` hash per value; missing values share one hash and ``-0.0``
+    hashes like ``0.0``."""
+    if pd.api.types.is_float_dtype(series.dtype) and isinstance(series.dtype, np.dtype):
+        series = series + 0.0  # fold -0.0 into 0.0
+    hashes = pd.util.hash_pandas_object(series, index=False, categorize=False).to_numpy(
+        dtype=np.uint64
+    )
+    missing = series.isna().to_numpy(dtype=bool)
+    if missing.any():
+        hashes = np.where(missing, _NA_HASH, hashes)
+    return hashes
+
+
+def hash_rows(df: pd.DataFrame) -> np.ndarray:
+    """One ``uint64`` hash per row, combining column hashes in column order."""
+    return combine_column_hashes(
+        (column_hashes(df.iloc[:, position]) for position in range(df.shape[1])),
+        n_rows=len(df),
+        n_columns=df.shape[1],
+    )
+
+
+def combine_column_hashes(
+    hashes: Iterable[np.ndarray], n_rows: int, n_columns: int
+) -> np.ndarray:
+    """Row hashes from the ``column_hashes`` of all ``n_columns`` columns, in order."""
+    combined = np.full(n_rows, 0x345678, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for position, column in enumerate(hashes):
+        combined ^= column
+        combined *= multiplier
+        multiplier += np.uint64(82520 + 2 * (n_columns - position))
+    combined += np.uint64(97531)
+    return combined
+
+
+@dataclass
+class DuplicateStats:
+    """Duplicate counts plus the positions of the first duplicate rows (row order)."""
+
+    total_rows: int = 0
+    duplicate_rows: int = 0
+    group_count: int = 0
+    example_positions: list[int] = field(default_factory=list)
+
+
+def _count_partition(
+    hashes: np.ndarray, positions: np.ndarray, max_examples: int, stats: DuplicateStats
+) -> None:
+    """Fold one hash partition into ``stats``. ``positions`` must be ascending."""
+    if len(hashes) == 0:
+        return
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    group_start = np.empty(len(sorted_hashes), dtype=bool)
+    group_start[0] = True
+    np.not_equal(sorted_hashes[1:], sorted_hashes[:-1], out=group_start[1:])
+
+    stats.duplicate_rows += int(len(sorted_hashes) - group_start.sum())
+    group_sizes = np.diff(np.append(np.flatnonzero(group_start), len(sorted_hashes)))
+    stats.group_count += int((group_sizes > 1).sum())
+
+    if max_examples > 0:
+        # The stable sort keeps each group's first occurrence at its start.
+        _add_examples(stats, np.sort(positions[order][~group_start]), max_examples)
+
+
+def _add_examples(stats: DuplicateStats, repeat_positions: np.ndarray, max_examples: int) -> None:
+    """Keep the first ``max_examples`` of the example positions and the ascending
+    ``repeat_positions``."""
+    merged = sorted(stats.example_positions + repeat_positions[:max_examples].tolist())
+    stats.example_positions = merged[:max_examples]
+
+
+def count_duplicates(hashes: np.ndarray, max_examples: int = 0) -> DuplicateStats:
+    """Duplicate statistics for in-memory row hashes."""
+    stats = DuplicateStats(total_rows=int(len(hashes)))
+    _count_partition(hashes, np.arange(len(hashes), dtype=np.int64), max_examples, stats)
+    return stats
+
+
+class DuplicateCounter:
+    """Out-of-core duplicate counter fed one chunk at a time.
+
+    Use as a context manager (or call ``close()``) to remove spill files.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_DUPLICATE_MEMORY_BUDGET,
+        max_examples: int = 0,
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        self.memory_budget = memory_budget
+        self.max_examples = max_examples
+        self._spill_parent = spill_dir
+        self._spill_path: Path | None = None
+        self._hashes: list[np.ndarray] = []
+        self._positions: list[np.ndarray] = []
+        self._buffered = 0
+        self.total_rows = 0
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill_path is not None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if len(chunk) == 0:
+            return
+        self._hashes.append(hash_rows(chunk))
+        self._positions.append(
+            np.arange(self.total_rows, self.total_rows + len(chunk), dtype=np.int64)
+        )
+        self.total_rows += len(chunk)
+        self._buffered += len(chunk)
+        if self._buffered * _BYTES_PER_ROW > self.memory_budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self._hashes:
+            return
+        if self._spill_path is None:
+            self._spill_path = Path(tempfile.mkdtemp(prefix="dup-spill-", dir=self._spill_parent))
+        hashes = np.concatenate(self._hashes)
+        positions = np.concatenate(self._positions)
+        shift = _HASH_BITS - _SPILL_PARTITION_BITS
+        self._write_partitions(hashes, positions, "", shift, _SPILL_PARTITION_BITS)
+        self._hashes, self._positions, self._buffered = [], [], 0
+
+    def _files(self, name: str) -> tuple[Path, Path]:
+        assert self._spill_path is not None
+        return self._spill_path / f"{name}.hashes", self._spill_path / f"{name}.positions"
+
+    def _write_partitions(
+        self, hashes: np.ndarray, positions: np.ndarray, parent: str, shift: int, bits: int
+    ) -> None:
+        """Append rows to the partitions ``<parent><n>``, where ``n`` is the ``bits``
+        hash bits above bit ``shift``."""
+        mask = np.uint64((1 << bits) - 1)
+        partition = ((hashes >> np.uint64(shift)) & mask).astype(np.intp)
+        for part in np.unique(partition):
+            selected = partition == part
+            hash_file, position_file = self._files(f"{parent}{part}")
+            with open(hash_file, "ab") as handle:
+                hashes[selected].tofile(handle)
+            with open(position_file, "ab") as handle:
+                positions[selected].tofile(handle)
+
+    def finish(self) -> DuplicateStats:
+        """Count duplicates over every row seen. Call once, after the last ``update``:
+        spilled partitions are removed as they are counted."""
+        if not self.spilled:
+            hashes = np.concatenate(self._hashes) if self._hashes else np.empty(0, np.uint64)
+            return count_duplicates(hashes, self.max_examples)
+
+        self._spill()
+        stats = DuplicateStats(total_rows=self.total_rows)
+        for part in range(1 << _SPILL_PARTITION_BITS):
+            self._count_spilled(str(part), _HASH_BITS - _SPILL_PARTITION_BITS, stats)
+        return stats
+
+    def _count_spilled(self, name: str, shift: int, stats: DuplicateStats) -> None:
+        """Fold spilled partition ``name``, whose hashes agree above bit ``shift``,
+        into ``stats``. A partition larger than the budget is first split on the
+        next bits, read a budget-sized block at a time."""
+        hash_file, position_file = self._files(name)
+        if not hash_file.exists():
+            return
+        rows = hash_file.stat().st_size // 8
+        if rows * _BYTES_PER_ROW <= self.memory_budget:
+            hashes = np.fromfile(hash_file, dtype=np.uint64)
+            positions = np.fromfile(position_file, dtype=np.int64)
+            _count_partition(hashes, positions, self.max_examples, stats)
+        elif shift == 0:
+            # Every hash in the partition is the same: one group, in row order.
+            stats.duplicate_rows += rows - 1
+            stats.group_count += 1
+            if self.max_examples > 0:
+                positions = np.fromfile(position_file, dtype=np.int64, count=self.max_examples + 1)
+                _add_examples(stats, positions[1:], self.max_examples)
+        else:
+            bits = min(_SPILL_PARTITION_BITS, shift)
+            block = max(self.memory_budget // _BYTES_PER_ROW, 1)
+            for start in range(0, rows, block):
+                hashes = np.fromfile(hash_file, dtype=np.uint64, count=block, offset=start * 8)
+                positions = np.fromfile(position_file, dtype=np.int64, count=block, offset=start * 8)
+                self._write_partitions(hashes, positions, f"{name}-", shift - bits, bits)
+            hash_file.unlink()
+            position_file.unlink()
+            for part in range(1 << bits):
+                self._count_spilled(f"{name}-{part}", shift - bits, stats)
+            return
+        hash_file.unlink()
+        position_file.unlink()
+
+    def close(self) -> None:
+        if self._spill_path is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._spill_path = None
+
+    def __enter__(self) -> DuplicateCounter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class DistinctRowCounter:
+    """Exact duplicate counter that keeps every distinct row hash with its count.
+
+    Unlike ``DuplicateCounter`` it can be saved (``hashes`` and ``counts``) and
+    extended later with rows appended to the same data, at 16 bytes per
+    distinct row held in memory.
+
+    Each chunk's new hashes are kept as a sorted run of their own. A run is
+    merged into the one before it once it is at least half that run's size, so
+    there are O(log n) runs to search and every hash is merged O(log n) times,
+    instead of the whole table being copied for every chunk.
+    """
+
+    def __init__(
+        self, hashes: np.ndarray | None = None, counts: np.ndarray | None = None
+    ) -> None:
+        # Disjoint runs of sorted hashes with their counts, largest first.
+        self._runs: list[tuple[np.ndarray, np.ndarray]] = []
+        if hashes is not None and counts is not None and len(hashes):
+            self._runs.append((hashes, counts))
+        self.total_rows = sum(int(counts.sum()) for _, counts in self._runs)
+
+    @property
+    def hashes(self) -> np.ndarray:
+        """Every distinct row hash, sorted."""
+        self._merge(0)
+        return self._runs[0][0] if self._runs else np.empty(0, dtype=np.uint64)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Rows seen per hash, aligned with ``hashes``."""
+        self._merge(0)
+        return self._runs[0][1] if self._runs else np.empty(0, dtype=np.int64)
+
+    def _merge(self, keep: int) -> None:
+        """Merge the runs after the first ``keep`` into one."""
+        if len(self._runs) - keep < 2:
+            return
+        tail = self._runs[keep:]
+        hashes = np.concatenate([run[0] for run in tail])
+        counts = np.concatenate([run[1] for run in tail])
+        order = np.argsort(hashes, kind="stable")  # linear-ish on sorted runs
+        self._runs[keep:] = [(hashes[order], counts[order])]
+
+    def update(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Count ``chunk``'s rows; return the positions (within ``chunk``) of rows that
+        repeat an earlier row."""
+        if len(chunk) == 0:
+            return np.empty(0, dtype=np.int64)
+        unique, first, inverse, counts = np.unique(
+            hash_rows(chunk), return_index=True, return_inverse=True, return_counts=True
+        )
+        seen = np.zeros(len(unique), dtype=bool)
+        for hashes, run_counts in self._runs:
+            slots = np.searchsorted(hashes, unique)
+            found = slots < len(hashes)
+            found[found] = hashes[slots[found]] == unique[found]
+            run_counts[slots[found]] += counts[found]
+            seen |= found
+
+        repeat = np.ones(len(chunk), dtype=bool)
+        repeat[first] = False
+        repeat |= seen[inverse]
+
+        if not seen.all():
+            self._runs.append((unique[~seen], counts[~seen]))
+            while len(self._runs) > 1 and 2 * len(self._runs[-1][0]) >= len(self._runs[-2][0]):
+                self._merge(len(self._runs) - 2)
+        self.total_rows += len(chunk)
+        return np.flatnonzero(repeat)
+
+    def stats(self) -> DuplicateStats:
+        """Duplicate statistics over every row seen so far (without example positions)."""
+        distinct = sum(len(hashes) for hashes, _ in self._runs)
+        return DuplicateStats(
+            total_rows=self.total_rows,
+            duplicate_rows=self.total_rows - distinct,
+            group_count=sum(int((counts > 1).sum()) for _, counts in self._runs),
+        )
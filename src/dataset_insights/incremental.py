@@ -0,0 +1,286 @@
+"""Append-only incremental analysis (``analyze --incremental``).
+
+A checkpoint directory keeps four things between runs: the mergeable profile
+state of every row analyzed so far (``state.py``), the distinct row hashes with
+their counts for duplicate detection, the duplicate example rows, and a JSON
+record. The record holds the byte offset analyzed up to, the header's SHA-256,
+the SHA-256 of all bytes before the offset, and the encoding, delimiter and
+dtypes settled on by the first run (plus every column name, when a column
+selection skipped some).
+
+A later run hashes the file up to the stored offset. When the header and those
+bytes are unchanged, it parses only the bytes appended since, with the stored
+dtypes pinned, and folds them into the stored state. Anything else falls back
+to a full streaming run that writes a fresh checkpoint. That covers an edited
+or truncated file, changed options, a missing or unreadable checkpoint, and
+appended rows that no longer fit the pinned dtypes (a whole-file parse would
+have inferred different types).
+
+Statistics follow ``analyze --stream``. Duplicate counts are exact, and so are
+quartiles until a column outgrows its quantile sketch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .analyze import (
+    DUPLICATE_EXAMPLE_CAP,
+    EXTRA_NA_VALUES,
+    AnalysisResult,
+    ColumnSelection,
+    CSVLoadError,
+    csv_column_names,
+    duplicate_example_records,
+    duplicate_rows_issue,
+    duplicates_summary,
+    exit_on_load_error,
+)
+from .defaults import DEFAULT_CHUNK_SIZE, DEFAULT_SKETCH_K
+from .duplicates import DistinctRowCounter
+from .readers import compression, is_columnar
+from .state import DatasetProfileState
+from .stream import open_byte_range, profile_checked
+
+
+CHECKPOINT_DIRNAME = ".incremental"
+CHECKPOINT_FORMAT_VERSION = 2
+_HASH_BLOCK_BYTES = 2**20
+_RECORD_NAME = "checkpoint.json"
+_STATE_NAME = "state.npz"
+_ROWS_NAME = "row_hashes.npz"
+
+
+@dataclass
+class Checkpoint:
+    """Where the last incremental run stopped, and what it assumed about the file."""
+
+    offset: int
+    total_rows: int
+    header_digest: str
+    prefix_digest: str
+    encoding: str
+    dtypes: dict[str, str]
+    options: dict[str, Any]
+    duplicate_examples: list[dict[str, object]] = field(default_factory=list)
+    delimiter: str = ","
+    names: list[str] = field(default_factory=list)  # all columns, when some are skipped
+    format_version: int = CHECKPOINT_FORMAT_VERSION
+
+
+class _Run:
+    """Profile state plus exact duplicate tracking, fed one normalized chunk at a time."""
+
+    def __init__(
+        self,
+        state: DatasetProfileState,
+        rows: DistinctRowCounter | None = None,
+        examples: list[dict[str, object]] | None = None,
+    ) -> None:
+        self.state = state
+        self.rows = rows if rows is not None else DistinctRowCounter()
+        self.examples = list(examples or [])
+
+    def count_rows(self, chunk: pd.DataFrame) -> None:
+        repeats = self.rows.update(chunk)
+        wanted = DUPLICATE_EXAMPLE_CAP - len(self.examples)
+        if wanted > 0 and len(repeats):
+            self.examples.extend(duplicate_example_records(chunk.iloc[repeats[:wanted]]))
+
+    def result(self) -> AnalysisResult:
+        result = self.state.to_result()
+        result.duplicates = duplicates_summary(self.rows.stats(), self.examples)
+        duplicate_issue = duplicate_rows_issue(result.duplicates)
+        if duplicate_issue is not None:
+            result.quality_issues.append(duplicate_issue)
+        return result
+
+
+def _header_digest(path: Path) -> str:
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.readline()).hexdigest()
+
+
+def _digests(path: Path, offset: int, size: int) -> tuple[str, str]:
+    """SHA-256 of bytes ``[0, offset)`` and of bytes ``[0, size)``, in one read."""
+    digest = hashlib.sha256()
+    prefix = ""
+    position = 0
+    with open(path, "rb") as handle:
+        for stop in (offset, size):
+            while position < stop:
+                block = handle.read(min(_HASH_BLOCK_BYTES, stop - position))
+                if not block:
+                    raise OSError(f"{path} shrank while it was read")
+                digest.update(block)
+                position += len(block)
+            if not prefix:
+                prefix = digest.hexdigest()
+    return prefix, digest.hexdigest()
+
+
+def _ends_with_newline(path: Path, offset: int) -> bool:
+    if offset == 0:
+        return False
+    with open(path, "rb") as handle:
+        handle.seek(offset - 1)
+        return handle.read(1) == b"\n"
+
+
+def _write_atomic(target: Path, write: Any) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(Path(tmp_name))
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def save_checkpoint(directory: Path, checkpoint: Checkpoint, run: _Run) -> None:
+    """Write the checkpoint; the JSON record goes last, so it never points at
+    state from another run."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    def write_rows(path: Path) -> None:
+        with path.open("wb") as handle:
+            np.savez(handle, hashes=run.rows.hashes, counts=run.rows.counts)
+
+    _write_atomic(directory / _STATE_NAME, run.state.save)
+    _write_atomic(directory / _ROWS_NAME, write_rows)
+    checkpoint.duplicate_examples = run.examples
+    _write_atomic(
+        directory / _RECORD_NAME,
+        lambda path: path.write_text(json.dumps(asdict(checkpoint), indent=2), encoding="utf-8"),
+    )
+
+
+def load_checkpoint(directory: Path) -> tuple[Checkpoint, _Run] | None:
+    """The stored checkpoint and run, or None when missing, unreadable or inconsistent."""
+    try:
+        record = json.loads((directory / _RECORD_NAME).read_text(encoding="utf-8"))
+        if record.get("format_version") != CHECKPOINT_FORMAT_VERSION:
+            return None
+        checkpoint = Checkpoint(**record)
+        state = DatasetProfileState.load(directory / _STATE_NAME)
+        with np.load(directory / _ROWS_NAME, allow_pickle=False) as arrays:
+            rows = DistinctRowCounter(arrays["hashes"], arrays["counts"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not state.total_rows == rows.total_rows == checkpoint.total_rows:
+        return None
+    return checkpoint, _Run(state, rows, checkpoint.duplicate_examples)
+
+
+def _append(path: Path, checkpoint: Checkpoint, run: _Run, size: int, chunksize: int) -> int:
+    """Fold rows in bytes ``[checkpoint.offset, size)`` into ``run``; return how many."""
+    dtypes = {col: pd.api.types.pandas_dtype(dtype) for col, dtype in checkpoint.dtypes.items()}
+    appended = 0
+    with open_byte_range(path, checkpoint.offset, size) as source:
+        reader = pd.read_csv(
+            source,
+            header=None,
+            names=checkpoint.names or list(dtypes),
+            usecols=list(dtypes) if checkpoint.names else None,
+            index_col=False,
+            chunksize=chunksize,
+            na_values=EXTRA_NA_VALUES,
+            encoding=checkpoint.encoding,
+            sep=checkpoint.delimiter,
+            dtype=dtypes,
+        )
+        with reader:
+            for chunk in reader:
+                run.count_rows(run.state.update(chunk))
+                appended += len(chunk)
+    return appended
+
+
+def analyze_incremental(
+    path: str | Path,
+    checkpoint_dir: str | Path,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    sketch_k: int = DEFAULT_SKETCH_K,
+    approx_distinct: bool = False,
+    selection: ColumnSelection | None = None,
+) -> tuple[AnalysisResult, str]:
+    """Analyze ``path``, parsing only bytes appended since the checkpoint in
+    ``checkpoint_dir``, and update the checkpoint.
+
+    Returns the result and a one-line note on what was read. Raises SystemExit
+    with a clear message on invalid input, like ``analyze_stream``, and for
+    compressed or columnar files, where appended bytes cannot be parsed alone.
+    """
+    path = Path(path)
+    if compression(path) or is_columnar(path):
+        with exit_on_load_error():
+            raise CSVLoadError(f"incremental analysis needs an uncompressed CSV, got {path.name}")
+    directory = Path(checkpoint_dir)
+    options = {
+        "sketch_k": sketch_k,
+        "approx_distinct": approx_distinct,
+        "columns": selection.to_dict() if selection is not None else None,
+    }
+    size = path.stat().st_size if path.exists() else 0
+
+    loaded = load_checkpoint(directory)
+    reason = "no usable checkpoint"
+    if loaded is not None:
+        checkpoint, run = loaded
+        if checkpoint.options != options:
+            reason = "options changed"
+        elif size < checkpoint.offset:
+            reason = "file is shorter than at the last run"
+        elif _header_digest(path) != checkpoint.header_digest:
+            reason = "header changed"
+        else:
+            prefix, full = _digests(path, checkpoint.offset, size)
+            if prefix != checkpoint.prefix_digest:
+                reason = "bytes before the last offset changed"
+            elif size == checkpoint.offset:
+                return run.result(), "No new bytes since the last run"
+            elif not _ends_with_newline(path, checkpoint.offset):
+                reason = "the last run ended inside a line"
+            else:
+                try:
+                    appended = _append(path, checkpoint, run, size, chunksize)
+                except (ValueError, TypeError, UnicodeDecodeError, pd.errors.ParserError):
+                    reason = "appended rows do not fit the stored column types"
+                else:
+                    note = f"Appended {appended:,} rows ({size - checkpoint.offset:,} bytes)"
+                    checkpoint.offset = size
+                    checkpoint.total_rows = run.state.total_rows
+                    checkpoint.prefix_digest = full
+                    save_checkpoint(directory, checkpoint, run)
+                    return run.result(), note
+
+    # Full run, bounded to the bytes present now so the checkpoint offset is exact.
+    run = _Run(DatasetProfileState({}))
+    with exit_on_load_error():
+        state, fmt, dtypes = profile_checked(
+            path, chunksize, sketch_k, approx_distinct, run.count_rows, limit=size, selection=selection
+        )
+    run.state = state
+    checkpoint = Checkpoint(
+        offset=size,
+        total_rows=state.total_rows,
+        header_digest=_header_digest(path),
+        prefix_digest=_digests(path, size, size)[0],
+        encoding=fmt.encoding,
+        dtypes={col: str(dtype) for col, dtype in dtypes.items()},
+        options=options,
+        delimiter=fmt.delimiter,
+        names=csv_column_names(fmt) if state.skipped_columns else [],
+    )
+    save_checkpoint(directory, checkpoint, run)
+    return run.result(), f"Full analysis ({reason})"
@@ -0,0 +1,182 @@
+"""Per-stage run metrics for ``analyze --profile-run``.
+
+``RunMetrics.stage(name)`` wraps one step of a run and records:
+
+- wall time;
+- CPU time of this process and any children it reaped (``os.times``);
+- the peak resident set size during the stage;
+- the change in resident set size over the stage.
+
+On Linux the peak is reset at the start of every stage (``/proc/self/clear_refs``),
+so it belongs to that stage alone. Elsewhere only the process's high-water mark
+so far is available, so the stage where it jumps is the one that raised it. The
+payload's ``peak_rss_scope`` says which kind of peak was recorded.
+
+Memory is measured from the operating system rather than ``tracemalloc``.
+``tracemalloc`` made plot rendering about 4x slower, which would distort the
+timings this is meant to explain.
+
+Stages do not nest, so a run's stages partition its time. ``run_metrics.json``
+has a stable schema (``RUN_METRICS_SCHEMA_VERSION``). A field that changes
+meaning gets a new version rather than a silent change.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+RUN_METRICS_SCHEMA_VERSION = 1
+RUN_METRICS_FILENAME = "run_metrics.json"
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+@dataclass
+class StageMetrics:
+    """Measurements for one stage; memory fields are None where unsupported."""
+
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_bytes: int | None
+    rss_growth_bytes: int | None
+
+
+def _cpu_seconds() -> float:
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _proc_status_bytes(field: str) -> int | None:
+    try:
+        for line in _PROC_STATUS.read_text().splitlines():
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) * 1024  # reported in kB
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark for this process; False if unsupported."""
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_bytes() -> int | None:
+    peak = _proc_status_bytes("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)  # KiB off macOS
+
+
+class RunMetrics:
+    """Records one stage at a time; call ``finish`` once the run is done."""
+
+    def __init__(self) -> None:
+        self.stages: list[StageMetrics] = []
+        self._active: str | None = None
+        self._run_peak = _peak_rss_bytes()
+        self._resettable = _reset_peak_rss()
+        self._started_at = datetime.now(timezone.utc)
+        self._wall_start = time.perf_counter()
+        self._cpu_start = _cpu_seconds()
+
+    def _update_run_peak(self, peak: int | None) -> None:
+        if peak is not None:
+            self._run_peak = max(self._run_peak or 0, peak)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure the enclosed block as stage ``name``."""
+        if self._active is not None:
+            raise RuntimeError(f"stage {name!r} started inside stage {self._active!r}")
+        self._active = name
+        if self._resettable:
+            self._update_run_peak(_peak_rss_bytes())
+            _reset_peak_rss()
+        rss = _proc_status_bytes("VmRSS")
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        try:
+            yield
+        finally:
+            wall_seconds, cpu_seconds = time.perf_counter() - wall, _cpu_seconds() - cpu
+            peak = _peak_rss_bytes()
+            self._update_run_peak(peak)
+            end_rss = _proc_status_bytes("VmRSS")
+            self.stages.append(
+                StageMetrics(
+                    name=name,
+                    wall_seconds=round(wall_seconds, 6),
+                    cpu_seconds=round(cpu_seconds, 6),
+                    peak_rss_bytes=peak,
+                    rss_growth_bytes=end_rss - rss if rss is not None and end_rss is not None else None,
+                )
+            )
+            self._active = None
+
+    def finish(self, **context: Any) -> dict[str, Any]:
+        """The run_metrics payload: ``context`` (the CSV, mode, options, shape), the
+        whole run's totals and every stage in order."""
+        self._update_run_peak(_peak_rss_bytes())
+        total = StageMetrics(
+            name="total",
+            wall_seconds=round(time.perf_counter() - self._wall_start, 6),
+            cpu_seconds=round(_cpu_seconds() - self._cpu_start, 6),
+            peak_rss_bytes=self._run_peak,
+            rss_growth_bytes=None,
+        )
+        return {
+            "schema_version": RUN_METRICS_SCHEMA_VERSION,
+            "tool_version": __version__,
+            "started_at": self._started_at.isoformat(timespec="seconds"),
+            **context,
+            "peak_rss_scope": "stage" if self._resettable else "process",
+            "total": asdict(total),
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+
+def write_run_metrics(payload: dict[str, Any], outdir: Path) -> Path:
+    out_path = outdir / RUN_METRICS_FILENAME
+    outdir.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return out_path
+
+
+def _mib(value: int | None, width: int) -> str:
+    return f"{value / 2**20:{width}.1f}" if value is not None else f"{'-':>{width}}"
+
+
+def format_stage_table(payload: dict[str, Any]) -> list[str]:
+    """Console table of a run_metrics payload: one line per stage, then the total."""
+    rows = [*payload["stages"], payload["total"]]
+    width = max(len("Stage"), *(len(row["name"]) for row in rows))
+    lines = [f"  {'Stage':<{width}}  {'Wall s':>8}  {'CPU s':>8}  {'Peak MiB':>8}  {'+RSS MiB':>8}"]
+    for row in rows:
+        lines.append(
+            f"  {row['name']:<{width}}  {row['wall_seconds']:8.3f}  {row['cpu_seconds']:8.3f}  "
+            f"{_mib(row['peak_rss_bytes'], 8)}  {_mib(row['rss_growth_bytes'], 8)}"
+        )
+    return lines
@@ -0,0 +1,217 @@
+"""Column-parallel analysis across a process pool.
+
+Per-column checks (summary statistics, schema, missingness, IQR outliers and
+column quality warnings) do not depend on each other, so the columns are split
+into contiguous groups and profiled in worker processes. The frame is
+published in a module global before the pool forks, so workers read it through
+copy-on-write shared pages instead of receiving a pickled copy. Where ``fork``
+is unavailable each task is sent only its own column subset.
+
+Row-wise duplicate detection and the cross-column correlation matrix stay in
+the parent, which computes them while the workers run.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+import pandas as pd
+
+from .analyze import (
+    AnalysisResult,
+    analyze_frame,
+    compute_correlation,
+    compute_duplicates,
+    compute_outliers,
+    compute_quantiles,
+    compute_schema,
+    compute_summary,
+    detect_column_warnings,
+    duplicate_rows_issue,
+    profile_frame,
+)
+from .checks import (
+    PARSEABILITY_COLUMNS,
+    QualityIssue,
+    coerce_issue,
+    missingness_frame,
+    outliers_frame,
+)
+
+
+_TASKS_PER_WORKER = 4
+_PARSEABILITY_RULES = frozenset(
+    {"mixed_type_numeric_text", "convertible_numeric_text", "partial_parseability"}
+)
+
+_SHARED_FRAME: pd.DataFrame | None = None
+
+T = TypeVar("T")
+
+
+def _partition_columns(n_columns: int, jobs: int) -> list[list[int]]:
+    """Split column positions into contiguous groups, a few per worker for balance."""
+    n_groups = max(1, min(n_columns, jobs * _TASKS_PER_WORKER))
+    size = math.ceil(n_columns / n_groups)
+    return [list(range(start, min(start + size, n_columns))) for start in range(0, n_columns, size)]
+
+
+def _profile_subset(
+    sub: pd.DataFrame, quantile_error: float | None = None, approx_distinct: bool = False
+) -> dict[str, Any]:
+    sub.attrs = {}  # header issues are attached once, by the parent
+    profiles = profile_frame(sub, approx_distinct=approx_distinct)
+    quantiles = compute_quantiles(sub, rank_error=quantile_error)
+    issues, parseability = detect_column_warnings(sub, profiles=profiles)
+    return {
+        "numeric_summary": compute_summary(sub, quantiles)["numeric_summary"],
+        "schema": compute_schema(sub, profiles),
+        "missing": pd.Series(
+            [profile.missing_count for profile in profiles], index=sub.columns, dtype="int64"
+        ),
+        "outliers": compute_outliers(sub, quantiles).to_dict(orient="records"),
+        "issues": issues,
+        "parseability": parseability.to_dict(orient="records"),
+    }
+
+
+def _profile_shared(
+    positions: list[int], quantile_error: float | None = None, approx_distinct: bool = False
+) -> dict[str, Any]:
+    assert _SHARED_FRAME is not None, "worker started without a shared frame"
+    return _profile_subset(_SHARED_FRAME.iloc[:, positions], quantile_error, approx_distinct)
+
+
+def profile_column_groups(
+    df: pd.DataFrame,
+    groups: list[list[int]],
+    jobs: int = 1,
+    quantile_error: float | None = None,
+    approx_distinct: bool = False,
+    parent_work: Callable[[], T] | None = None,
+) -> tuple[list[dict[str, Any]], T | None]:
+    """Profile each group of column positions, on ``jobs`` worker processes when
+    ``jobs > 1``.
+
+    Returns one part per group (per-column outputs for ``assemble_result``) and
+    the return value of ``parent_work``, which runs in the parent while the
+    workers are busy.
+    """
+    if jobs <= 1 or len(groups) < 2:
+        parts = [_profile_subset(df.iloc[:, positions], quantile_error, approx_distinct) for positions in groups]
+        return parts, parent_work() if parent_work is not None else None
+
+    global _SHARED_FRAME
+    use_fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if use_fork else None)
+
+    _SHARED_FRAME = df if use_fork else None
+    try:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(groups)), mp_context=context) as pool:
+            futures: list[Future] = []
+            for positions in groups:
+                if use_fork:
+                    futures.append(
+                        pool.submit(_profile_shared, positions, quantile_error, approx_distinct)
+                    )
+                else:
+                    futures.append(
+                        pool.submit(
+                            _profile_subset, df.iloc[:, positions], quantile_error, approx_distinct
+                        )
+                    )
+
+            extra = parent_work() if parent_work is not None else None
+            parts = [future.result() for future in futures]
+    finally:
+        _SHARED_FRAME = None
+    return parts, extra
+
+
+def assemble_result(
+    df: pd.DataFrame,
+    parts: list[dict[str, Any]],
+    duplicates: dict[str, Any],
+    correlation: pd.DataFrame | None,
+    suspicious_audit: dict[str, dict[str, int | list[str]]] | None = None,
+) -> AnalysisResult:
+    """Combine per-column parts (in column order) into the ``analyze_frame`` result,
+    with the same issue ordering: header, column, parseability, duplicate."""
+    numeric_summary: dict[str, dict[str, float | int | None]] = {}
+    schema: list[dict] = []
+    outlier_rows: list[dict[str, Any]] = []
+    parse_rows: list[dict[str, Any]] = []
+    column_issues: list[QualityIssue] = []
+    parse_issues: list[QualityIssue] = []
+    for part in parts:
+        numeric_summary.update(part["numeric_summary"])
+        schema.extend(part["schema"])
+        outlier_rows.extend(part["outliers"])
+        parse_rows.extend(part["parseability"])
+        for issue in part["issues"]:
+            if issue.rule in _PARSEABILITY_RULES:
+                parse_issues.append(issue)
+            else:
+                column_issues.append(issue)
+
+    quality_issues: list[QualityIssue] = []
+    for raw_issue in df.attrs.get("header_issues", []):
+        issue = coerce_issue(raw_issue)
+        if issue is not None:
+            quality_issues.append(issue)
+    quality_issues.extend(column_issues)
+    quality_issues.extend(parse_issues)
+    duplicate_issue = duplicate_rows_issue(duplicates)
+    if duplicate_issue is not None:
+        quality_issues.append(duplicate_issue)
+
+    missing_counts = pd.concat([part["missing"] for part in parts]) if parts else pd.Series(dtype="int64")
+    return AnalysisResult(
+        summary={
+            "shape": {"rows": df.shape[0], "columns": df.shape[1]},
+            "dtypes": df.dtypes.astype(str).to_dict(),
+            "numeric_summary": numeric_summary,
+        },
+        schema=schema,
+        missingness=missingness_frame(missing_counts, len(df)),
+        duplicates=duplicates,
+        outliers=outliers_frame(outlier_rows),
+        quality_issues=quality_issues,
+        parseability=pd.DataFrame(parse_rows, columns=PARSEABILITY_COLUMNS),
+        correlation=correlation,
+        suspicious_audit=dict(suspicious_audit or {}),
+        skipped_columns=list(df.attrs.get("skipped_columns", [])),
+    )
+
+
+def analyze_frame_parallel(
+    df: pd.DataFrame,
+    suspicious_audit: dict[str, dict[str, int | list[str]]] | None = None,
+    jobs: int = 2,
+    quantile_error: float | None = None,
+    approx_distinct: bool = False,
+) -> AnalysisResult:
+    """Column-parallel equivalent of ``analyze_frame`` using ``jobs`` worker processes.
+
+    Produces the same result as ``analyze_frame``, including issue ordering.
+    """
+    if jobs <= 1 or df.shape[1] < 2:
+        return analyze_frame(
+            df, suspicious_audit, quantile_error=quantile_error, approx_distinct=approx_distinct
+        )
+
+    parts, frame_wide = profile_column_groups(
+        df,
+        _partition_columns(df.shape[1], jobs),
+        jobs,
+        quantile_error,
+        approx_distinct,
+        parent_work=lambda: (compute_duplicates(df), compute_correlation(df)),
+    )
+    assert frame_wide is not None
+    duplicates, correlation = frame_wide
+    return assemble_result(df, parts, duplicates, correlation, suspicious_audit)
@@ -0,0 +1,190 @@
+"""The analysis pipeline shared by ``analyze``, ``analyze-many`` and ``serve``.
+
+``run_analysis`` looks the file up in the result cache, otherwise loads it
+(whole, as a random sample, or in streamed chunks), runs the checks, derives
+the plot inputs and stores the result. ``AnalysisOptions`` holds every option
+that shapes a run, and ``AnalysisOptions.cache_options`` names the ones that
+change the result, so every command keys the cache the same way.
+
+The cache is on by default for in-memory runs and opt-in for ``--stream``
+(``use_cache``): its key is a SHA-256 of the whole file, an extra full read
+that streaming a large file should not pay unasked. ``--incremental`` keeps its
+own checkpoint instead of the result cache and is driven by ``incremental.py``
+directly.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .analyze import (
+    AnalysisResult,
+    ColumnSelection,
+    Stage,
+    analyze_frame,
+    coerce_suspicious_to_nan,
+    read_csv_checked,
+)
+from .cache import ResultCache
+from .defaults import DEFAULT_CHUNK_SIZE, DEFAULT_DUPLICATE_MEMORY_BUDGET, DEFAULT_SKETCH_K
+
+
+@dataclass
+class AnalysisOptions:
+    """Options of one analysis, matching the ``analyze`` flags of the same names.
+
+    ``sample_rows`` / ``sample_frac`` analyze a random sample in memory.
+    ``downcast`` narrows integer columns after loading (``--memory-budget``).
+    ``jobs`` and ``duplicate_memory`` (bytes) only change how the result is
+    computed.
+    """
+
+    engine: str = "c"
+    stream: bool = False
+    chunksize: int = DEFAULT_CHUNK_SIZE
+    sketch_k: int = DEFAULT_SKETCH_K
+    quantile_error: float | None = None
+    approx_distinct: bool = False
+    selection: ColumnSelection | None = None
+    sample_rows: int | None = None
+    sample_frac: float | None = None
+    sample_seed: int = 0
+    downcast: bool = False
+    jobs: int = 1
+    duplicate_memory: int = DEFAULT_DUPLICATE_MEMORY_BUDGET
+
+    @property
+    def sampled(self) -> bool:
+        return self.sample_rows is not None or self.sample_frac is not None
+
+    def cache_options(self) -> dict[str, Any]:
+        """The options that change the result, for the result cache key."""
+        return {
+            "stream": self.stream,
+            "chunksize": self.chunksize if self.stream else None,
+            "engine": None if self.stream else self.engine,
+            "quantile_error": self.quantile_error,
+            "approx_distinct": self.approx_distinct,
+            "columns": self.selection.to_dict() if self.selection else None,
+            "sample": [self.sample_rows, self.sample_frac, self.sample_seed] if self.sampled else None,
+            # Downcast integer columns show their narrower dtype in schema.json.
+            "downcast": self.downcast and not self.stream,
+        }
+
+
+def use_cache(requested: bool | None, stream: bool) -> bool:
+    """Whether a run uses the result cache: as ``requested``, else unless streaming."""
+    return not stream if requested is None else requested
+
+
+def _quiet(message: str) -> None:
+    pass
+
+
+def run_analysis(
+    path: str | Path,
+    options: AnalysisOptions,
+    cache: ResultCache | None = None,
+    plot_inputs: bool = True,
+    stage: Stage = nullcontext,
+    echo: Callable[[str], None] = _quiet,
+) -> tuple[AnalysisResult, bool]:
+    """Analyze ``path``; returns the result and whether it came from ``cache``.
+
+    ``plot_inputs`` derives the plot inputs from the loaded frame (always done
+    when caching, so a cached run can still draw the plots). ``echo`` receives
+    one progress line per load. Raises ``CSVLoadError`` on invalid input.
+    """
+    cache_key = cache.key(path, options.cache_options()) if cache is not None else ""
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is not None:
+        echo(f"Loading {path} from cache ...")
+        return cached, True
+
+    if options.stream:
+        from .stream import stream_checked
+
+        echo(f"Streaming {path} in chunks of {options.chunksize:,} rows ...")
+        with stage("stream"):
+            result = stream_checked(
+                path,
+                chunksize=options.chunksize,
+                sketch_k=options.sketch_k,
+                approx_distinct=options.approx_distinct,
+                duplicate_memory_budget=options.duplicate_memory,
+                selection=options.selection,
+            )
+    else:
+        sample = None
+        if options.sampled:
+            from .sample import read_sample
+
+            echo(f"Sampling {path} ...")
+            df, sample = read_sample(
+                path,
+                rows=options.sample_rows,
+                fraction=options.sample_frac,
+                seed=options.sample_seed,
+                selection=options.selection,
+                chunksize=options.chunksize,
+                stage=stage,
+            )
+        else:
+            echo(f"Loading {path} ...")
+            df = read_csv_checked(path, engine=options.engine, stage=stage, selection=options.selection)
+        if options.downcast:
+            from .budget import downcast_integers
+
+            with stage("load.downcast"):
+                downcast_integers(df)
+        with stage("coerce_suspicious"):
+            df, suspicious_audit = coerce_suspicious_to_nan(df, inplace=True)
+        if cache is not None:
+            from .column_cache import analyze_frame_cached
+
+            # Columns unchanged since an earlier run reuse their cached profile.
+            result = analyze_frame_cached(
+                df,
+                cache,
+                suspicious_audit,
+                jobs=options.jobs,
+                quantile_error=options.quantile_error,
+                approx_distinct=options.approx_distinct,
+            )
+        elif options.jobs > 1:
+            from .parallel import analyze_frame_parallel
+
+            with stage("analyze.parallel"):
+                result = analyze_frame_parallel(
+                    df,
+                    suspicious_audit,
+                    jobs=options.jobs,
+                    quantile_error=options.quantile_error,
+                    approx_distinct=options.approx_distinct,
+                )
+        else:
+            result = analyze_frame(
+                df,
+                suspicious_audit,
+                quantile_error=options.quantile_error,
+                approx_distinct=options.approx_distinct,
+                stage=stage,
+            )
+        if sample is not None:
+            from .sample import attach_intervals
+
+            attach_intervals(result, sample)
+        if plot_inputs or cache is not None:
+            from .plotdata import plot_inputs_from_frame
+
+            # Kept on the result so a cached run can still draw the plots.
+            with stage("plot_inputs"):
+                result.plot_inputs = plot_inputs_from_frame(df, result)
+
+    if cache is not None:
+        cache.put(cache_key, result)
+    return result, False
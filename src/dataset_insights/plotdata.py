@@ -0,0 +1,251 @@
+"""Precomputed plot inputs: histogram bins, box-plot statistics, missingness and
+the correlation matrix.
+
+Plots are drawn from these O(bins + columns) aggregates rather than from rows,
+so they can be built from an in-memory frame (``plot_inputs_from_frame``) or
+from the quantile sketches of a streaming or merged profile state
+(``plot_inputs_from_sketches``). This module does not import matplotlib.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from numbers import Real
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from .checks import iqr_bounds
+
+if TYPE_CHECKING:
+    from .analyze import AnalysisResult
+    from .sketches import KLLSketch
+
+
+MAX_HISTOGRAM_COLS = 6  # hard cap on subplots
+HISTOGRAM_BINS = 30
+MAX_HEATMAP_COLS = 20  # cap columns shown in correlation heatmap
+MAX_BOXPLOT_COLS = 6
+MAX_BOXPLOT_FLIERS = 5_000  # outlier points drawn per box
+_FLIER_SEED = 42
+
+
+@dataclass
+class HistogramData:
+    """Bin counts and the ``len(counts) + 1`` bin edges of one numeric column."""
+
+    column: str
+    counts: np.ndarray
+    edges: np.ndarray
+
+
+@dataclass
+class BoxData:
+    """Box-plot statistics of one numeric column.
+
+    Whiskers reach the most extreme values inside the 1.5 IQR fences used by
+    the outlier check; ``fliers`` are values beyond them.
+    """
+
+    column: str
+    q1: float
+    median: float
+    q3: float
+    whisker_low: float
+    whisker_high: float
+    fliers: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+
+@dataclass
+class PlotInputs:
+    """Everything the four plots need, small enough to send to worker processes.
+
+    ``correlation`` is already capped for the heatmap; ``numeric_column_count``
+    is the number of numeric columns before that cap. ``fliers_sampled`` is set
+    when some box shows only a subset of its outlier points.
+    """
+
+    histograms: list[HistogramData]
+    correlation: pd.DataFrame | None
+    numeric_column_count: int
+    missing_pct: pd.Series
+    boxes: list[BoxData]
+    fliers_sampled: bool = False
+
+
+def histogram_edges(low: float, high: float, bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """Equal-width bin edges over ``[low, high]``, widened like ``np.histogram`` when
+    the range is empty."""
+    if not (np.isfinite(low) and np.isfinite(high)):
+        low, high = 0.0, 1.0
+    elif low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def histogram_data(df: pd.DataFrame) -> list[HistogramData]:
+    """Exact 30-bin histograms for the first 6 numeric columns."""
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    histograms = []
+    for col in numeric_cols[:MAX_HISTOGRAM_COLS]:
+        values = df[col].dropna().to_numpy(dtype="float64")
+        counts, edges = np.histogram(values, bins=HISTOGRAM_BINS)
+        histograms.append(HistogramData(str(col), counts, edges))
+    return histograms
+
+
+def box_plot_columns(numeric_cols: list, outliers: pd.DataFrame | None) -> list:
+    """Numeric columns to box-plot (at most 6), highest outlier rate first when known."""
+    if outliers is not None and not outliers.empty and {"column", "outlier_pct"}.issubset(outliers.columns):
+        outlier_rate: dict[str, float] = {}
+        column_values = outliers["column"].tolist()
+        outlier_pct_values = outliers["outlier_pct"].tolist()
+        for key_raw, raw_rate in zip(column_values, outlier_pct_values):
+            key = str(key_raw)
+            if isinstance(raw_rate, Real):
+                outlier_rate[key] = float(raw_rate)
+            else:
+                outlier_rate[key] = 0.0
+        ordered_cols = sorted(numeric_cols, key=lambda c: outlier_rate.get(str(c), 0.0), reverse=True)
+    else:
+        ordered_cols = numeric_cols
+    return ordered_cols[:MAX_BOXPLOT_COLS]
+
+
+def _cap_fliers(fliers: np.ndarray, rng: np.random.Generator) -> tuple[np.ndarray, bool]:
+    if len(fliers) <= MAX_BOXPLOT_FLIERS:
+        return fliers, False
+    return rng.choice(fliers, MAX_BOXPLOT_FLIERS, replace=False), True
+
+
+def _box(
+    column: str,
+    quartiles: tuple[float, float, float],
+    values: np.ndarray,
+    rng: np.random.Generator,
+) -> tuple[BoxData, bool]:
+    """Whiskers and fliers of ``values`` around ``quartiles``; also reports whether the
+    fliers were sampled."""
+    q1, median, q3 = quartiles
+    lower, upper = iqr_bounds(q1, q3)
+    inside = (values >= lower) & (values <= upper)
+    if not inside.any():  # estimated quartiles can leave no value inside the fences
+        inside = (values >= min(values.min(), q1)) & (values <= max(values.max(), q3))
+    fliers, sampled = _cap_fliers(values[~inside], rng)
+    box = BoxData(
+        column=column,
+        q1=q1,
+        median=median,
+        q3=q3,
+        whisker_low=float(values[inside].min()),
+        whisker_high=float(values[inside].max()),
+        fliers=fliers,
+    )
+    return box, sampled
+
+
+def box_data(
+    df: pd.DataFrame,
+    outliers: pd.DataFrame | None = None,
+    numeric_summary: dict[str, dict[str, float | int | None]] | None = None,
+) -> tuple[list[BoxData], bool]:
+    """Box-plot statistics over all rows for up to 6 numeric columns.
+
+    Quartiles are taken from ``numeric_summary`` (the quantile stage of
+    ``compute_summary``) when given, and computed otherwise. Returns the boxes
+    and whether any box's outlier points were sampled down to
+    MAX_BOXPLOT_FLIERS.
+    """
+    numeric_cols = df.select_dtypes(include="number").columns.tolist()
+    rng = np.random.default_rng(_FLIER_SEED)
+    boxes: list[BoxData] = []
+    sampled = False
+    for col in box_plot_columns(numeric_cols, outliers):
+        values = df[col].dropna().to_numpy(dtype="float64")
+        if len(values) == 0:
+            continue
+        stats = (numeric_summary or {}).get(str(col))
+        if stats is not None:
+            quartiles = (float(stats["25%"]), float(stats["50%"]), float(stats["75%"]))
+        else:
+            q1, median, q3 = np.percentile(values, [25, 50, 75])
+            quartiles = (float(q1), float(median), float(q3))
+        box, capped = _box(str(col), quartiles, values, rng)
+        boxes.append(box)
+        sampled = sampled or capped
+    return boxes, sampled
+
+
+def _common_inputs(result: AnalysisResult) -> tuple[pd.Series, pd.DataFrame | None, int]:
+    missing = result.missingness
+    total_rows = max(int(result.summary["shape"]["rows"]), 1)
+    missing_pct = pd.Series(
+        missing["missing_count"].to_numpy(dtype="float64") / total_rows * 100,
+        index=missing["column"].tolist(),
+    )
+    correlation = result.correlation
+    numeric_column_count = len(result.summary["numeric_summary"])
+    if correlation is not None:
+        correlation = correlation.iloc[:MAX_HEATMAP_COLS, :MAX_HEATMAP_COLS]
+    return missing_pct, correlation, numeric_column_count
+
+
+def plot_inputs_from_frame(df: pd.DataFrame, result: AnalysisResult) -> PlotInputs:
+    """Plot inputs for an in-memory frame, reusing the quartiles, correlation matrix,
+    missingness and outlier rates already in ``result``."""
+    missing_pct, correlation, numeric_column_count = _common_inputs(result)
+    boxes, fliers_sampled = box_data(df, result.outliers, result.summary["numeric_summary"])
+    return PlotInputs(
+        histograms=histogram_data(df),
+        correlation=correlation,
+        numeric_column_count=numeric_column_count,
+        missing_pct=missing_pct,
+        boxes=boxes,
+        fliers_sampled=fliers_sampled,
+    )
+
+
+def plot_inputs_from_sketches(result: AnalysisResult, sketches: dict[str, KLLSketch]) -> PlotInputs:
+    """Plot inputs from per-column quantile sketches, for runs that keep no rows.
+
+    ``sketches`` maps each numeric column to its ``KLLSketch``. Bin edges,
+    quartiles and the extreme values come from ``result.summary``. Everything
+    is exact while a sketch is exact. Past that, bin counts carry the sketch's
+    rank error, and whiskers and outlier points come from the values the
+    sketch retained. The column minimum and maximum are always drawn exactly.
+    """
+    missing_pct, correlation, numeric_column_count = _common_inputs(result)
+    numeric_summary = result.summary["numeric_summary"]
+    numeric_cols = list(numeric_summary)
+
+    histograms = []
+    for col in numeric_cols[:MAX_HISTOGRAM_COLS]:
+        stats = numeric_summary[col]
+        edges = histogram_edges(float(stats["min"]), float(stats["max"]))
+        histograms.append(HistogramData(col, sketches[col].histogram(edges), edges))
+
+    rng = np.random.default_rng(_FLIER_SEED)
+    boxes: list[BoxData] = []
+    fliers_sampled = False
+    for col in box_plot_columns(numeric_cols, result.outliers):
+        sketch, stats = sketches[col], numeric_summary[col]
+        if sketch.count == 0:
+            continue
+        quartiles = (float(stats["25%"]), float(stats["50%"]), float(stats["75%"]))
+        # Retained values stand in for the rows, plus the exact extremes.
+        values = np.unique(
+            np.concatenate([[float(stats["min"])], sketch.sample_values(), [float(stats["max"])]])
+        )
+        box, capped = _box(col, quartiles, values, rng)
+        boxes.append(box)
+        fliers_sampled = fliers_sampled or capped or (not sketch.is_exact and len(box.fliers) > 0)
+
+    return PlotInputs(
+        histograms=histograms,
+        correlation=correlation,
+        numeric_column_count=numeric_column_count,
+        missing_pct=missing_pct,
+        boxes=boxes,
+        fliers_sampled=fliers_sampled,
+    )
@@ -1,10 +1,21 @@
-"""Plot generators: histogram, correlation heatmap, missingness bar, box plot."""
+"""Plot generators: histogram, correlation heatmap, missingness bar, box plot.
+
+Every plot is drawn from a small precomputed input (histogram bins, the
+correlation matrix, missing percentages, box-plot statistics; see
+``plotdata.py``) rather than from the DataFrame, so ``submit_plots`` can render
+the four figures concurrently in worker processes without shipping any rows to
+them, and streaming or merged-shard runs can plot from their sketches.
+"""
 
 from __future__ import annotations
 
-from numbers import Real
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING
 
 import matplotlib
 matplotlib.use("Agg")  # headless rendering — must be set before importing pyplot
@@ -12,11 +23,19 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
+from .plotdata import (
+    MAX_HEATMAP_COLS,
+    BoxData,
+    HistogramData,
+    PlotInputs,
+    box_data,
+    histogram_data,
+)
+
+if TYPE_CHECKING:
+    from .analyze import Stage
 
-_MAX_HISTOGRAM_COLS = 6  # hard cap on subplots
-_MAX_HEATMAP_COLS = 20   # cap columns shown in correlation heatmap
-_MAX_BOXPLOT_COLS = 6
-_MAX_BOXPLOT_ROWS = 50_000
+PLOT_NAMES = ("distribution_histogram", "correlation_heatmap", "missingness_bar", "box_plot")
 
 
 def _ensure_plots_dir(outdir: Path) -> Path:
@@ -25,24 +44,22 @@ def _ensure_plots_dir(outdir: Path) -> Path:
     return plots_dir
 
 
-def plot_distribution_histogram(df: pd.DataFrame, outdir: Path) -> Path | None:
-    """Histograms for up to 6 numeric columns. Returns None if no numeric cols."""
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    if not numeric_cols:
+def render_histograms(histograms: list[HistogramData], outdir: Path) -> Path | None:
+    """Draw precomputed histograms. Returns None if there are none."""
+    if not histograms:
         return None
 
-    cols = numeric_cols[:_MAX_HISTOGRAM_COLS]
-    n = len(cols)
+    n = len(histograms)
     ncols = min(n, 3)
     nrows = (n + ncols - 1) // ncols
 
     fig, axes = plt.subplots(nrows, ncols, figsize=(5 * ncols, 4 * nrows), squeeze=False)
     fig.suptitle("Distribution of Numeric Columns", fontsize=14, y=1.02)
 
-    for idx, col in enumerate(cols):
+    for idx, hist in enumerate(histograms):
         ax = axes[idx // ncols][idx % ncols]
-        df[col].dropna().plot(kind="hist", bins=30, ax=ax, color="steelblue", edgecolor="white")
-        ax.set_title(col, fontsize=10)
+        ax.hist(hist.edges[:-1], bins=hist.edges, weights=hist.counts, color="steelblue", edgecolor="white")
+        ax.set_title(hist.column, fontsize=10)
         ax.set_xlabel("")
         ax.set_ylabel("Count")
 
@@ -57,23 +74,36 @@ def plot_distribution_histogram(df: pd.DataFrame, outdir: Path) -> Path | None:
     return out_path
 
 
+def plot_distribution_histogram(df: pd.DataFrame, outdir: Path) -> Path | None:
+    """Histograms for up to 6 numeric columns. Returns None if no numeric cols."""
+    return render_histograms(histogram_data(df), outdir)
+
+
 def plot_correlation_heatmap(df: pd.DataFrame, outdir: Path) -> Path | None:
     """Correlation heatmap for numeric columns. Returns None if fewer than 2 numeric cols.
 
-    When more than _MAX_HEATMAP_COLS numeric columns are present the plot is
+    When more than MAX_HEATMAP_COLS numeric columns are present the plot is
     limited to the first 20 columns for readability.  The full correlation
     matrix is always available via ``write_correlation_csv`` in reports.py.
     """
     numeric_df = df.select_dtypes(include="number")
     if numeric_df.shape[1] < 2:
         return None
+    corr = numeric_df.iloc[:, :MAX_HEATMAP_COLS].corr()
+    return render_correlation_heatmap(corr, numeric_df.shape[1], outdir)
 
-    n_total = numeric_df.shape[1]
-    truncated = n_total > _MAX_HEATMAP_COLS
-    if truncated:
-        numeric_df = numeric_df.iloc[:, :_MAX_HEATMAP_COLS]
 
-    corr = numeric_df.corr()
+def render_correlation_heatmap(
+    corr: pd.DataFrame | None, numeric_column_count: int, outdir: Path
+) -> Path | None:
+    """Draw a correlation matrix already capped to MAX_HEATMAP_COLS columns.
+
+    Returns None when there is no matrix (fewer than 2 numeric columns).
+    """
+    if corr is None or len(corr) < 2:
+        return None
+
+    truncated = numeric_column_count > len(corr)
     n = len(corr)
     use_annot = n <= 15
     fig, ax = plt.subplots(figsize=(max(6, n * 0.8), max(5, n * 0.7)))
@@ -91,7 +121,7 @@ def plot_correlation_heatmap(df: pd.DataFrame, outdir: Path) -> Path | None:
 
     title = "Correlation Heatmap"
     if truncated:
-        title += f"  (showing {_MAX_HEATMAP_COLS} of {n_total} numeric columns)"
+        title += f"  (showing {n} of {numeric_column_count} numeric columns)"
     ax.set_title(title, fontsize=13)
     ax.tick_params(axis="x", rotation=45)
     ax.tick_params(axis="y", rotation=0)
@@ -105,7 +135,11 @@ def plot_correlation_heatmap(df: pd.DataFrame, outdir: Path) -> Path | None:
 def plot_missingness_bar(df: pd.DataFrame, outdir: Path) -> Path:
     """Bar chart of missing % per column."""
     missing_pct = (df.isna().sum() / len(df) * 100).sort_values(ascending=False)
+    return render_missingness_bar(missing_pct, outdir)
+
 
+def render_missingness_bar(missing_pct: pd.Series, outdir: Path) -> Path:
+    """Draw missing % per column (indexed by column name, in display order)."""
     fig, ax = plt.subplots(figsize=(max(8, len(missing_pct) * 0.5), 5))
     colors = ["#e74c3c" if v > 0 else "#95a5a6" for v in missing_pct.values]
     ax.bar(missing_pct.index, missing_pct.values, color=colors)
@@ -122,43 +156,30 @@ def plot_missingness_bar(df: pd.DataFrame, outdir: Path) -> Path:
     return out_path
 
 
-def plot_box_plots(
-    df: pd.DataFrame,
-    outdir: Path,
-    outliers: pd.DataFrame | None = None,
-) -> Path | None:
-    """Box plot for numeric columns, capped for readability and speed."""
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    if not numeric_cols:
+def render_box_plots(boxes: list[BoxData], outdir: Path, fliers_sampled: bool = False) -> Path | None:
+    """Draw precomputed box-plot statistics. Returns None if there are none."""
+    if not boxes:
         return None
 
-    if outliers is not None and not outliers.empty and {"column", "outlier_pct"}.issubset(outliers.columns):
-        outlier_rate: dict[str, float] = {}
-        column_values = outliers["column"].tolist()
-        outlier_pct_values = outliers["outlier_pct"].tolist()
-        for key_raw, raw_rate in zip(column_values, outlier_pct_values):
-            key = str(key_raw)
-            if isinstance(raw_rate, Real):
-                outlier_rate[key] = float(raw_rate)
-            else:
-                outlier_rate[key] = 0.0
-        ordered_cols = sorted(numeric_cols, key=lambda c: outlier_rate.get(c, 0.0), reverse=True)
-    else:
-        ordered_cols = numeric_cols
-
-    cols = ordered_cols[:_MAX_BOXPLOT_COLS]
-    plot_df = cast(pd.DataFrame, df.loc[:, cols])
-
-    sampled = False
-    if len(plot_df) > _MAX_BOXPLOT_ROWS:
-        plot_df = cast(pd.DataFrame, plot_df.sample(n=_MAX_BOXPLOT_ROWS, random_state=42))
-        sampled = True
-
-    fig, ax = plt.subplots(figsize=(max(8, len(cols) * 1.2), 5))
-    sns.boxplot(data=cast(pd.DataFrame, plot_df), ax=ax)
+    stats = [
+        {
+            "label": box.column,
+            "q1": box.q1,
+            "med": box.median,
+            "q3": box.q3,
+            "whislo": box.whisker_low,
+            "whishi": box.whisker_high,
+            "fliers": box.fliers,
+        }
+        for box in boxes
+    ]
+    fig, ax = plt.subplots(figsize=(max(8, len(boxes) * 1.2), 5))
+    artists = ax.bxp(stats, patch_artist=True, widths=0.6, medianprops={"color": "0.25"})
+    for patch in artists["boxes"]:
+        patch.set_facecolor(sns.color_palette()[0])
     title = "Box Plot of Numeric Columns"
-    if sampled:
-        title += f" (sampled {_MAX_BOXPLOT_ROWS:,} rows)"
+    if fliers_sampled:
+        title += " (outlier points sampled)"
     ax.set_title(title, fontsize=13)
     ax.set_xlabel("Column")
     ax.set_ylabel("Value")
@@ -169,3 +190,63 @@ def plot_box_plots(
     fig.savefig(out_path, dpi=100, bbox_inches="tight")
     plt.close(fig)
     return out_path
+
+
+def plot_box_plots(
+    df: pd.DataFrame,
+    outdir: Path,
+    outliers: pd.DataFrame | None = None,
+) -> Path | None:
+    """Box plot for numeric columns, capped for readability and speed."""
+    boxes, sampled = box_data(df, outliers)
+    return render_box_plots(boxes, outdir, sampled)
+
+
+def plot_executor(workers: int | None = None) -> ProcessPoolExecutor:
+    """Process pool for ``submit_plots``; defaults to one worker per plot, capped at the CPU count.
+
+    Workers are forked where possible so they start with matplotlib already imported.
+    """
+    if workers is None:
+        workers = min(len(PLOT_NAMES), os.cpu_count() or 1)
+    use_fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if use_fork else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def submit_plots(
+    executor: Executor, inputs: PlotInputs, outdir: Path
+) -> dict[str, Future[Path | None]]:
+    """Start rendering all four plots on ``executor``; futures are keyed by PLOT_NAMES."""
+    _ensure_plots_dir(outdir)
+    return {
+        "distribution_histogram": executor.submit(render_histograms, inputs.histograms, outdir),
+        "correlation_heatmap": executor.submit(
+            render_correlation_heatmap, inputs.correlation, inputs.numeric_column_count, outdir
+        ),
+        "missingness_bar": executor.submit(render_missingness_bar, inputs.missing_pct, outdir),
+        "box_plot": executor.submit(render_box_plots, inputs.boxes, outdir, inputs.fliers_sampled),
+    }
+
+
+def render_plots(
+    inputs: PlotInputs, outdir: Path, stage: Stage = nullcontext
+) -> dict[str, Path | None]:
+    """Render all four plots in this process, keyed by PLOT_NAMES (None when skipped).
+
+    Each plot renders inside ``stage("plot.<name>")``.
+    """
+    _ensure_plots_dir(outdir)
+    renderers: dict[str, Callable[[], Path | None]] = {
+        "distribution_histogram": lambda: render_histograms(inputs.histograms, outdir),
+        "correlation_heatmap": lambda: render_correlation_heatmap(
+            inputs.correlation, inputs.numeric_column_count, outdir
+        ),
+        "missingness_bar": lambda: render_missingness_bar(inputs.missing_pct, outdir),
+        "box_plot": lambda: render_box_plots(inputs.boxes, outdir, inputs.fliers_sampled),
+    }
+    paths: dict[str, Path | None] = {}
+    for name, render in renderers.items():
+        with stage(f"plot.{name}"):
+            paths[name] = render()
+    return paths
@@ -0,0 +1,345 @@
+"""Input readers: plain and compressed CSVs, Parquet and Arrow IPC files.
+
+The file suffix picks the reader. ``COMPRESSIONS`` maps the suffix of a
+compressed CSV (``data.csv.gz``) to an opener. ``csv_source`` decompresses
+while the parser reads, so nothing is written to disk. ``COLUMNAR_FORMATS``
+maps ``.parquet`` / ``.feather`` / ``.arrow`` to a ``ColumnarFile`` class.
+These formats need pyarrow and are never text-parsed. They are read whole
+(``read``) or a record batch at a time (``iter_frames``; Parquet row groups
+are read one after another), optionally only some columns.
+
+Columnar values are converted to what a CSV parse of the same data would give,
+except that dates and timestamps keep their type, so the checks treat both
+inputs alike:
+
+- dates and timestamps become datetime64 and count as fully datetime-parseable;
+- times of day and calendar intervals become text, checked like CSV values;
+- decimals become float64 and durations become int64;
+- dictionary columns are decoded;
+- nested and other types become text.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import importlib.util
+import lzma
+from collections.abc import Callable, Iterator
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+_PYARROW_HINT = "install it with: pip install 'dataset-insights[arrow]'"
+
+
+def _open_zstd(source: Path | IO[bytes]) -> IO[bytes]:
+    if importlib.util.find_spec("zstandard") is not None:
+        import zstandard
+
+        return zstandard.open(source, "rb")
+    if importlib.util.find_spec("pyarrow") is not None:
+        import pyarrow as pa
+
+        return pa.input_stream(str(source) if isinstance(source, Path) else source, compression="zstd")
+    raise ImportError(f"reading .zst files requires zstandard or pyarrow; {_PYARROW_HINT}")
+
+
+# Each opener takes a path or a binary file object of compressed bytes.
+COMPRESSIONS: dict[str, Callable[[Any], IO[bytes]]] = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".zst": _open_zstd,
+}
+
+
+def compression(path: str | Path) -> str | None:
+    """The compression suffix of ``path`` (``".gz"``, ...), or None for a plain file."""
+    suffix = Path(path).suffix.lower()
+    return suffix if suffix in COMPRESSIONS else None
+
+
+def open_input(path: str | Path) -> IO[bytes]:
+    """Binary file object over the (decompressed) bytes of ``path``."""
+    suffix = compression(path)
+    return COMPRESSIONS[suffix](Path(path)) if suffix else open(path, "rb")
+
+
+@contextmanager
+def csv_source(path: str | Path) -> Iterator[Path | IO[bytes]]:
+    """What to hand a CSV parser: the path of a plain file (so pandas reads it
+    directly), or a decompressing file object that is closed afterwards."""
+    if compression(path) is None:
+        yield Path(path)
+        return
+    with open_input(path) as handle:
+        yield handle
+
+
+def pin_dtypes(frame: pd.DataFrame, dtypes: dict[str, Any]) -> pd.DataFrame:
+    """``frame`` with its columns cast to ``dtypes`` where they differ."""
+    changed = {col: dtype for col, dtype in dtypes.items() if frame[col].dtype != dtype}
+    return frame.astype(changed) if changed else frame
+
+
+def unique_names(names: list[str]) -> list[str]:
+    """Column names with repeats renamed ``name.1``, ``name.2``, ... as pandas does
+    for a CSV header."""
+    seen: dict[str, int] = {}
+    unique = []
+    for name in names:
+        candidate = name
+        while candidate in seen:
+            seen[name] += 1
+            candidate = f"{name}.{seen[name]}"
+        seen[candidate] = 0
+        unique.append(candidate)
+    return unique
+
+
+def _text(values: pa.ChunkedArray | pa.Array) -> pa.Array:
+    import pyarrow as pa
+
+    return pa.array([None if v is None else str(v) for v in values.to_pylist()], pa.string())
+
+
+def _is_string_view(kind: pa.DataType) -> bool:
+    import pyarrow as pa
+
+    # string_view arrived in pyarrow 16; older versions cannot produce it.
+    return getattr(pa.types, "is_string_view", lambda _: False)(kind)
+
+
+def _normalize_column(values: Any) -> Any:
+    """``values`` as a type that converts to pandas the way a CSV parse would."""
+    import pyarrow as pa
+
+    kind = values.type
+    if pa.types.is_dictionary(kind):
+        return _normalize_column(values.cast(kind.value_type))
+    if pa.types.is_null(kind):
+        return values.cast(pa.float64())
+    if pa.types.is_decimal(kind) or pa.types.is_float16(kind):
+        return values.cast(pa.float64())
+    if pa.types.is_duration(kind):
+        return values.cast(pa.int64())
+    if pa.types.is_date(kind):
+        return values.cast(pa.timestamp("s"))
+    if pa.types.is_time(kind) or pa.types.is_interval(kind) or _is_string_view(kind):
+        return values.cast(pa.string())
+    if pa.types.is_binary(kind) or pa.types.is_large_binary(kind):
+        try:
+            return values.cast(pa.string())
+        except pa.ArrowInvalid:  # not UTF-8
+            return _text(values)
+    if pa.types.is_nested(kind) or isinstance(kind, pa.ExtensionType):
+        return _text(values)
+    return values
+
+
+class ColumnarFile(ABC):
+    """A columnar file read through pyarrow. Subclasses supply the schema and the
+    raw table / record batch readers."""
+
+    format_name = ""
+
+    def __init__(self, path: str | Path) -> None:
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(f"reading {self.format_name} files requires pyarrow; {_PYARROW_HINT}")
+        self.path = Path(path)
+
+    @property
+    @abstractmethod
+    def schema(self) -> pa.Schema: ...
+
+    @property
+    @abstractmethod
+    def num_rows(self) -> int: ...
+
+    @abstractmethod
+    def _read_table(self, columns: list[str] | None) -> pa.Table: ...
+
+    @abstractmethod
+    def _batches(self, rows: int, columns: list[str] | None) -> Iterator[pa.RecordBatch]: ...
+
+    def _schema(self, columns: list[str] | None) -> pa.Schema:
+        import pyarrow as pa
+
+        schema = self.schema
+        return schema if columns is None else pa.schema([schema.field(c) for c in columns])
+
+    def _columns_with_nulls(self, columns: list[str]) -> set[str]:
+        """Which of ``columns`` hold a null anywhere in the file."""
+        found: set[str] = set()
+        for batch in self._batches(2**20, columns):
+            found.update(name for name, array in zip(batch.schema.names, batch.columns) if array.null_count)
+        return found
+
+    @property
+    def names(self) -> list[str]:
+        """Column names as ``read`` returns them (repeats renamed)."""
+        return unique_names(self.schema.names)
+
+    def _frame(self, table: pa.Table | pa.RecordBatch) -> pd.DataFrame:
+        import pyarrow as pa
+
+        columns = [_normalize_column(column) for column in table.columns]
+        # pandas' default text dtype, as the C parser gives.
+        return pa.table(columns, names=unique_names(table.schema.names)).to_pandas()
+
+    def read(self, columns: list[str] | None = None) -> pd.DataFrame:
+        """The whole file (or only ``columns``) as one frame."""
+        return self._frame(self._read_table(columns))
+
+    def iter_frames(
+        self,
+        rows: int,
+        columns: list[str] | None = None,
+        dtypes: dict[str, Any] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Frames of at most ``rows`` rows, in file order. ``dtypes`` (see
+        ``dtypes``) pins each column, since a batch without nulls would otherwise
+        keep an int column as int64 where the whole file gives float64."""
+        for batch in self._batches(rows, columns):
+            frame = self._frame(batch)
+            yield pin_dtypes(frame, dtypes) if dtypes else frame
+
+    def dtypes(self, columns: list[str] | None = None) -> dict[str, Any]:
+        """The dtypes ``read`` would give, from the schema plus null counts of the
+        int and bool columns (which turn float64 / object when they hold nulls)."""
+        import pyarrow as pa
+
+        schema = self._schema(columns)
+        empty = self._frame(schema.empty_table())
+        fields = dict(zip(empty.columns, schema))
+        nullable = [
+            str(name)
+            for name, field in fields.items()
+            if pa.types.is_integer(field.type) or pa.types.is_boolean(field.type)
+        ]
+        with_nulls = self._columns_with_nulls([fields[name].name for name in nullable]) if nullable else set()
+        dtypes: dict[str, Any] = {}
+        for name, dtype in empty.dtypes.items():
+            field = fields[name]
+            if field.name in with_nulls:
+                dtype = pd.api.types.pandas_dtype("float64" if pa.types.is_integer(field.type) else "object")
+            dtypes[str(name)] = dtype
+        return dtypes
+
+
+class ParquetFile(ColumnarFile):
+    format_name = "Parquet"
+
+    def __init__(self, path: str | Path) -> None:
+        super().__init__(path)
+        import pyarrow.parquet as pq
+
+        self._file = pq.ParquetFile(self.path)
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._file.schema_arrow
+
+    @property
+    def num_rows(self) -> int:
+        return self._file.metadata.num_rows
+
+    def _read_table(self, columns: list[str] | None) -> pa.Table:
+        return self._file.read(columns=columns)
+
+    def _batches(self, rows: int, columns: list[str] | None) -> Iterator[pa.RecordBatch]:
+        yield from self._file.iter_batches(batch_size=rows, columns=columns)
+
+    def _columns_with_nulls(self, columns: list[str]) -> set[str]:
+        # Row-group statistics answer without reading data when every chunk has them.
+        metadata = self._file.metadata
+        paths = [metadata.schema.column(i).path for i in range(metadata.num_columns)]
+        found: set[str] = set()
+        unknown: list[str] = []
+        for name in columns:
+            if name not in paths:
+                unknown.append(name)  # nested or renamed: read it
+                continue
+            index = paths.index(name)
+            counts = []
+            for group in range(metadata.num_row_groups):
+                stats = metadata.row_group(group).column(index).statistics
+                counts.append(stats.null_count if stats is not None and stats.has_null_count else None)
+            if None in counts:
+                unknown.append(name)
+            elif any(counts):
+                found.add(name)
+        return found | (super()._columns_with_nulls(unknown) if unknown else set())
+
+
+class IPCFile(ColumnarFile):
+    """Arrow IPC file or stream format; Feather v2 is the IPC file format."""
+
+    format_name = "Arrow IPC"
+
+    @contextmanager
+    def _open(self) -> Iterator[Any]:
+        """A reader over one memory map of the file, closed on exit."""
+        import pyarrow as pa
+
+        with pa.memory_map(str(self.path)) as source:
+            try:
+                reader = pa.ipc.open_file(source)
+            except pa.ArrowInvalid:
+                source.seek(0)
+                reader = pa.ipc.open_stream(source)
+            yield reader
+
+    @property
+    def schema(self) -> pa.Schema:
+        with self._open() as reader:
+            return reader.schema
+
+    @property
+    def num_rows(self) -> int:
+        return sum(batch.num_rows for batch in self._raw_batches(None))
+
+    def _raw_batches(self, columns: list[str] | None) -> Iterator[pa.RecordBatch]:
+        with self._open() as reader:
+            if hasattr(reader, "num_record_batches"):
+                batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            else:
+                batches = iter(reader)
+            for batch in batches:
+                yield batch if columns is None else batch.select(columns)
+
+    def _read_table(self, columns: list[str] | None) -> pa.Table:
+        import pyarrow as pa
+
+        return pa.Table.from_batches(list(self._raw_batches(columns)), schema=self._schema(columns))
+
+    def _batches(self, rows: int, columns: list[str] | None) -> Iterator[pa.RecordBatch]:
+        for batch in self._raw_batches(columns):
+            for start in range(0, batch.num_rows, rows):
+                yield batch.slice(start, rows)
+
+
+COLUMNAR_FORMATS: dict[str, type[ColumnarFile]] = {
+    ".parquet": ParquetFile,
+    ".pq": ParquetFile,
+    ".feather": IPCFile,
+    ".arrow": IPCFile,
+    ".arrows": IPCFile,
+    ".ipc": IPCFile,
+}
+
+
+def is_columnar(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in COLUMNAR_FORMATS
+
+
+def open_columnar(path: str | Path) -> ColumnarFile:
+    """The ``ColumnarFile`` for ``path``; raises ImportError without pyarrow."""
+    return COLUMNAR_FORMATS[Path(path).suffix.lower()](path)
@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import pandas as pd
 
-from .analyze import QualityIssue
+from .checks import QualityIssue
+
+if TYPE_CHECKING:
+    from .analyze import AnalysisResult, Stage
+    from .sample import SampleInfo
 
 
 def _issue_to_dict(issue: QualityIssue | dict[str, Any]) -> dict[str, Any]:
@@ -26,18 +32,41 @@ def _issue_to_dict(issue: QualityIssue | dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _pct_text(pct: float, row: pd.Series, pct_column: str, sample: SampleInfo | None) -> str:
+    """``12.50%``, followed by the confidence interval in ``row`` when the run was sampled."""
+    low_column = f"{pct_column}_ci_low"
+    if sample is None or low_column not in row:
+        return f"{pct:.2f}%"
+    low, high = float(row[low_column]), float(row[f"{pct_column}_ci_high"])
+    return f"{pct:.2f}%, {sample.confidence:.0%} CI {low:.2f}-{high:.2f}%"
+
+
+def _sample_section(sample: SampleInfo) -> list[str]:
+    about = "" if sample.population_exact else "an estimated "
+    return [
+        "\n## Sample\n",
+        f"These results come from a random sample of {sample.rows:,} of {about}"
+        f"{sample.population_rows:,} rows ({sample.fraction:.2%}; {sample.method} sampling, "
+        f"seed {sample.seed}). Percentages are shown with {sample.confidence:.0%} confidence "
+        "intervals for the whole file, which are also listed in missingness.csv, "
+        "outliers.csv and data_quality.json. Counts, unique values and duplicate rows "
+        "describe the sample only.",
+    ]
+
+
 def _build_insights_section(
     summary: dict,
     missingness: pd.DataFrame | None,
     duplicates: dict[str, Any] | None,
     outliers: pd.DataFrame | None,
     quality_issues: list[QualityIssue] | None,
+    sample: SampleInfo | None = None,
 ) -> list[str]:
     rows = int(summary["shape"]["rows"])
     cols = int(summary["shape"]["columns"])
     lines: list[str] = ["### Dataset Overview"]
     lines.append(
-        f"This dataset contains {rows:,} rows and {cols} columns. "
+        f"This {'sample' if sample else 'dataset'} contains {rows:,} rows and {cols} columns. "
         "Detailed numeric statistics are in summary_statistics.csv."
     )
 
@@ -53,21 +82,25 @@ def _build_insights_section(
         else:
             missing_only = missingness[missingness["missing_count"] > 0].reset_index(drop=True)
             top_col = str(missing_only.loc[0, "column"])
-            top_pct = float(missing_only.loc[0, "missing_pct"])
+            top_pct = _pct_text(
+                float(missing_only.loc[0, "missing_pct"]), missing_only.loc[0], "missing_pct", sample
+            )
             if len(missing_only) > 1:
                 second_col = str(missing_only.loc[1, "column"])
-                second_pct = float(missing_only.loc[1, "missing_pct"])
+                second_pct = _pct_text(
+                    float(missing_only.loc[1, "missing_pct"]), missing_only.loc[1], "missing_pct", sample
+                )
                 lines.append(
                     f"{cols_with_missing} out of {cols} columns have missing values "
                     f"({total_missing:,} missing values total). "
-                    f"The most affected columns are `{top_col}` ({top_pct:.2f}%) and "
-                    f"`{second_col}` ({second_pct:.2f}%)."
+                    f"The most affected columns are `{top_col}` ({top_pct}) and "
+                    f"`{second_col}` ({second_pct})."
                 )
             else:
                 lines.append(
                     f"{cols_with_missing} out of {cols} columns have missing values "
                     f"({total_missing:,} missing values total). "
-                    f"The most affected column is `{top_col}` ({top_pct:.2f}%)."
+                    f"The most affected column is `{top_col}` ({top_pct})."
                 )
             lines.append("See missingness.csv for the full per-column breakdown.")
 
@@ -110,11 +143,10 @@ def _build_insights_section(
                 flagged.sort_values(by="outlier_pct", ascending=False).reset_index(drop=True),
             )
             highlights = []
-            top_cols = flagged["column"].head(3).tolist()
-            top_counts = flagged["outlier_count"].head(3).tolist()
-            top_pcts = flagged["outlier_pct"].head(3).tolist()
-            for col_raw, raw_outlier_count, raw_outlier_pct in zip(top_cols, top_counts, top_pcts):
-                col = str(col_raw)
+            for _, row in flagged.head(3).iterrows():
+                col = str(row["column"])
+                raw_outlier_count = row["outlier_count"]
+                raw_outlier_pct = row["outlier_pct"]
                 outlier_count = (
                     int(raw_outlier_count)
                     if isinstance(raw_outlier_count, (int, float))
@@ -125,9 +157,8 @@ def _build_insights_section(
                     if isinstance(raw_outlier_pct, (int, float))
                     else 0.0
                 )
-                highlights.append(
-                    f"`{col}` has {outlier_count:,} outliers ({outlier_pct:.2f}%)"
-                )
+                pct = _pct_text(outlier_pct, row, "outlier_pct", sample)
+                highlights.append(f"`{col}` has {outlier_count:,} outliers ({pct})")
             lines.append(
                 f"{len(flagged)} numeric columns have IQR outliers. Top columns by outlier rate: "
                 f"{'; '.join(highlights)}. See outliers.csv for full bounds and counts."
@@ -162,14 +193,26 @@ def write_summary_md(
     missingness: pd.DataFrame | None = None,
     duplicates: dict[str, Any] | None = None,
     outliers: pd.DataFrame | None = None,
+    sample: SampleInfo | None = None,
 ) -> Path:
-    """Write a concise dataset overview to summary.md."""
+    """Write a concise dataset overview to summary.md.
+
+    A ``sample`` adds a section on how the rows were sampled, and confidence
+    intervals to the percentages in the insights.
+    """
     outdir.mkdir(parents=True, exist_ok=True)
     out_path = outdir / "summary.md"
 
+    rows_line = f"**Rows:** {summary['shape']['rows']}  "
+    if sample is not None:
+        about = "" if sample.population_exact else "about "
+        rows_line = (
+            f"**Rows:** {summary['shape']['rows']} (sample of {about}"
+            f"{sample.population_rows:,})  "
+        )
     lines = [
         "# Dataset Summary\n",
-        f"**Rows:** {summary['shape']['rows']}  ",
+        rows_line,
         f"**Columns:** {summary['shape']['columns']}\n",
         "## Column Overview\n",
         "| Column | Type |",
@@ -187,6 +230,9 @@ def write_summary_md(
     else:
         lines.append("\n_No numeric columns found._")
 
+    if sample is not None:
+        lines.extend(_sample_section(sample))
+
     lines.append("\n## Insights\n")
     lines.extend(
         _build_insights_section(
@@ -195,6 +241,7 @@ def write_summary_md(
             duplicates=duplicates,
             outliers=outliers,
             quality_issues=quality_issues,
+            sample=sample,
         )
     )
 
@@ -243,11 +290,26 @@ def write_summary_statistics_csv(summary: dict, outdir: Path) -> Path | None:
     return out_path
 
 
-def write_schema_json(schema: list[dict], outdir: Path) -> Path:
-    """Write column schema metadata to schema.json."""
+def write_schema_json(schema: list[dict], outdir: Path, skipped_columns: list[str] | None = None) -> Path:
+    """Write column schema metadata to schema.json.
+
+    Columns left out of the analysis follow the analyzed ones, with
+    ``"skipped": true`` and no statistics.
+    """
     outdir.mkdir(parents=True, exist_ok=True)
     out_path = outdir / "schema.json"
-    out_path.write_text(json.dumps(schema, indent=2), encoding="utf-8")
+    skipped = [
+        {
+            "column": name,
+            "dtype": None,
+            "unique_count": None,
+            "missing_count": None,
+            "sample_values": [],
+            "skipped": True,
+        }
+        for name in skipped_columns or []
+    ]
+    out_path.write_text(json.dumps(schema + skipped, indent=2), encoding="utf-8")
     return out_path
 
 
@@ -259,17 +321,27 @@ def write_missingness_csv(missingness: pd.DataFrame, outdir: Path) -> Path:
     return out_path
 
 
-def write_correlation_csv(df: pd.DataFrame, outdir: Path) -> Path | None:
+def write_correlation_csv(
+    df: pd.DataFrame | None,
+    outdir: Path,
+    correlation: pd.DataFrame | None = None,
+) -> Path | None:
     """Write the full correlation matrix to correlation.csv.
 
+    A precomputed ``correlation`` matrix takes precedence over ``df``.
     Returns None if fewer than 2 numeric columns.
     """
-    numeric_df = df.select_dtypes(include="number")
-    if numeric_df.shape[1] < 2:
+    if correlation is not None:
+        corr = correlation
+    elif df is not None:
+        numeric_df = df.select_dtypes(include="number")
+        if numeric_df.shape[1] < 2:
+            return None
+        corr = numeric_df.corr()
+    else:
         return None
 
     outdir.mkdir(parents=True, exist_ok=True)
-    corr = numeric_df.corr()
     out_path = outdir / "correlation.csv"
     corr.to_csv(out_path)
     return out_path
@@ -335,14 +407,22 @@ def write_outliers_csv(outliers: pd.DataFrame, outdir: Path) -> Path:
 def write_data_quality_json(
     issues: list[QualityIssue],
     parseability: pd.DataFrame,
-    duplicates: dict[str, Any],
+    duplicates: dict[str, Any] | None,
     outdir: Path,
+    sample: SampleInfo | None = None,
+    issue_intervals: list[list[float] | None] | None = None,
 ) -> Path:
-    """Write consolidated quality findings to data_quality.json."""
+    """Write consolidated quality findings to data_quality.json.
+
+    ``duplicates`` may be None when duplicate detection was not run; the
+    ``duplicates`` key is then written as null. When the run was sampled, a
+    ``sample`` key describes the sample and ``issue_intervals`` (one per
+    issue) are written as each issue's ``pct_ci``.
+    """
     outdir.mkdir(parents=True, exist_ok=True)
     out_path = outdir / "data_quality.json"
 
-    duplicate_summary = {
+    duplicate_summary = None if duplicates is None else {
         "total_rows": int(duplicates.get("total_rows", 0)),
         "duplicate_rows_excluding_first": int(
             duplicates.get("duplicate_rows_excluding_first", 0)
@@ -355,11 +435,68 @@ def write_data_quality_json(
         "example_rows": duplicates.get("example_rows", []),
     }
 
-    payload = {
+    issue_dicts = [_issue_to_dict(issue) for issue in issues]
+    if issue_intervals is not None:
+        for issue, interval in zip(issue_dicts, issue_intervals):
+            issue["pct_ci"] = interval
+
+    payload: dict[str, Any] = {
         "duplicates": duplicate_summary,
-        "issues": [_issue_to_dict(issue) for issue in issues],
+        "issues": issue_dicts,
         "parseability": parseability.to_dict(orient="records"),
     }
+    if sample is not None:
+        payload = {"sample": sample.to_dict(), **payload}
 
     out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
     return out_path
+
+
+def write_reports(
+    result: AnalysisResult, outdir: Path, stage: Stage = nullcontext
+) -> dict[str, Path | None]:
+    """Write every report for ``result``; maps each report's file name to its path,
+    or to None when it was skipped (see ``SKIPPED_REPORT_REASONS``).
+
+    Each writer runs inside ``stage("report.<file name>")``.
+    """
+    duplicates = result.duplicates
+    writers: dict[str, Callable[[], Path | None]] = {
+        "summary.md": lambda: write_summary_md(
+            result.summary,
+            outdir,
+            quality_issues=result.quality_issues,
+            missingness=result.missingness,
+            duplicates=duplicates,
+            outliers=result.outliers,
+            sample=result.sample,
+        ),
+        "summary_statistics.csv": lambda: write_summary_statistics_csv(result.summary, outdir),
+        "schema.json": lambda: write_schema_json(result.schema, outdir, result.skipped_columns),
+        "missingness.csv": lambda: write_missingness_csv(result.missingness, outdir),
+        "correlation.csv": lambda: write_correlation_csv(None, outdir, correlation=result.correlation),
+        "duplicates.csv": lambda: (
+            write_duplicates_csv(duplicates, outdir) if duplicates is not None else None
+        ),
+        "outliers.csv": lambda: write_outliers_csv(result.outliers, outdir),
+        "data_quality.json": lambda: write_data_quality_json(
+            result.quality_issues,
+            result.parseability,
+            duplicates,
+            outdir,
+            sample=result.sample,
+            issue_intervals=result.issue_intervals,
+        ),
+    }
+    paths: dict[str, Path | None] = {}
+    for name, write in writers.items():
+        with stage(f"report.{name}"):
+            paths[name] = write()
+    return paths
+
+
+SKIPPED_REPORT_REASONS = {
+    "summary_statistics.csv": "no numeric columns",
+    "correlation.csv": "fewer than 2 numeric columns",
+    "duplicates.csv": "duplicate detection not run",
+}
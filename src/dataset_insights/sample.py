@@ -0,0 +1,433 @@
+"""Random row samples for quick triage, and confidence intervals for the rates
+measured on them.
+
+``read_sample`` draws rows from a file in a single pass. The in-memory pipeline
+then runs on the sample unchanged, and ``attach_intervals`` gives every rate
+in the result a confidence interval for the same rate over the whole file. The sample is drawn
+in one of three ways:
+
+- ``reservoir`` (``--sample N``): reservoir sampling over chunks. It keeps
+  exactly N rows, or every row of a smaller file, and each row is equally
+  likely to be kept. The file's row count is exact.
+- ``bernoulli`` (``--sample-frac F``): each row is kept with probability F.
+- ``seek``: for uncompressed CSVs too large to be worth a full pass. Random
+  blocks of bytes are chosen, and the rows starting in each block are read
+  after a seek, so only the sampled part of the file is read. Each row starts
+  in exactly one block, so every row is equally likely to be chosen. A block is
+  half a typical row long, so almost every block holds at most one row start,
+  and the rows are close to a simple random sample. The file's row count is
+  estimated. Rows are split at line breaks, so files with line breaks inside
+  quoted fields fall back to a full pass.
+
+CSV rows are sampled as text and parsed together at the end, so the sample's
+dtypes are what parsing those rows alone would give.
+
+Intervals are Wilson score intervals with a finite population correction: the
+larger the share of the file in the sample, the narrower the interval, down to
+the measured rate itself when the sample is the whole file.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import math
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .analyze import (
+    EXTRA_NA_VALUES,
+    SNIFF_BYTES,
+    AnalysisResult,
+    ColumnSelection,
+    CSVFormat,
+    CSVLoadError,
+    Stage,
+    csv_column_names,
+    exit_on_load_error,
+    header_issues,
+    sniff_csv,
+)
+from .defaults import DEFAULT_CHUNK_SIZE
+from .readers import compression, is_columnar, open_columnar
+from .stream import iter_chunks
+
+SAMPLE_CONFIDENCE = 0.95
+# Bytes read after each seek at the least (one page); sets when seeking pays off.
+_SEEK_READ_BYTES = 4096
+
+# Quality rules whose ``pct`` is a share of rows, and which rows it is a share of.
+_ROW_RATE_BASES = {
+    "high_missing": "rows",
+    "leading_trailing_whitespace": "non_null",
+    "mixed_type_numeric_text": "non_empty",
+    "convertible_numeric_text": "non_empty",
+}
+
+
+@dataclass
+class SampleInfo:
+    """How a sample was drawn and what it stands for. ``population_rows`` is the
+    file's row count; it is an estimate when ``population_exact`` is False."""
+
+    method: str
+    rows: int
+    population_rows: int
+    population_exact: bool
+    seed: int
+    confidence: float = SAMPLE_CONFIDENCE
+
+    @property
+    def fraction(self) -> float:
+        """Share of the file's rows in the sample."""
+        if self.population_rows <= 0:
+            return 1.0
+        return min(self.rows / self.population_rows, 1.0)
+
+    def interval(self, count: int, total: int) -> tuple[float, float]:
+        """Confidence interval, in percent, for the file-wide rate estimated by
+        ``count`` of ``total`` sampled values."""
+        if total <= 0:
+            return 0.0, 100.0
+        rate = count / total
+        remaining = 1.0 - self.fraction
+        if remaining <= 0:
+            return round(rate * 100, 2), round(rate * 100, 2)
+        n = total / remaining
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        spread = z * z / n
+        center = (rate + spread / 2) / (1 + spread)
+        half = z / (1 + spread) * math.sqrt(rate * (1 - rate) / n + spread / (4 * n))
+        return round(max(center - half, 0.0) * 100, 2), round(min(center + half, 1.0) * 100, 2)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "fraction": round(self.fraction, 6)}
+
+
+def add_intervals(
+    frame: pd.DataFrame, pct_column: str, count_column: str, total: int | str, sample: SampleInfo
+) -> pd.DataFrame:
+    """``frame`` with ``<pct_column>_ci_low`` and ``_ci_high`` columns after
+    ``pct_column``; ``total`` is the row count or the column holding each row's base."""
+    totals = frame[total].tolist() if isinstance(total, str) else [total] * len(frame)
+    bounds = [sample.interval(int(count), int(base)) for count, base in zip(frame[count_column], totals)]
+    result = frame.copy()
+    position = result.columns.get_loc(pct_column) + 1
+    result.insert(position, f"{pct_column}_ci_low", [low for low, _ in bounds])
+    result.insert(position + 1, f"{pct_column}_ci_high", [high for _, high in bounds])
+    return result
+
+
+def attach_intervals(result: AnalysisResult, sample: SampleInfo) -> None:
+    """Record on ``result`` that it was computed from ``sample``, with confidence
+    intervals for its rates (see ``AnalysisResult``), so the reports only format them."""
+    result.sample = sample
+    issues = [issue.to_dict() for issue in result.quality_issues]
+    result.issue_intervals = issue_intervals(sample, issues, result.missingness, result.parseability)
+    result.missingness = add_intervals(
+        result.missingness, "missing_pct", "missing_count", sample.rows, sample
+    )
+    result.outliers = add_intervals(
+        result.outliers, "outlier_pct", "outlier_count", "non_null_count", sample
+    )
+    for kind in ("numeric", "datetime"):
+        result.parseability = add_intervals(
+            result.parseability, f"{kind}_parse_pct", f"{kind}_parseable_count", "non_empty_count", sample
+        )
+
+
+def issue_intervals(
+    sample: SampleInfo,
+    issues: list[dict[str, Any]],
+    missingness: pd.DataFrame,
+    parseability: pd.DataFrame,
+) -> list[list[float] | None]:
+    """Confidence interval of each issue's ``pct``, or None for rules that do not
+    measure a share of rows (cardinality, duplicates, header checks)."""
+    missing = dict(zip(missingness["column"].astype(str), missingness["missing_count"]))
+    non_empty = dict(zip(parseability["column"].astype(str), parseability["non_empty_count"]))
+    intervals: list[list[float] | None] = []
+    for issue in issues:
+        base = _ROW_RATE_BASES.get(str(issue["rule"]))
+        column = str(issue.get("column"))
+        if base == "rows":
+            total = sample.rows
+        elif base == "non_null" and column in missing:
+            total = sample.rows - int(missing[column])
+        elif base == "non_empty" and column in non_empty:
+            total = int(non_empty[column])
+        else:
+            intervals.append(None)
+            continue
+        intervals.append(list(sample.interval(int(issue["count"]), total)))
+    return intervals
+
+
+class _Reservoir:
+    """Reservoir sampling (Algorithm R) over a stream of frames: after each
+    ``add``, ``frame`` holds a uniform sample of up to ``size`` of the rows seen,
+    indexed by row number."""
+
+    def __init__(self, size: int, rng: np.random.Generator) -> None:
+        self.size = size
+        self.rng = rng
+        self.seen = 0
+        self.slots = np.empty(0, dtype=np.int64)  # row number held by each slot
+        self.frame: pd.DataFrame | None = None
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        numbers = np.arange(self.seen, self.seen + len(chunk), dtype=np.int64)
+        self.seen += len(chunk)
+        free = max(self.size - len(self.slots), 0)
+        slots = np.concatenate([self.slots, numbers[:free]])
+        rest = numbers[free:]
+        if len(rest):
+            # Row i takes a random slot with probability size / (i + 1).
+            draws = self.rng.integers(0, rest + 1)
+            hit = draws < self.size
+            targets, values = draws[hit], rest[hit]
+            # When rows of one chunk draw the same slot, the later row wins.
+            _, last = np.unique(targets[::-1], return_index=True)
+            last = len(targets) - 1 - last
+            slots[targets[last]] = values[last]
+        self.slots = slots
+
+        held = np.isin(numbers, slots)
+        entered = chunk.iloc[held]
+        entered.index = numbers[held]
+        if self.frame is None:
+            self.frame = entered
+        else:
+            kept = self.frame.loc[self.frame.index.isin(slots)]
+            self.frame = pd.concat([kept, entered])
+
+
+def _draw(
+    chunks: Any, rows: int | None, fraction: float | None, rng: np.random.Generator
+) -> tuple[pd.DataFrame | None, int]:
+    """Sample ``chunks`` in one pass; returns the sample in file order and the row count."""
+    if rows is not None:
+        reservoir = _Reservoir(rows, rng)
+        for chunk in chunks:
+            reservoir.add(chunk)
+        frame, seen = reservoir.frame, reservoir.seen
+    else:
+        picked = []
+        seen = 0
+        for chunk in chunks:
+            keep = rng.random(len(chunk)) < fraction
+            chosen = chunk.iloc[keep]
+            chosen.index = np.arange(seen, seen + len(chunk))[keep]
+            picked.append(chosen)
+            seen += len(chunk)
+        frame = pd.concat(picked) if picked else None
+    if frame is None:
+        return None, seen
+    return frame.sort_index().reset_index(drop=True), seen
+
+
+def _single_line_rows(prefix: bytes, fmt: CSVFormat) -> list[bytes] | None:
+    """The complete data lines of ``prefix``, or None when a quoted field spans lines."""
+    lines = prefix.splitlines(keepends=True)[:-1]  # the last line may be cut short
+    text = b"".join(lines).decode(fmt.encoding, errors="replace")
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=fmt.delimiter)
+    records = sum(1 for _ in reader)
+    return lines if records == reader.line_num else None
+
+
+def _seek_sample(
+    path: Path, fmt: CSVFormat, rows: int | None, fraction: float | None, rng: np.random.Generator
+) -> tuple[str, int] | None:
+    """Rows starting in randomly chosen byte blocks, and the estimated row count of
+    the file. None when seeking would not pay off: the file is small, the sample
+    covers much of it, or a quoted field spans lines."""
+    size = path.stat().st_size
+    data_start = len(fmt.header_text.encode(fmt.encoding))
+    with open(path, "rb", buffering=_SEEK_READ_BYTES) as handle:
+        handle.seek(data_start)
+        prefix = handle.read(SNIFF_BYTES)
+        if data_start + len(prefix) >= size:
+            return None
+        lines = _single_line_rows(prefix, fmt)
+        if not lines:
+            return None
+
+        row_bytes = sum(map(len, lines)) / len(lines)
+        block = max(int(row_bytes // 2), 1)
+        blocks = math.ceil((size - data_start) / block)
+        if fraction is not None:
+            wanted = max(round(fraction * blocks), 1)
+        else:
+            assert rows is not None
+            wanted = math.ceil(rows * row_bytes / block * 1.1)
+        # Each block costs at least a page read; past that, one pass reads less.
+        if data_start == 0 or wanted * _SEEK_READ_BYTES * 2 > size:
+            return None
+
+        # Extra candidates, read only if the first blocks hold too few rows.
+        order = rng.choice(blocks, size=min(blocks, wanted * 2), replace=False)
+        picked: list[bytes] = []
+        read = 0
+        for start in range(0, len(order), wanted):
+            for index in np.sort(order[start : start + wanted]):
+                begin = data_start + int(index) * block
+                handle.seek(begin - 1)
+                handle.readline()  # the row that starts before this block
+                position = handle.tell()
+                while position < begin + block:
+                    line = handle.readline()
+                    if not line:
+                        break
+                    picked.append(line if line.endswith(b"\n") else line + b"\n")
+                    position += len(line)
+            read = min(start + wanted, len(order))
+            if rows is None or len(picked) >= rows:
+                break
+
+    population = round(len(picked) * blocks / read)
+    if rows is not None and len(picked) > rows:
+        keep = np.sort(rng.choice(len(picked), size=rows, replace=False))
+        picked = [picked[i] for i in keep]
+    return b"".join(picked).decode(fmt.encoding), population
+
+
+def _parse_text(
+    text: str, fmt: CSVFormat, usecols: list[str] | None, dtype: dict[str, Any] | None
+) -> pd.DataFrame:
+    return pd.read_csv(
+        io.StringIO(fmt.header_text + text),
+        sep=fmt.delimiter,
+        na_values=EXTRA_NA_VALUES,
+        usecols=usecols,
+        dtype=dtype,
+    )
+
+
+def _sample_csv(
+    path: Path,
+    rows: int | None,
+    fraction: float | None,
+    seed: int,
+    selection: ColumnSelection | None,
+    chunksize: int,
+    stage: Stage,
+) -> tuple[pd.DataFrame, SampleInfo, CSVFormat, list[str]]:
+    with stage("load.sniff"):
+        try:
+            fmt = sniff_csv(path)
+        except ImportError as exc:  # .zst without a decompressor
+            raise CSVLoadError(str(exc)) from exc
+        except Exception as exc:
+            raise CSVLoadError(f"could not read CSV: {exc}") from exc
+
+    with stage("load.sample"):
+        while True:
+            usecols, declared, skipped = None, {}, []
+            if selection is not None:
+                kept, declared, skipped = selection.select(csv_column_names(fmt))
+                usecols = kept if skipped else None
+            # Reseeded per attempt, so an encoding retry draws the same rows.
+            rng = np.random.default_rng(seed)
+            try:
+                seeked = None if compression(path) else _seek_sample(path, fmt, rows, fraction, rng)
+                if seeked is not None:
+                    text, population = seeked
+                    df = _parse_text(text, fmt, usecols, declared or None)
+                    info = SampleInfo("seek", len(df), max(population, len(df)), False, seed)
+                    return df, info, fmt, skipped
+
+                # Text chunks, so each column is typed from the sampled rows only.
+                chunks = iter_chunks(path, chunksize, fmt, dtype=str, usecols=usecols)
+                frame, seen = _draw(chunks, rows, fraction, rng)
+                if frame is None:
+                    df = _parse_text("", fmt, usecols, declared or None)
+                else:
+                    buffer = io.StringIO(frame.to_csv(index=False, sep=fmt.delimiter))
+                    df = pd.read_csv(
+                        buffer, sep=fmt.delimiter, na_values=EXTRA_NA_VALUES, dtype=declared or None
+                    )
+                method = "reservoir" if rows is not None else "bernoulli"
+                return df, SampleInfo(method, len(df), seen, True, seed), fmt, skipped
+            except UnicodeDecodeError as exc:
+                if fmt.encoding != "utf-8":
+                    raise CSVLoadError(f"could not parse CSV: {exc}") from exc
+                fmt = sniff_csv(path, encoding="latin-1")  # invalid bytes past the prefix
+            except CSVLoadError:
+                raise
+            except Exception as exc:
+                raise CSVLoadError(f"could not parse CSV: {exc}") from exc
+
+
+def read_sample(
+    path: str | Path,
+    rows: int | None = None,
+    fraction: float | None = None,
+    seed: int = 0,
+    selection: ColumnSelection | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    stage: Stage = nullcontext,
+) -> tuple[pd.DataFrame, SampleInfo]:
+    """A random sample of ``rows`` rows, or of about ``fraction`` of the rows, of
+    ``path``, loaded as ``read_csv_checked`` loads a whole file: header issues and
+    skipped columns go in ``df.attrs``. Raises ``CSVLoadError`` on invalid input."""
+    if (rows is None) == (fraction is None):
+        raise ValueError("give exactly one of rows and fraction")
+    path = Path(path)
+    if not path.exists():
+        raise CSVLoadError(f"file not found: {path}")
+    rng = np.random.default_rng(seed)
+
+    if is_columnar(path):
+        with stage("load.sample"):
+            try:
+                source = open_columnar(path)
+                kept, declared, skipped = (
+                    selection.select(source.names) if selection is not None else (None, {}, [])
+                )
+                columns = kept if skipped else None
+                dtypes = {**source.dtypes(columns), **declared}
+                frames = source.iter_frames(chunksize, columns=columns, dtypes=dtypes)
+                df, seen = _draw(frames, rows, fraction, rng)
+            except CSVLoadError:
+                raise
+            except ImportError as exc:
+                raise CSVLoadError(str(exc)) from exc
+            except Exception as exc:
+                raise CSVLoadError(f"could not read {path.name}: {exc}") from exc
+        if df is None:
+            df = pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+        sample = SampleInfo("reservoir" if rows is not None else "bernoulli", len(df), seen, True, seed)
+        header = source.schema.names
+    else:
+        df, sample, fmt, skipped = _sample_csv(path, rows, fraction, seed, selection, chunksize, stage)
+        header = fmt.header
+
+    if len(df.columns) == 0 or sample.population_rows == 0:
+        raise CSVLoadError(f"{path.name} is empty or has no data rows.")
+    if df.empty:
+        raise CSVLoadError(f"the sample of {path.name} has no rows; sample a larger fraction.")
+
+    df.attrs["skipped_columns"] = skipped
+    with stage("load.inspect_header"):
+        df.attrs["header_issues"] = header_issues(header)
+    return df, sample
+
+
+def load_sample(
+    path: str | Path,
+    rows: int | None = None,
+    fraction: float | None = None,
+    seed: int = 0,
+    selection: ColumnSelection | None = None,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    stage: Stage = nullcontext,
+) -> tuple[pd.DataFrame, SampleInfo]:
+    """``read_sample`` that exits with an ``Error: ...`` line on invalid input, like ``load_csv``."""
+    with exit_on_load_error():
+        return read_sample(path, rows, fraction, seed, selection, chunksize, stage)
@@ -0,0 +1,395 @@
+"""Profiling daemon (``serve``): analyze jobs over localhost HTTP or a Unix socket.
+
+The server imports pandas and matplotlib once and forks a pool of workers
+that keep them loaded, so a request pays only for its own analysis. Each job
+runs ``batch.analyze_file``: the ``analyze.py`` pipeline followed by the
+``reports.py`` writers (and plots). Jobs wait in the pool's queue, which is
+bounded by ``max_queued``.
+
+Endpoints (JSON in, JSON out):
+
+- ``POST /analyze`` with ``{"csv": PATH}`` and ``Content-Type:
+  application/json``. Optional fields are ``outdir`` (a directory under
+  ``ROOT/jobs``, default ``ROOT/jobs/<id>``), ``options`` (``engine``, ``stream``,
+  ``chunksize``, ``quantile_error``, ``approx_distinct``, ``plots``, ``cache``,
+  and ``columns`` / ``exclude_columns`` / ``dtypes`` as in ``analyze``),
+  ``wait`` (default true), ``timeout`` in seconds (default 600) and
+  ``include_reports`` (embed ``schema.json`` and ``data_quality.json``). It
+  answers 200 with the finished job, or 202 with a job id to poll.
+- ``GET /jobs/<id>``: the job's state, plus its index record and report paths
+  once finished (``?include_reports=1`` embeds the reports, as above).
+- ``GET /health``: version, worker count and queue length.
+
+TCP listeners are restricted to loopback addresses, and a Unix socket is
+created readable and writable by the current user only. Requests whose
+``Host`` is not a loopback name are refused, and so are POSTs of any other
+content type, so a web page cannot reach the server through the browser
+(a cross-site form POST or DNS rebinding). Jobs write only under
+``ROOT/jobs``; with ``data_dirs`` set they read only files under those
+directories, otherwise any file the server's user can.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import json
+import os
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, fields
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from .analyze import ColumnSelection, check_dtypes
+from .batch import BatchOptions, analyze_file, worker_pool
+from .defaults import CSV_ENGINES
+
+
+DEFAULT_PORT = 8765
+DEFAULT_WAIT_SECONDS = 600.0
+_JOB_HISTORY = 1_024  # finished jobs kept for GET /jobs/<id>
+_EMBEDDED_REPORTS = ("schema.json", "data_quality.json")
+_REQUEST_OPTIONS = {"engine", "stream", "chunksize", "quantile_error", "approx_distinct", "plots", "cache"}
+_SELECTION_OPTIONS = {"columns", "exclude_columns", "dtypes"}
+
+
+def _json_default(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else str(value)  # numpy scalars
+
+
+class RequestError(ValueError):
+    """A malformed request; answered with 400 and the message."""
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def check_loopback(host: str) -> None:
+    """Raise ValueError unless ``host`` is ``localhost`` or a loopback address."""
+    if not _is_loopback(host):
+        raise ValueError(f"refusing to listen on non-loopback address {host!r}")
+
+
+@dataclass
+class Job:
+    """One queued or finished analysis."""
+
+    id: str
+    csv: str
+    outdir: str
+    future: Future
+    submitted: float = field(default_factory=time.time)
+
+    def state(self) -> str:
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        if self.future.exception() is not None:
+            return "failed"
+        return str(self.future.result()["status"])
+
+    def to_dict(self, include_reports: bool = False) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "id": self.id,
+            "state": self.state(),
+            "csv": self.csv,
+            "outdir": self.outdir,
+            "submitted": self.submitted,
+        }
+        if not self.future.done():
+            return payload
+        if self.future.exception() is not None:
+            payload["error"] = "worker process died while analyzing this file"
+            return payload
+        record = self.future.result()
+        payload.update(record)
+        if include_reports and record["status"] == "ok":
+            payload["reports"] = {
+                name: json.loads(Path(record["files"][name]).read_text(encoding="utf-8"))
+                for name in _EMBEDDED_REPORTS
+            }
+        return payload
+
+
+def _host_name(header: str) -> str:
+    """The host of a ``Host`` header, without port or IPv6 brackets."""
+    if header.startswith("["):
+        return header[1:].partition("]")[0]
+    return header.rpartition(":")[0] if header.count(":") == 1 else header
+
+
+def _wait_seconds(request: dict[str, Any]) -> float | None:
+    """How long a POST waits for its job (None: answer at once); raises
+    ``RequestError`` for a malformed ``wait`` or ``timeout``."""
+    wait = request.get("wait", True)
+    if not isinstance(wait, bool):
+        raise RequestError("wait must be true or false")
+    timeout = request.get("timeout", DEFAULT_WAIT_SECONDS)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout >= 0:
+        raise RequestError("timeout must be a non-negative number of seconds")
+    return float(timeout) if wait else None
+
+
+def _selection(raw: dict[str, Any]) -> ColumnSelection:
+    patterns = {}
+    for key in ("columns", "exclude_columns"):
+        value = raw.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise RequestError(f"{key} must be a list of glob patterns")
+        patterns[key] = value
+    dtypes = raw.get("dtypes", {})
+    if not isinstance(dtypes, dict) or not all(isinstance(v, str) for v in dtypes.values()):
+        raise RequestError("dtypes must map column names to dtype names")
+    try:
+        checked = check_dtypes(dtypes)
+    except ValueError as exc:
+        raise RequestError(str(exc)) from exc
+    return ColumnSelection(patterns["columns"], patterns["exclude_columns"], checked)
+
+
+class JobQueue:
+    """Worker pool plus the registry of submitted jobs."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        workers: int = 1,
+        max_queued: int = 64,
+        defaults: BatchOptions | None = None,
+        data_dirs: list[str | Path] | None = None,
+    ) -> None:
+        self.root = Path(root)
+        self.data_dirs = [Path(d).resolve() for d in data_dirs or []]
+        self.workers = workers
+        self.max_queued = max_queued
+        self.defaults = defaults or BatchOptions()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.defaults.plots:
+            import_module(".plots", __package__)  # warm import, inherited by forked workers
+        self._pool: ProcessPoolExecutor = worker_pool(workers)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(not job.future.done() for job in self._jobs.values())
+
+    def options(self, raw: Any) -> BatchOptions:
+        """Per-request ``BatchOptions`` on top of the server defaults."""
+        if raw is None:
+            raw = {}
+        if not isinstance(raw, dict):
+            raise RequestError("options must be a JSON object")
+        unknown = set(raw) - _REQUEST_OPTIONS - _SELECTION_OPTIONS
+        if unknown:
+            raise RequestError(f"unknown options: {', '.join(sorted(unknown))}")
+        values = {f.name: getattr(self.defaults, f.name) for f in fields(BatchOptions)}
+        values.update((key, value) for key, value in raw.items() if key in _REQUEST_OPTIONS)
+        if _SELECTION_OPTIONS & set(raw):
+            values["selection"] = _selection(raw)
+        if values["engine"] not in CSV_ENGINES:
+            raise RequestError(f"engine must be one of {', '.join(CSV_ENGINES)}")
+        for name in ("stream", "approx_distinct", "plots"):
+            if not isinstance(values[name], bool):
+                raise RequestError(f"{name} must be true or false")
+        if values["cache"] is not None and not isinstance(values["cache"], bool):
+            raise RequestError("cache must be true, false or null")
+        chunksize = values["chunksize"]
+        if not isinstance(chunksize, int) or isinstance(chunksize, bool) or chunksize < 1:
+            raise RequestError("chunksize must be a positive integer")
+        quantile_error = values["quantile_error"]
+        if quantile_error is not None:
+            if not isinstance(quantile_error, (int, float)) or not 0 < quantile_error < 1:
+                raise RequestError("quantile_error must be between 0 and 1")
+            from .sketches import k_for_error
+
+            values["sketch_k"] = k_for_error(quantile_error)
+        return BatchOptions(**values)
+
+    def _csv_path(self, raw: Any) -> str:
+        if not isinstance(raw, str) or not raw:
+            raise RequestError("csv must be a file path")
+        if not self.data_dirs:
+            return raw
+        path = Path(raw).resolve()
+        if not any(path.is_relative_to(d) for d in self.data_dirs):
+            raise RequestError("csv must be a file under the server's data directories")
+        return str(path)
+
+    def _outdir(self, raw: Any, job_id: str) -> str:
+        """``raw`` (relative to ``ROOT/jobs``, or absolute) resolved, and required
+        to stay under ``ROOT/jobs``."""
+        jobs = (self.root / "jobs").resolve()
+        if raw is None or raw == "":
+            return str(jobs / job_id)
+        if not isinstance(raw, str):
+            raise RequestError("outdir must be a directory path")
+        outdir = (jobs / raw).resolve()
+        if outdir == jobs or not outdir.is_relative_to(jobs):
+            raise RequestError(f"outdir must be a directory under {jobs}")
+        return str(outdir)
+
+    def submit(self, request: dict[str, Any]) -> Job:
+        csv = self._csv_path(request.get("csv"))
+        options = self.options(request.get("options"))
+        job_id = uuid.uuid4().hex[:12]
+        outdir = self._outdir(request.get("outdir"), job_id)
+
+        with self._lock:
+            if sum(not job.future.done() for job in self._jobs.values()) >= self.max_queued:
+                raise OverflowError(f"queue is full ({self.max_queued} jobs)")
+            try:
+                future = self._pool.submit(analyze_file, csv, outdir, options, True)
+            except BrokenProcessPool:  # a worker died earlier; start a fresh pool
+                self._pool = worker_pool(self.workers)
+                future = self._pool.submit(analyze_file, csv, outdir, options, True)
+            job = Job(job_id, csv, outdir, future)
+            self._jobs[job_id] = job
+            while len(self._jobs) > _JOB_HISTORY:
+                oldest = next(iter(self._jobs))
+                if not self._jobs[oldest].future.done():
+                    break
+                del self._jobs[oldest]
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f"dataset-insights/{__version__}"
+    queue: JobQueue  # set on the per-server subclass
+
+    def address_string(self) -> str:
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # quiet by default; jobs are reported in their JSON
+
+    def _send(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, indent=2, default=_json_default).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _foreign_host(self) -> bool:
+        """Answer 403 (and return True) unless the ``Host`` header names a loopback
+        host, which a page served from elsewhere cannot send."""
+        if _is_loopback(_host_name(self.headers.get("Host", ""))):
+            return False
+        self._send(HTTPStatus.FORBIDDEN, {"error": "Host must be localhost or a loopback address"})
+        return True
+
+    def do_GET(self) -> None:
+        if self._foreign_host():
+            return
+        if self.path == "/health":
+            self._send(
+                HTTPStatus.OK,
+                {
+                    "status": "ok",
+                    "version": __version__,
+                    "workers": self.queue.workers,
+                    "pending": self.queue.pending(),
+                },
+            )
+        elif self.path.startswith("/jobs/"):
+            url = urlsplit(self.path)
+            job = self.queue.get(url.path.removeprefix("/jobs/"))
+            if job is None:
+                self._send(HTTPStatus.NOT_FOUND, {"error": "unknown job"})
+            else:
+                include_reports = parse_qs(url.query).get("include_reports") == ["1"]
+                self._send(HTTPStatus.OK, job.to_dict(include_reports))
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no such endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self._foreign_host():
+            return
+        if self.path != "/analyze":
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no such endpoint: {self.path}"})
+            return
+        # Browsers send cross-site form POSTs without a CORS preflight only as
+        # text/plain or form types; JSON requires one the server never grants.
+        if self.headers.get_content_type() != "application/json":
+            self._send(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, {"error": "Content-Type must be application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise RequestError("request body must be a JSON object")
+            timeout = _wait_seconds(request)
+            job = self.queue.submit(request)
+        except (RequestError, json.JSONDecodeError, ValueError) as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+            return
+        except OverflowError as exc:
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)})
+            return
+
+        if timeout is not None:
+            try:
+                job.future.result(timeout=timeout)
+            except FutureTimeoutError:
+                pass
+            except BrokenProcessPool:
+                pass  # reported by the job's state
+        status = HTTPStatus.OK if job.future.done() else HTTPStatus.ACCEPTED
+        self._send(status, job.to_dict(bool(request.get("include_reports"))))
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self) -> None:
+        socketserver.UnixStreamServer.server_bind(self)
+        os.chmod(self.server_address, 0o600)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(
+    queue: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    socket_path: str | Path | None = None,
+) -> socketserver.BaseServer:
+    """HTTP server for ``queue`` on a Unix socket when ``socket_path`` is given,
+    else on loopback ``host:port``. Call ``serve_forever()`` on it.
+
+    A stale socket left at ``socket_path`` is replaced; any other existing
+    file there raises ValueError and is left alone."""
+    handler = type("Handler", (_Handler,), {"queue": queue})
+    if socket_path is not None:
+        path = Path(socket_path)
+        if path.is_socket():
+            path.unlink()
+        elif path.exists() or path.is_symlink():
+            raise ValueError(f"refusing to replace {str(path)!r}: it exists and is not a socket")
+        return _UnixHTTPServer(str(socket_path), handler)
+    check_loopback(host)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
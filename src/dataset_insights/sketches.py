@@ -0,0 +1,364 @@
+"""Mergeable sketches for bounded-memory statistics.
+
+``KLLSketch`` estimates quantiles. It is exact until it holds more than ``k``
+values; beyond that the typical rank error is about ``RANK_ERROR_FACTOR / k``
+(``k=2048`` gives roughly 0.08% of n), independent of how many values were
+added or how many sketches were merged.
+
+Distinct counts come from ``ExactDistinctCounter`` (a sorted set of 64-bit value
+hashes, memory linear in the number of distinct values) or ``HyperLogLog``
+(``2**precision`` one-byte registers, relative standard error
+``1.04 / sqrt(2**precision)``; about 0.8% at the default precision of 14).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .defaults import DEFAULT_SKETCH_K, RANK_ERROR_FACTOR
+
+
+_MIN_SKETCH_K = 8
+
+DEFAULT_HLL_PRECISION = 14
+_HLL_BATCH_ROWS = 1 << 20
+_DISTINCT_COMPACT_MIN = 65_536
+
+
+def k_for_error(rank_error: float) -> int:
+    """Smallest sketch size whose typical rank error is at most ``rank_error``."""
+    return max(_MIN_SKETCH_K, math.ceil(RANK_ERROR_FACTOR / rank_error))
+
+
+class KLLSketch:
+    """Mergeable KLL-style quantile sketch over float64 values.
+
+    Values are held exactly until more than ``k`` have been added. Past that,
+    full levels are sorted and compacted pairwise into the next level (each
+    surviving item doubles its weight), keeping memory at O(k).
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: int = 0) -> None:
+        self.k = k
+        self.count = 0
+        self._levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def for_error(cls, rank_error: float, seed: int = 0) -> KLLSketch:
+        """Sketch sized so quantile ranks are off by about ``rank_error`` (a fraction of n)."""
+        if not 0 < rank_error < 1:
+            raise ValueError(f"rank_error must be between 0 and 1, got {rank_error}")
+        return cls(k=k_for_error(rank_error), seed=seed)
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self._levels) == 1
+
+    @property
+    def rank_error(self) -> float:
+        """Typical normalized rank error of ``quantiles()``; 0 while still exact."""
+        return 0.0 if self.is_exact else RANK_ERROR_FACTOR / self.k
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+
+            items = np.sort(items)
+            keep = items[-1:] if len(items) % 2 else items[:0]
+            pairs = items[: len(items) - len(keep)]
+            promoted = pairs[int(self._rng.integers(2)) :: 2]
+            self._levels[level] = keep
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0, dtype=np.float64))
+            self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+            level = 0
+
+    def _sorted_view(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2**level, dtype=np.int64) for level, items in enumerate(self._levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantiles(self, probs: list[float] | tuple[float, ...]) -> list[float]:
+        """Linearly interpolated quantiles, matching ``Series.quantile`` when exact."""
+        if self.count == 0:
+            return [math.nan for _ in probs]
+
+        values, cumulative = self._sorted_view()
+        positions = (self.count - 1) * np.asarray(probs, dtype=np.float64)
+        lower = np.floor(positions)
+        upper = np.ceil(positions)
+        below = values[np.searchsorted(cumulative, lower, side="right")]
+        above = values[np.searchsorted(cumulative, upper, side="right")]
+        frac = positions - lower
+        diff = above - below
+        result = np.where(frac >= 0.5, above - diff * (1 - frac), below + diff * frac)
+        return [float(v) for v in result]
+
+    def rank_below(self, value: float) -> int:
+        """Number of added values strictly less than ``value`` (estimated once compacted)."""
+        values, cumulative = self._sorted_view()
+        idx = int(np.searchsorted(values, value, side="left"))
+        return int(cumulative[idx - 1]) if idx else 0
+
+    def rank_at_most(self, value: float) -> int:
+        """Number of added values less than or equal to ``value``."""
+        values, cumulative = self._sorted_view()
+        idx = int(np.searchsorted(values, value, side="right"))
+        return int(cumulative[idx - 1]) if idx else 0
+
+    def histogram(self, edges: np.ndarray) -> np.ndarray:
+        """Value counts per bin with ``np.histogram`` semantics (bins half-open, the last
+        one closed); exact while the sketch is exact, estimated once compacted."""
+        values, cumulative = self._sorted_view()
+        edges = np.asarray(edges, dtype=np.float64)
+        idx = np.searchsorted(values, edges, side="left")
+        idx[-1] = np.searchsorted(values, edges[-1], side="right")
+        at_or_below = np.concatenate([[0], cumulative])[idx]
+        return np.diff(at_or_below)
+
+    def sample_values(self) -> np.ndarray:
+        """Retained values in ascending order: every added value while exact, a
+        subsample of real values (each standing for several) once compacted."""
+        return np.sort(np.concatenate(self._levels))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"k": self.k, "count": self.count, "levels": list(self._levels)}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> KLLSketch:
+        sketch = cls(k=int(data["k"]))
+        sketch.count = int(data["count"])
+        sketch._levels = [np.asarray(level, dtype=np.float64) for level in data["levels"]]
+        return sketch
+
+
+def hash_values(values: pd.Series, categorize: bool = True) -> np.ndarray:
+    """64-bit hashes of non-null values, stable across processes and partitions.
+
+    ``categorize`` deduplicates text before hashing, which is faster for repetitive
+    columns; the hashes are identical either way.
+    """
+    array = values.to_numpy()
+    if array.dtype.kind == "f":
+        # Adding 0.0 folds -0.0 into 0.0 like nunique() does.
+        return pd.util.hash_array(array.astype(np.float64) + 0.0, categorize=categorize)
+    if array.dtype.kind not in "iu":
+        return pd.util.hash_array(array, categorize=categorize)
+    # Integers that float64 represents exactly hash as float64, so int64 and
+    # float64 partitions of the same column agree; larger ones (beyond 2**53,
+    # where distinct integers share a float) hash as themselves.
+    as_float = array.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        exact = as_float.astype(array.dtype) == array
+    if exact.all():
+        return pd.util.hash_array(as_float + 0.0, categorize=categorize)
+    hashes = np.empty(len(array), dtype=np.uint64)
+    hashes[exact] = pd.util.hash_array(as_float[exact] + 0.0, categorize=categorize)
+    hashes[~exact] = pd.util.hash_array(array[~exact], categorize=categorize)
+    return hashes
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """``np.unique`` for hash arrays via a stable sort, which is linear on the
+    already-sorted runs ``_compact`` concatenates (numpy's hash-based unique is not)."""
+    values = np.sort(values, kind="stable")
+    if len(values) < 2:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+class ExactDistinctCounter:
+    """Exact distinct count over 64-bit value hashes.
+
+    Per-chunk unique hashes are buffered and folded into one sorted array only
+    when the buffer outgrows the compacted set, keeping the amortized cost linear.
+    """
+
+    kind = "exact"
+
+    def __init__(self) -> None:
+        self._parts: list[np.ndarray] = []
+        self._pending = 0
+        self._compacted_size = 0
+
+    def update(self, values: pd.Series) -> None:
+        if len(values) == 0:
+            return
+        hashes = _sorted_unique(hash_values(values))
+        self._parts.append(hashes)
+        self._pending += len(hashes)
+        if self._pending > max(2 * self._compacted_size, _DISTINCT_COMPACT_MIN):
+            self._compact()
+
+    def merge(self, other: ExactDistinctCounter) -> None:
+        self._parts.extend(other._parts)
+        self._compact()
+
+    def _compact(self) -> None:
+        if not self._parts:
+            return
+        merged = _sorted_unique(np.concatenate(self._parts))
+        self._parts = [merged]
+        self._compacted_size = len(merged)
+        self._pending = 0
+
+    def hashes(self) -> np.ndarray:
+        self._compact()
+        return self._parts[0] if self._parts else np.empty(0, dtype=np.uint64)
+
+    def count(self) -> int:
+        return len(self.hashes())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "hashes": self.hashes()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ExactDistinctCounter:
+        counter = cls()
+        hashes = np.asarray(data["hashes"], dtype=np.uint64)
+        if len(hashes):
+            counter._parts = [hashes]
+            counter._compacted_size = len(hashes)
+        return counter
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``int.bit_length`` for uint64 arrays (exact: 32-bit halves fit in float64)."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old = z
+        z += x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = math.sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1.0 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+class HyperLogLog:
+    """Mergeable HyperLogLog distinct-count sketch over 64-bit value hashes.
+
+    Uses ``2**precision`` registers and Ertl's improved estimator, which stays
+    unbiased from tiny to very large cardinalities without bias tables. The
+    relative standard error is ``1.04 / sqrt(2**precision)``.
+    """
+
+    kind = "hll"
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values: pd.Series) -> None:
+        # Hash in batches to bound temporary memory, and skip the categorize pass:
+        # it would build the very hash table this sketch exists to avoid.
+        for start in range(0, len(values), _HLL_BATCH_ROWS):
+            batch = values.iloc[start : start + _HLL_BATCH_ROWS]
+            self.update_hashes(hash_values(batch, categorize=False))
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.intp)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        rank = (tail_bits + 1 - _bit_length(tail)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: HyperLogLog | ExactDistinctCounter) -> None:
+        if isinstance(other, ExactDistinctCounter):
+            self.update_hashes(other.hashes())
+            return
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Cannot merge HyperLogLog sketches with precision {self.precision} "
+                f"and {other.precision}."
+            )
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        tail_bits = 64 - self.precision
+        histogram = np.bincount(self.registers, minlength=tail_bits + 2)
+        z = m * _tau(1.0 - histogram[tail_bits + 1] / m)
+        for k in range(tail_bits, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _sigma(histogram[0] / m)
+        return int(round(m * m / (2 * math.log(2) * z)))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "precision": self.precision, "registers": self.registers}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HyperLogLog:
+        sketch = cls(precision=int(data["precision"]))
+        sketch.registers = np.asarray(data["registers"], dtype=np.uint8).copy()
+        return sketch
+
+
+def distinct_counter_from_dict(data: dict[str, Any]) -> ExactDistinctCounter | HyperLogLog:
+    if data.get("kind", ExactDistinctCounter.kind) == HyperLogLog.kind:
+        return HyperLogLog.from_dict(data)
+    return ExactDistinctCounter.from_dict(data)
@@ -0,0 +1,669 @@
+"""Mergeable, serializable profile state for partitioned (sharded) analysis.
+
+A ``DatasetProfileState`` holds one ``ColumnProfileState`` per column plus the
+dataset-level pieces (row count, correlation co-moments, suspicious-value audit,
+header issues). States are built with ``update(chunk)``, combined with
+``merge(other)`` and turned into the usual ``AnalysisResult`` with
+``to_result()``, so shards profiled on different machines can be combined into
+one set of reports without re-reading any rows.
+
+States are saved as ``.npz`` archives: a JSON metadata document plus the
+numpy arrays (quantile sketch levels, distinct-value hashes, co-moment sums)
+it references. Loading never unpickles anything.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pandas as pd
+
+from .analyze import (
+    NAT_STRINGS,
+    AnalysisResult,
+    coerce_suspicious_to_nan,
+    distinct_tokens,
+    head_values,
+    infer_datetime_format,
+    is_datetime_dtype,
+    is_text_dtype,
+    parseable_counts,
+)
+from .checks import (
+    OUTLIER_MIN_NONNULL,
+    PARSEABILITY_ACTIONABLE_HIGH,
+    PARSEABILITY_ACTIONABLE_LOW,
+    PARSEABILITY_COLUMNS,
+    QualityIssue,
+    coerce_issue,
+    column_issues,
+    iqr_bounds,
+    missingness_frame,
+    outlier_row,
+    outliers_frame,
+    parseability_issues,
+    parseability_row,
+    unique_examples,
+)
+from .plotdata import plot_inputs_from_sketches
+from .sketches import (
+    DEFAULT_SKETCH_K,
+    ExactDistinctCounter,
+    HyperLogLog,
+    KLLSketch,
+    distinct_counter_from_dict,
+)
+
+
+STATE_FORMAT_VERSION = 1
+_SUMMARY_QUANTILES = (0.25, 0.5, 0.75)
+_HEAD_VALUES = 3
+_AUDIT_EXAMPLE_CAP = 5
+
+
+def _merge_moments(
+    left: tuple[int, float, float, float],
+    right: tuple[int, float, float, float],
+) -> tuple[int, float, float, float]:
+    """Combine (n, mean, M2, M3) central-moment sums of two disjoint samples."""
+    n_a, mean_a, m2_a, m3_a = left
+    n_b, mean_b, m2_b, m3_b = right
+    if n_a == 0:
+        return right
+    if n_b == 0:
+        return left
+
+    n = n_a + n_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+    m3 = (
+        m3_a
+        + m3_b
+        + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+        + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+    )
+    return n, mean, m2, m3
+
+
+def _skewness(n: int, m2: float, m3: float) -> float | None:
+    """Adjusted Fisher-Pearson skewness, mirroring ``Series.skew``."""
+    if n < 3:
+        return None
+    m2 = 0.0 if abs(m2) < 1e-14 else m2
+    m3 = 0.0 if abs(m3) < 1e-14 else m3
+    if m2 == 0:
+        return 0.0
+    return float((n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2**1.5))
+
+
+class ColumnProfileState:
+    """Running statistics for one column: counts, null counts, moments, min/max,
+    a quantile sketch, a distinct counter and text/parseability counters.
+
+    ``update(series)`` folds in the next chunk of the column; ``merge(other)``
+    folds in a state built from rows that come after this one's. Distinct
+    counts are exact unless ``approx_distinct`` selects a HyperLogLog sketch;
+    merging an exact state with an approximate one yields an approximate one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dtype: Any,
+        sketch_k: int = DEFAULT_SKETCH_K,
+        approx_distinct: bool = False,
+    ) -> None:
+        self.name = name
+        self.dtype = str(dtype)
+        self.is_numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(
+            dtype
+        )
+        self.is_text = is_text_dtype(dtype)
+        self.is_datetime = is_datetime_dtype(dtype)
+
+        self.row_count = 0
+        self.non_null = 0
+        self.head_values: list[Any] = []
+        self.distinct: ExactDistinctCounter | HyperLogLog = (
+            HyperLogLog() if approx_distinct else ExactDistinctCounter()
+        )
+
+        self.moments: tuple[int, float, float, float] = (0, 0.0, 0.0, 0.0)
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = KLLSketch(k=sketch_k)
+
+        self.whitespace_count = 0
+        self.whitespace_examples: list[str] = []
+        self.non_empty_count = 0
+        self.numeric_parseable = 0
+        self.datetime_parseable = 0
+        self.datetime_format: str | None = None
+        self._format_learned = False
+
+    def update(self, series: pd.Series) -> None:
+        self.row_count += len(series)
+        non_null_series = series.dropna()
+        n = len(non_null_series)
+        if n == 0:
+            return
+
+        self.non_null += n
+        if len(self.head_values) < _HEAD_VALUES:
+            self.head_values.extend(head_values(non_null_series, _HEAD_VALUES - len(self.head_values)))
+        self.distinct.update(non_null_series)
+
+        if self.is_numeric:
+            values = non_null_series.to_numpy(dtype=np.float64)
+            mean = float(values.mean())
+            deviations = values - mean
+            chunk_moments = (
+                n,
+                mean,
+                float((deviations**2).sum()),
+                float((deviations**3).sum()),
+            )
+            self.moments = _merge_moments(self.moments, chunk_moments)
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self.sketch.update(values)
+
+        if self.is_text:
+            self._update_text(non_null_series)
+        elif self.is_datetime:
+            self.non_empty_count += n
+            self.datetime_parseable += n
+
+    def _update_text(self, non_null_series: pd.Series) -> None:
+        text_series = non_null_series.astype(str)
+        stripped = text_series.str.strip()
+        whitespace_mask = text_series.ne(stripped)
+        chunk_whitespace = int(whitespace_mask.sum())
+        if chunk_whitespace:
+            self.whitespace_count += chunk_whitespace
+            if len(self.whitespace_examples) < 3:
+                self.whitespace_examples = unique_examples(
+                    self.whitespace_examples + text_series.loc[whitespace_mask].tolist(), 3
+                )
+
+        candidate = stripped.loc[stripped.ne("")]
+        if candidate.empty:
+            return
+
+        tokens, weights = distinct_tokens(candidate)
+        # A whole-column to_datetime infers its format from the first value;
+        # learn it once so later chunks are parsed the same way.
+        if not self._format_learned and any(
+            isinstance(token, str) and token not in NAT_STRINGS for token in tokens
+        ):
+            self.datetime_format = infer_datetime_format(tokens)
+            self._format_learned = True
+
+        numeric, datetime = parseable_counts(tokens, weights, self.datetime_format)
+        self.non_empty_count += len(candidate)
+        self.numeric_parseable += numeric
+        self.datetime_parseable += datetime
+
+    def merge(self, other: ColumnProfileState) -> None:
+        """Fold in statistics of rows that come *after* this state's rows.
+
+        Raises ValueError when the two sides are of different kinds (numeric, text or datetime).
+        """
+        if (self.is_numeric, self.is_text, self.is_datetime) != (
+            other.is_numeric,
+            other.is_text,
+            other.is_datetime,
+        ):
+            raise ValueError(
+                f"Cannot merge column '{self.name}': dtype {self.dtype} is incompatible "
+                f"with {other.dtype}."
+            )
+        if self.dtype != other.dtype and self.is_numeric:
+            self.dtype = "float64"
+
+        self.row_count += other.row_count
+        self.non_null += other.non_null
+        self.head_values = (self.head_values + other.head_values)[:_HEAD_VALUES]
+        if isinstance(other.distinct, HyperLogLog) and isinstance(
+            self.distinct, ExactDistinctCounter
+        ):
+            upgraded = HyperLogLog(other.distinct.precision)
+            upgraded.merge(self.distinct)
+            self.distinct = upgraded
+        self.distinct.merge(other.distinct)
+        self.moments = _merge_moments(self.moments, other.moments)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        self.whitespace_count += other.whitespace_count
+        self.whitespace_examples = unique_examples(
+            self.whitespace_examples + other.whitespace_examples, 3
+        )
+        self.non_empty_count += other.non_empty_count
+        self.numeric_parseable += other.numeric_parseable
+        self.datetime_parseable += other.datetime_parseable
+        if not self._format_learned:
+            self.datetime_format = other.datetime_format
+            self._format_learned = other._format_learned
+
+    @property
+    def missing_count(self) -> int:
+        return self.row_count - self.non_null
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "dtype": self.dtype,
+            "is_numeric": self.is_numeric,
+            "is_text": self.is_text,
+            "is_datetime": self.is_datetime,
+            "row_count": self.row_count,
+            "non_null": self.non_null,
+            "head_values": list(self.head_values),
+            "distinct": self.distinct.to_dict(),
+            "moments": list(self.moments),
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+            "whitespace_count": self.whitespace_count,
+            "whitespace_examples": list(self.whitespace_examples),
+            "non_empty_count": self.non_empty_count,
+            "numeric_parseable": self.numeric_parseable,
+            "datetime_parseable": self.datetime_parseable,
+            "datetime_format": self.datetime_format,
+            "format_learned": self._format_learned,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ColumnProfileState:
+        state = cls(str(data["name"]), str(data["dtype"]))
+        state.is_numeric = bool(data["is_numeric"])
+        state.is_text = bool(data["is_text"])
+        state.is_datetime = bool(data.get("is_datetime", False))
+        state.row_count = int(data["row_count"])
+        state.non_null = int(data["non_null"])
+        state.head_values = list(data["head_values"])
+        state.distinct = distinct_counter_from_dict(data["distinct"])
+        n, mean, m2, m3 = data["moments"]
+        state.moments = (int(n), float(mean), float(m2), float(m3))
+        state.min = float(data["min"])
+        state.max = float(data["max"])
+        state.sketch = KLLSketch.from_dict(data["sketch"])
+        state.whitespace_count = int(data["whitespace_count"])
+        state.whitespace_examples = [str(v) for v in data["whitespace_examples"]]
+        state.non_empty_count = int(data["non_empty_count"])
+        state.numeric_parseable = int(data["numeric_parseable"])
+        state.datetime_parseable = int(data["datetime_parseable"])
+        state.datetime_format = data["datetime_format"]
+        state._format_learned = bool(data["format_learned"])
+        return state
+
+    def numeric_summary(self) -> dict[str, float | int | None]:
+        n, mean, m2, m3 = self.moments
+        q1, median, q3 = self.sketch.quantiles(_SUMMARY_QUANTILES)
+        return {
+            "count": float(n),
+            "mean": mean if n else math.nan,
+            "std": math.sqrt(m2 / (n - 1)) if n > 1 else math.nan,
+            "min": self.min if n else math.nan,
+            "25%": q1,
+            "50%": median,
+            "75%": q3,
+            "max": self.max if n else math.nan,
+            "skewness": _skewness(n, m2, m3),
+        }
+
+    def outlier_row(self) -> dict[str, Any] | None:
+        if self.non_null < OUTLIER_MIN_NONNULL:
+            return None
+        q1, _, q3 = self.sketch.quantiles(_SUMMARY_QUANTILES)
+        lower_bound, upper_bound = iqr_bounds(q1, q3)
+        outlier_count = self.sketch.rank_below(lower_bound) + (
+            self.sketch.count - self.sketch.rank_at_most(upper_bound)
+        )
+        return outlier_row(self.name, self.non_null, q1, q3, outlier_count)
+
+
+class _CorrelationState:
+    """Pairwise-complete Pearson correlation from running co-moment sums.
+
+    Values are shifted by a per-column offset taken from the first chunk to
+    avoid catastrophic cancellation in ``sum(xy) - sum(x) * sum(y) / n``.
+    """
+
+    def __init__(self, columns: list[str]) -> None:
+        self.columns = columns
+        p = len(columns)
+        self.shift: np.ndarray | None = None
+        self.n = np.zeros((p, p))
+        self.sx = np.zeros((p, p))
+        self.sxx = np.zeros((p, p))
+        self.sxy = np.zeros((p, p))
+
+    def update(self, frame: pd.DataFrame) -> None:
+        if len(self.columns) < 2 or frame.empty:
+            return
+        values = frame.loc[:, self.columns].to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        if self.shift is None:
+            counts = present.sum(axis=0)
+            sums = np.where(present, values, 0.0).sum(axis=0)
+            self.shift = np.divide(sums, counts, out=np.zeros(len(self.columns)), where=counts > 0)
+        mask = present.astype(np.float64)
+        shifted = np.where(present, values - self.shift, 0.0)
+        self.n += mask.T @ mask
+        self.sx += shifted.T @ mask
+        self.sxx += (shifted**2).T @ mask
+        self.sxy += shifted.T @ shifted
+
+    def merge(self, other: _CorrelationState) -> None:
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift.copy()
+        d = (other.shift - self.shift)[:, None]
+        d_t = d.T
+        sx_b, sy_b = other.sx, other.sx.T
+        self.sxy += other.sxy + d_t * sx_b + d * sy_b + d * d_t * other.n
+        self.sx += sx_b + d * other.n
+        self.sxx += other.sxx + 2 * d * sx_b + d**2 * other.n
+        self.n += other.n
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "columns": list(self.columns),
+            "shift": self.shift,
+            "n": self.n,
+            "sx": self.sx,
+            "sxx": self.sxx,
+            "sxy": self.sxy,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> _CorrelationState:
+        state = cls([str(c) for c in data["columns"]])
+        state.shift = None if data["shift"] is None else np.asarray(data["shift"], dtype=np.float64)
+        state.n = np.asarray(data["n"], dtype=np.float64)
+        state.sx = np.asarray(data["sx"], dtype=np.float64)
+        state.sxx = np.asarray(data["sxx"], dtype=np.float64)
+        state.sxy = np.asarray(data["sxy"], dtype=np.float64)
+        return state
+
+    def result(self) -> pd.DataFrame | None:
+        if len(self.columns) < 2:
+            return None
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sy = self.sx.T
+            syy = self.sxx.T
+            cov = self.sxy - self.sx * sy / self.n
+            var_x = self.sxx - self.sx**2 / self.n
+            var_y = syy - sy**2 / self.n
+            denom = np.sqrt(var_x * var_y)
+            corr = np.where((self.n > 0) & (denom > 0), cov / denom, np.nan)
+        diagonal = np.diag(corr).copy()
+        np.fill_diagonal(corr, np.where(np.isnan(diagonal), np.nan, 1.0))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def _merge_audit(
+    total: dict[str, dict[str, int | list[str]]],
+    audit: dict[str, dict[str, int | list[str]]],
+) -> None:
+    for col, entry in audit.items():
+        slot = total.setdefault(col, {"count": 0, "examples": []})
+        slot["count"] = cast(int, slot["count"]) + cast(int, entry["count"])
+        slot["examples"] = unique_examples(
+            cast(list[str], slot["examples"]) + cast(list[str], entry["examples"]),
+            _AUDIT_EXAMPLE_CAP,
+        )
+
+
+def _pack(value: Any, arrays: dict[str, np.ndarray]) -> Any:
+    """Replace numpy arrays with references so the rest can be stored as JSON."""
+    if isinstance(value, np.ndarray):
+        key = f"a{len(arrays)}"
+        arrays[key] = value
+        return {"__array__": key}
+    if isinstance(value, dict):
+        return {k: _pack(v, arrays) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_pack(v, arrays) for v in value]
+    return value
+
+
+def _unpack(value: Any, arrays: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"__array__"}:
+            return arrays[value["__array__"]]
+        return {k: _unpack(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_unpack(v, arrays) for v in value]
+    return value
+
+
+class DatasetProfileState:
+    """Mergeable profile of a whole dataset (or one partition of it).
+
+    Partitions must share the same header. ``merge`` treats ``other`` as the
+    rows that follow this state's rows, so merge shards in file order to keep
+    sample values and examples identical to a single-pass run. Duplicate-row
+    detection is not part of the state, and datetime parseability is counted
+    with the format each partition inferred from its own first value.
+    """
+
+    def __init__(
+        self,
+        dtypes: dict[str, Any],
+        sketch_k: int = DEFAULT_SKETCH_K,
+        header_issues: list[QualityIssue] | None = None,
+        approx_distinct: bool = False,
+        skipped_columns: list[str] | None = None,
+    ) -> None:
+        self.columns = [str(col) for col in dtypes]
+        self.column_states = {
+            str(col): ColumnProfileState(str(col), dtype, sketch_k, approx_distinct)
+            for col, dtype in dtypes.items()
+        }
+        self.correlation = _CorrelationState(
+            [col for col in self.columns if self.column_states[col].is_numeric]
+        )
+        self.total_rows = 0
+        self.suspicious_audit: dict[str, dict[str, int | list[str]]] = {}
+        self.header_issues: list[QualityIssue] = list(header_issues or [])
+        self.skipped_columns: list[str] = list(skipped_columns or [])
+
+    def update(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Normalize placeholder tokens in ``chunk`` and fold it into the state.
+
+        Returns the normalized chunk so callers can feed it to other consumers.
+        """
+        chunk, audit = coerce_suspicious_to_nan(self.restore_bools(chunk))
+        _merge_audit(self.suspicious_audit, audit)
+        for col in self.columns:
+            self.column_states[col].update(cast(pd.Series, chunk[col]))
+        self.correlation.update(chunk)
+        self.total_rows += len(chunk)
+        return chunk
+
+    def restore_bools(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """``chunk`` with the columns read as nullable ``boolean`` but profiled as
+        object turned into bools and NaN, as a whole-file parse gives them."""
+        restored = {
+            col: values.astype(object).where(values.notna(), np.nan)
+            for col, values in chunk.items()
+            if isinstance(values.dtype, pd.BooleanDtype)
+            and col in self.column_states
+            and self.column_states[col].dtype == "object"
+        }
+        return chunk.assign(**restored) if restored else chunk
+
+    def merge(self, other: DatasetProfileState) -> None:
+        """Fold in a state built from the rows that follow this one's.
+
+        Raises ValueError when the partitions have different columns or a column
+        is numeric in one partition and text in the other.
+        """
+        if other.columns != self.columns:
+            raise ValueError(
+                "Cannot merge profile states with different columns: "
+                f"{self.columns} vs {other.columns}."
+            )
+        for col in self.columns:
+            self.column_states[col].merge(other.column_states[col])
+        self.correlation.merge(other.correlation)
+        _merge_audit(self.suspicious_audit, other.suspicious_audit)
+        self.total_rows += other.total_rows
+        if not self.header_issues:
+            self.header_issues = list(other.header_issues)
+        if not self.skipped_columns:
+            self.skipped_columns = list(other.skipped_columns)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": STATE_FORMAT_VERSION,
+            "columns": list(self.columns),
+            "column_states": [self.column_states[col].to_dict() for col in self.columns],
+            "correlation": self.correlation.to_dict(),
+            "total_rows": self.total_rows,
+            "suspicious_audit": self.suspicious_audit,
+            "header_issues": [issue.to_dict() for issue in self.header_issues],
+            "skipped_columns": self.skipped_columns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DatasetProfileState:
+        version = data.get("format_version")
+        if version != STATE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported profile state format version {version!r} "
+                f"(expected {STATE_FORMAT_VERSION})."
+            )
+        state = cls({})
+        state.columns = [str(col) for col in data["columns"]]
+        state.column_states = {
+            str(entry["name"]): ColumnProfileState.from_dict(entry)
+            for entry in data["column_states"]
+        }
+        state.correlation = _CorrelationState.from_dict(data["correlation"])
+        state.total_rows = int(data["total_rows"])
+        state.suspicious_audit = cast(
+            dict[str, dict[str, int | list[str]]], data["suspicious_audit"]
+        )
+        state.header_issues = [
+            issue
+            for issue in (coerce_issue(raw) for raw in data["header_issues"])
+            if issue is not None
+        ]
+        state.skipped_columns = [str(col) for col in data.get("skipped_columns", [])]
+        return state
+
+    def save(self, path: str | Path) -> Path:
+        """Write the state to an ``.npz`` archive and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays: dict[str, np.ndarray] = {}
+        meta = _pack(self.to_dict(), arrays)
+        with path.open("wb") as handle:
+            np.savez_compressed(handle, __meta__=np.array(json.dumps(meta)), **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: str | Path) -> DatasetProfileState:
+        with np.load(Path(path), allow_pickle=False) as archive:
+            meta = json.loads(str(archive["__meta__"]))
+            return cls.from_dict(_unpack(meta, archive))
+
+    def to_result(self) -> AnalysisResult:
+        """Build the report bundle; ``duplicates`` is None (not tracked in state).
+
+        Plot inputs are built from the quantile sketches, so plots need no rows.
+        """
+        columns = self.columns
+        total_rows = self.total_rows
+        numeric_summary: dict[str, dict[str, float | int | None]] = {}
+        schema: list[dict] = []
+        outlier_rows: list[dict[str, Any]] = []
+        parse_rows: list[dict[str, Any]] = []
+        issues = list(self.header_issues)
+
+        for col in columns:
+            col_state = self.column_states[col]
+            # An estimate can overshoot; a column never has more distinct values than rows.
+            unique_count = min(col_state.distinct.count(), col_state.non_null)
+            schema.append(
+                {
+                    "column": col,
+                    "dtype": col_state.dtype,
+                    "unique_count": unique_count,
+                    "missing_count": col_state.missing_count,
+                    "sample_values": list(col_state.head_values),
+                }
+            )
+            if col_state.is_numeric:
+                numeric_summary[col] = col_state.numeric_summary()
+                row = col_state.outlier_row()
+                if row is not None:
+                    outlier_rows.append(row)
+            if col_state.is_text or col_state.is_datetime:
+                parse_rows.append(
+                    parseability_row(
+                        col,
+                        col_state.non_null,
+                        col_state.non_empty_count,
+                        col_state.numeric_parseable,
+                        col_state.datetime_parseable,
+                    )
+                )
+            issues.extend(
+                column_issues(
+                    col,
+                    total_rows,
+                    col_state.non_null,
+                    unique_count,
+                    col_state.is_text,
+                    col_state.head_values,
+                    col_state.whitespace_count,
+                    col_state.whitespace_examples,
+                )
+            )
+
+        parseability = pd.DataFrame(parse_rows, columns=PARSEABILITY_COLUMNS)
+        issues.extend(
+            parseability_issues(
+                parseability, PARSEABILITY_ACTIONABLE_LOW, PARSEABILITY_ACTIONABLE_HIGH
+            )
+        )
+
+        missing_counts = pd.Series(
+            {col: self.column_states[col].missing_count for col in columns}, dtype="int64"
+        )
+        ordered_audit = {
+            col: self.suspicious_audit[col] for col in columns if col in self.suspicious_audit
+        }
+
+        result = AnalysisResult(
+            summary={
+                "shape": {"rows": total_rows, "columns": len(columns)},
+                "dtypes": {col: self.column_states[col].dtype for col in columns},
+                "numeric_summary": numeric_summary,
+            },
+            schema=schema,
+            missingness=missingness_frame(missing_counts, total_rows),
+            duplicates=None,
+            outliers=outliers_frame(outlier_rows),
+            quality_issues=issues,
+            parseability=parseability,
+            correlation=self.correlation.result(),
+            suspicious_audit=ordered_audit,
+            skipped_columns=list(self.skipped_columns),
+        )
+        result.plot_inputs = plot_inputs_from_sketches(
+            result,
+            {col: state.sketch for col, state in self.column_states.items() if state.is_numeric},
+        )
+        return result
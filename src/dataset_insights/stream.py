@@ -0,0 +1,372 @@
+"""Chunked streaming analysis: bounded-memory profiling of large CSV files.
+
+``analyze_stream`` reads the CSV in fixed-size chunks and folds every chunk into
+a mergeable ``DatasetProfileState`` (see ``state.py``), so peak memory is
+governed by ``chunksize`` and the column count rather than by file size. The
+file is read twice: the first pass settles each column's dtype the way a
+whole-file ``pd.read_csv`` would, the second computes statistics with those
+dtypes pinned so every chunk is interpreted consistently.
+
+Counts, missingness, distinct counts, moments, min/max, parseability and
+correlations are exact. Quartiles (and therefore IQR outliers) come from a
+quantile sketch that is exact until a column holds more than ``sketch_k``
+non-null values and approximate (rank error around ``1.7 / sketch_k``) beyond.
+Duplicate rows are counted from row hashes that spill to disk past a memory
+budget (see ``duplicates.py``); the few example rows are fetched with a final
+read that stops at the last example.
+
+Parquet and Arrow IPC files are read a record batch at a time instead, and
+need only one pass: their dtypes follow from the schema and null counts.
+"""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .analyze import (
+    DUPLICATE_EXAMPLE_CAP,
+    EXTRA_NA_VALUES,
+    AnalysisResult,
+    ColumnSelection,
+    CSVFormat,
+    CSVLoadError,
+    coerce_suspicious_to_nan,
+    csv_column_names,
+    duplicate_rows_issue,
+    duplicates_summary,
+    exit_on_load_error,
+    header_issues,
+    sniff_csv,
+)
+from .defaults import DEFAULT_CHUNK_SIZE
+from .duplicates import DEFAULT_DUPLICATE_MEMORY_BUDGET, DuplicateCounter
+from .readers import csv_source, is_columnar, open_columnar
+from .state import DEFAULT_SKETCH_K, DatasetProfileState
+
+
+def _text_dtype() -> Any:
+    return pd.Series(["x"]).dtype
+
+
+# Stands for the dtype of a chunk column holding only missing values, which
+# parses as float64 on its own but takes the dtype of the other chunks.
+_ALL_MISSING = object()
+
+
+def _chunk_dtype(values: pd.Series) -> Any:
+    """What one chunk's column says about the whole-file dtype: ``_ALL_MISSING``
+    for missing values only, nullable ``boolean`` for bools among missing values
+    (an object column), else its own dtype."""
+    dtype = values.dtype
+    if dtype == np.float64 and values.isna().all():
+        return _ALL_MISSING
+    if pd.api.types.is_object_dtype(dtype) and pd.api.types.infer_dtype(values) == "boolean":
+        return pd.BooleanDtype()
+    return dtype
+
+
+def _combine_dtypes(current: Any, new: Any) -> Any:
+    """Promote two chunk dtypes to what a single whole-file parse would produce.
+
+    Bools among missing values come out as nullable ``boolean``: pinning
+    ``object`` would read them back as the strings "True" and "False", so they
+    are read as ``boolean`` and profiled as the object column of bools a
+    whole-file parse gives (see ``DatasetProfileState.restore_bools``).
+    """
+    if current is None or current == new:
+        return new
+
+    api = pd.api.types
+    if current is _ALL_MISSING or new is _ALL_MISSING:
+        other = new if current is _ALL_MISSING else current
+        if api.is_bool_dtype(other):
+            return pd.BooleanDtype()
+        return _combine_dtypes(np.dtype(np.float64), other)
+    for dtype in (current, new):
+        if api.is_object_dtype(dtype) or api.is_string_dtype(dtype):
+            return dtype
+    if api.is_bool_dtype(current) and api.is_bool_dtype(new):
+        return pd.BooleanDtype()
+    if api.is_bool_dtype(current) or api.is_bool_dtype(new):
+        return _text_dtype()
+    if api.is_numeric_dtype(current) and api.is_numeric_dtype(new):
+        return np.dtype(np.float64)
+    return _text_dtype()
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes ``[start, stop)`` of a file."""
+
+    def __init__(self, path: Path, start: int, stop: int) -> None:
+        self._handle = open(path, "rb")
+        self._handle.seek(start)
+        self._remaining = max(stop - start, 0)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), self._remaining)
+        if size == 0:
+            return 0
+        read = self._handle.readinto(memoryview(buffer)[:size]) or 0
+        self._remaining -= read
+        return read
+
+    def close(self) -> None:
+        self._handle.close()
+        super().close()
+
+
+def open_byte_range(path: Path, start: int, stop: int) -> io.BufferedReader:
+    """Binary file object over bytes ``[start, stop)`` of ``path``, so a parse ignores
+    anything written past ``stop`` while it runs."""
+    return io.BufferedReader(_ByteRange(path, start, stop))
+
+
+def iter_chunks(
+    path: Path,
+    chunksize: int,
+    fmt: CSVFormat | None,
+    dtype: dict[str, Any] | None = None,
+    limit: int | None = None,
+    usecols: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Chunks of a CSV in format ``fmt``, or of a columnar file when ``fmt`` is None;
+    only ``usecols`` (default: all) and, of a CSV, only the first ``limit`` bytes
+    (default: all) are read."""
+    if fmt is None:
+        yield from open_columnar(path).iter_frames(chunksize, columns=usecols, dtypes=dtype)
+        return
+    with ExitStack() as stack:
+        if limit is None:
+            source = stack.enter_context(csv_source(path))
+        else:
+            source = stack.enter_context(open_byte_range(path, 0, limit))
+        reader = pd.read_csv(
+            source,
+            chunksize=chunksize,
+            na_values=EXTRA_NA_VALUES,
+            encoding=fmt.encoding,
+            sep=fmt.delimiter,
+            dtype=dtype,
+            usecols=usecols,
+        )
+        with reader:
+            yield from reader
+
+
+def _infer_dtypes(
+    path: Path, chunksize: int, limit: int | None = None, selection: ColumnSelection | None = None
+) -> tuple[CSVFormat, dict[str, Any], int, list[str]]:
+    """First pass: settle the format, per-column dtypes and row count without keeping
+    data, plus the columns ``selection`` skips."""
+    fmt = sniff_csv(path)
+    while True:
+        usecols, declared, skipped = None, {}, []
+        if selection is not None:
+            kept, declared, skipped = selection.select(csv_column_names(fmt))
+            usecols = kept if skipped else None
+        dtypes: dict[str, Any] = {}
+        total_rows = 0
+        try:
+            for chunk in iter_chunks(
+                path, chunksize, fmt, dtype=declared or None, limit=limit, usecols=usecols
+            ):
+                total_rows += len(chunk)
+                for col, values in chunk.items():
+                    dtypes[str(col)] = _combine_dtypes(dtypes.get(str(col)), _chunk_dtype(values))
+        except UnicodeDecodeError:
+            if fmt.encoding == "utf-8":  # valid UTF-8 prefix, invalid bytes further on
+                fmt = sniff_csv(path, encoding="latin-1")
+                continue
+            raise
+        dtypes = {
+            col: np.dtype(np.float64) if dtype is _ALL_MISSING else dtype for col, dtype in dtypes.items()
+        }
+        return fmt, dtypes, total_rows, skipped
+
+
+def _columnar_dtypes(
+    path: Path, selection: ColumnSelection | None
+) -> tuple[dict[str, Any], int, list[str], list[str]]:
+    """Dtypes, row count, raw column names and skipped columns of a columnar file,
+    without a data pass."""
+    source = open_columnar(path)
+    if selection is None:
+        return source.dtypes(), source.num_rows, source.schema.names, []
+    kept, declared, skipped = selection.select(source.names)
+    dtypes = {**source.dtypes(kept if skipped else None), **declared}
+    return dtypes, source.num_rows, source.schema.names, skipped
+
+
+def profile_checked(
+    path: Path,
+    chunksize: int,
+    sketch_k: int,
+    approx_distinct: bool,
+    on_chunk: Callable[[pd.DataFrame], object] | None = None,
+    limit: int | None = None,
+    selection: ColumnSelection | None = None,
+) -> tuple[DatasetProfileState, CSVFormat | None, dict[str, Any]]:
+    """Run both passes over the first ``limit`` bytes (default: all); return the state
+    plus the format (None for a columnar file) and dtypes it settled on. Only the
+    columns ``selection`` keeps are read; the state lists the skipped ones.
+
+    ``on_chunk`` receives every normalized chunk, e.g. to count duplicate rows.
+    Raises ``CSVLoadError`` on invalid input.
+    """
+    if not path.exists():
+        raise CSVLoadError(f"file not found: {path}")
+
+    fmt: CSVFormat | None = None
+    failure = "could not parse CSV"
+    try:
+        if is_columnar(path):
+            failure = f"could not read {path.name}"
+            dtypes, total_rows, header, skipped = _columnar_dtypes(path, selection)
+        else:
+            fmt, dtypes, total_rows, skipped = _infer_dtypes(path, chunksize, limit, selection)
+            header = fmt.header
+    except CSVLoadError:
+        raise
+    except ImportError as exc:
+        raise CSVLoadError(str(exc)) from exc
+    except Exception as exc:
+        raise CSVLoadError(f"{failure}: {exc}") from exc
+
+    if total_rows == 0 or not dtypes:
+        raise CSVLoadError("CSV is empty or has no data rows." if fmt else f"{path.name} has no rows.")
+
+    state = DatasetProfileState(
+        _profiled_dtypes(dtypes, fmt, selection),
+        sketch_k=sketch_k,
+        header_issues=header_issues(header),
+        approx_distinct=approx_distinct,
+        skipped_columns=skipped,
+    )
+    try:
+        for chunk in iter_chunks(path, chunksize, fmt, dtypes, limit, _usecols(state, dtypes)):
+            cleaned = state.update(chunk)
+            if on_chunk is not None:
+                on_chunk(cleaned)
+    except Exception as exc:
+        raise CSVLoadError(f"{failure}: {exc}") from exc
+
+    return state, fmt, dtypes
+
+
+def _profiled_dtypes(
+    dtypes: dict[str, Any], fmt: CSVFormat | None, selection: ColumnSelection | None
+) -> dict[str, Any]:
+    """``dtypes`` with the CSV columns inferred as nullable ``boolean`` (rather than
+    declared so) profiled as object, like a whole-file parse."""
+    declared = selection.dtypes if selection is not None else {}
+    return {
+        col: np.dtype(object)
+        if fmt is not None and isinstance(dtype, pd.BooleanDtype) and col not in declared
+        else dtype
+        for col, dtype in dtypes.items()
+    }
+
+
+def _usecols(state: DatasetProfileState, dtypes: dict[str, Any]) -> list[str] | None:
+    return list(dtypes) if state.skipped_columns else None
+
+
+def profile_csv(
+    path: str | Path,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    sketch_k: int = DEFAULT_SKETCH_K,
+    approx_distinct: bool = False,
+    selection: ColumnSelection | None = None,
+) -> DatasetProfileState:
+    """Stream a CSV into a mergeable ``DatasetProfileState``.
+
+    ``approx_distinct`` counts distinct values with HyperLogLog sketches instead
+    of exact hash sets. Raises SystemExit with a clear message on invalid input.
+    """
+    with exit_on_load_error():
+        state, _, _ = profile_checked(Path(path), chunksize, sketch_k, approx_distinct, selection=selection)
+    return state
+
+
+def _fetch_rows(
+    path: Path,
+    chunksize: int,
+    fmt: CSVFormat | None,
+    dtypes: dict[str, Any],
+    positions: list[int],
+    state: DatasetProfileState,
+) -> pd.DataFrame:
+    """Read the rows at ``positions`` (ascending), normalized as ``state`` profiled
+    them, stopping after the last."""
+    if not positions:
+        return pd.DataFrame(columns=list(dtypes))
+    wanted = np.asarray(positions, dtype=np.int64)
+    found: list[pd.DataFrame] = []
+    start = 0
+    for chunk in iter_chunks(path, chunksize, fmt, dtype=dtypes, usecols=_usecols(state, dtypes)):
+        stop = start + len(chunk)
+        local = wanted[(wanted >= start) & (wanted < stop)] - start
+        if len(local):
+            rows = state.restore_bools(chunk.iloc[local])
+            found.append(coerce_suspicious_to_nan(rows, inplace=True)[0])
+        if stop > wanted[-1]:
+            break
+        start = stop
+    return pd.concat(found)
+
+
+def analyze_stream(
+    path: str | Path,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    sketch_k: int = DEFAULT_SKETCH_K,
+    approx_distinct: bool = False,
+    duplicate_memory_budget: int = DEFAULT_DUPLICATE_MEMORY_BUDGET,
+    selection: ColumnSelection | None = None,
+) -> AnalysisResult:
+    """Analyze a CSV in bounded-memory chunks and return the same result bundle as
+    ``analyze_frame``.
+
+    Row hashes for duplicate detection are kept in memory up to
+    ``duplicate_memory_budget`` bytes and spilled to temporary files beyond it.
+    ``selection`` limits the columns read, as in ``load_csv``. Raises SystemExit
+    with a clear message on invalid input.
+    """
+    with exit_on_load_error():
+        return stream_checked(
+            path, chunksize, sketch_k, approx_distinct, duplicate_memory_budget, selection
+        )
+
+
+def stream_checked(
+    path: str | Path,
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    sketch_k: int = DEFAULT_SKETCH_K,
+    approx_distinct: bool = False,
+    duplicate_memory_budget: int = DEFAULT_DUPLICATE_MEMORY_BUDGET,
+    selection: ColumnSelection | None = None,
+) -> AnalysisResult:
+    """``analyze_stream`` that raises ``CSVLoadError`` instead of exiting."""
+    path = Path(path)
+    with DuplicateCounter(duplicate_memory_budget, max_examples=DUPLICATE_EXAMPLE_CAP) as counter:
+        state, fmt, dtypes = profile_checked(
+            path, chunksize, sketch_k, approx_distinct, counter.update, selection=selection
+        )
+        stats = counter.finish()
+
+    result = state.to_result()
+    examples = _fetch_rows(path, chunksize, fmt, dtypes, stats.example_positions, state)
+    result.duplicates = duplicates_summary(stats, examples)
+    duplicate_issue = duplicate_rows_issue(result.duplicates)
+    if duplicate_issue is not None:
+        result.quality_issues.append(duplicate_issue)
+    return result
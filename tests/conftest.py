@@ -9,6 +9,14 @@ import pandas as pd
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def isolated_result_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the analyze result cache at a per-test directory."""
+    cache_dir = tmp_path / "result-cache"
+    monkeypatch.setenv("DATASET_INSIGHTS_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture()
 def sample_csv(tmp_path: Path) -> Path:
     """A well-formed CSV with numeric, categorical columns, and some nulls."""
@@ -212,6 +220,16 @@ def blank_colname_csv(tmp_path: Path) -> Path:
     return csv_path
 
 
+@pytest.fixture()
+def semicolon_csv(tmp_path: Path) -> Path:
+    """Semicolon-delimited CSV (a common European export) with a quoted delimiter."""
+    csv_path = tmp_path / "semicolon.csv"
+    csv_path.write_text(
+        'id;name;score;;name\n1;"Doe; J";4.5;x;a\n2;Roe;3.0;y;b\n3;Poe;;z;c\n'
+    )
+    return csv_path
+
+
 @pytest.fixture()
 def high_missing_csv(tmp_path: Path) -> Path:
     """CSV where sparse_critical is 90% missing (critical) and sparse_warn is 30% missing (warn)."""
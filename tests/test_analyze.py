@@ -2,20 +2,32 @@
 
 from __future__ import annotations
 
+import warnings
+
+import numpy as np
 import pandas as pd
 import pytest
 
 from dataset_insights.analyze import (
     MISSING_CRITICAL_THRESHOLD,
     MISSING_WARN_THRESHOLD,
+    ColumnSelection,
     coerce_suspicious_to_nan,
     compute_duplicates,
     compute_missingness,
     compute_outliers,
+    compute_quantiles,
     compute_schema,
     compute_summary,
     detect_column_warnings,
+    distinct_tokens,
+    infer_datetime_format,
     load_csv,
+    parseable_counts,
+    profile_column,
+    profile_frame,
+    read_dtypes_file,
+    sniff_csv,
 )
 
 
@@ -25,6 +37,44 @@ def test_load_csv_valid(sample_csv):
     assert df.shape == (10, 5)
 
 
+
+@pytest.mark.parametrize("engine", ["c", "arrow"])
+def test_load_csv_reads_only_selected_columns_with_declared_dtypes(sample_csv, engine):
+    if engine == "arrow":
+        pytest.importorskip("pyarrow")
+    selection = ColumnSelection(include=["*a*", "id"], exclude=["sal*"], dtypes={"id": "float64", "x": "int8"})
+    df = load_csv(sample_csv, engine=engine, selection=selection)
+    assert list(df.columns) == ["id", "age", "department"]
+    assert df["id"].dtype == "float64"
+    assert df.attrs["skipped_columns"] == ["salary", "score"]
+
+    with pytest.raises(SystemExit):
+        load_csv(sample_csv, selection=ColumnSelection(include=["nope*"]))
+
+
+def test_read_dtypes_file_accepts_mapping_or_schema_json(tmp_path):
+    mapping = tmp_path / "dtypes.json"
+    mapping.write_text('{"age": "float32", "department": "category"}')
+    assert read_dtypes_file(mapping) == {"age": "float32", "department": "category"}
+
+    schema = tmp_path / "schema.json"
+    schema.write_text(
+        '[{"column": "age", "dtype": "int64"}, {"column": "score", "dtype": null, "skipped": true}]'
+    )
+    assert read_dtypes_file(schema) == {"age": "int64"}
+
+    mapping.write_text('{"age": "decimal-ish"}')
+    with pytest.raises(ValueError, match="unknown dtype 'decimal-ish' for column 'age'"):
+        read_dtypes_file(mapping)
+
+def test_load_csv_arrow_engine_without_pyarrow_exits(sample_csv, monkeypatch, capsys):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    with pytest.raises(SystemExit) as exc_info:
+        load_csv(sample_csv, engine="arrow")
+    assert exc_info.value.code != 0
+    assert "pip install 'dataset-insights[arrow]'" in capsys.readouterr().err
+
+
 def test_load_csv_empty_exits(empty_csv):
     with pytest.raises(SystemExit) as exc_info:
         load_csv(empty_csv)
@@ -109,6 +159,26 @@ def test_load_csv_latin1(latin1_csv):
     assert "£" in df["price"].iloc[0]
 
 
+def test_sniff_csv_reads_encoding_delimiter_and_header_from_prefix(latin1_csv, tmp_path, monkeypatch):
+    fmt = sniff_csv(latin1_csv)
+    assert (fmt.encoding, fmt.delimiter, fmt.header) == ("latin-1", ",", ["id", "price"])
+
+    semicolons = tmp_path / "semicolons.csv"
+    semicolons.write_text('id;"name";score\n1;"Doe; J";4,5\n2;Roe;3,0\n')
+    fmt = sniff_csv(semicolons)
+    assert (fmt.delimiter, fmt.header, fmt.header_text) == (";", ["id", "name", "score"], 'id;"name";score\n')
+    df = load_csv(semicolons)
+    assert list(df.columns) == ["id", "name", "score"]
+    assert df["name"].tolist() == ["Doe; J", "Roe"]
+
+    # Invalid UTF-8 only past the sniffed prefix: the parse falls back to Latin-1.
+    monkeypatch.setattr("dataset_insights.analyze.SNIFF_BYTES", 16)
+    late = tmp_path / "late_latin1.csv"
+    late.write_bytes("id,price\n1,9.99\n2,£19.50\n".encode("latin-1"))
+    assert sniff_csv(late).encoding == "utf-8"
+    assert load_csv(late)["price"].tolist() == ["9.99", "£19.50"]
+
+
 def test_load_csv_extra_na_values(messy_csv):
     """Known placeholder tokens should be parsed as NaN at CSV load time."""
     df = load_csv(messy_csv)
@@ -142,6 +212,25 @@ def test_coerce_suspicious_audit_is_compact():
     assert len(examples) == 1
 
 
+def test_coerce_suspicious_does_not_copy_or_modify_input():
+    df = pd.DataFrame({"token": ["a", "n/a ", "b", None], "value": [1.0, 2.0, 3.0, 4.0]})
+    cleaned, audit = coerce_suspicious_to_nan(df)
+
+    assert audit["token"] == {"count": 1, "examples": ["n/a "]}
+    assert cleaned["token"].isna().tolist() == [False, True, False, True]
+    assert df["token"].tolist()[:3] == ["a", "n/a ", "b"]
+    assert np.shares_memory(cleaned["value"].to_numpy(), df["value"].to_numpy())
+
+
+def test_coerce_suspicious_inplace():
+    df = pd.DataFrame({"token": ["--", "x", "--"]})
+    cleaned, audit = coerce_suspicious_to_nan(df, inplace=True)
+
+    assert cleaned is df
+    assert audit["token"]["count"] == 2
+    assert df["token"].isna().tolist() == [True, False, True]
+
+
 def test_coerce_suspicious_false_positives(false_positive_csv):
     """Phrase-level text containing keywords should not be over-flagged."""
     df = load_csv(false_positive_csv)
@@ -346,6 +435,90 @@ def test_detect_high_missing_no_false_positive(sample_csv):
     assert "department" not in flagged
 
 
+def test_profile_column_text_statistics():
+    series = pd.Series([" 1", "2", None, "2", "x ", ""], name="mixed")
+    profile = profile_column(series)
+
+    assert profile.total_rows == 6
+    assert profile.non_null == 5
+    assert profile.missing_count == 1
+    assert profile.unique_count == 4
+    assert profile.head_values == [" 1", "2", "2"]
+    assert profile.whitespace_count == 2
+    assert profile.whitespace_examples == [" 1", "x "]
+    assert profile.non_empty_count == 4
+    assert profile.numeric_count == 3
+
+
+def test_profile_column_approx_distinct():
+    ids = pd.Series([f"id-{i}" for i in range(20_000)] + [None] * 10)
+    approx = profile_column(ids, approx_distinct=True)
+    assert approx.unique_count == pytest.approx(20_000, rel=0.03)
+    assert approx.unique_count <= approx.non_null
+
+    constant = profile_column(pd.Series(["x"] * 100), approx_distinct=True)
+    assert constant.unique_count == 1
+
+
+def test_profiles_feed_consumers_unchanged(messy_csv):
+    df, _ = coerce_suspicious_to_nan(load_csv(messy_csv))
+    profiles = profile_frame(df)
+
+    assert compute_schema(df, profiles) == compute_schema(df)
+    shared_issues, shared_parse = detect_column_warnings(df, profiles=profiles)
+    issues, parseability = detect_column_warnings(df)
+    assert [i.to_dict() for i in shared_issues] == [i.to_dict() for i in issues]
+    pd.testing.assert_frame_equal(shared_parse, parseability)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2024-01-05", "2024-02-30", "05/01/2024", "2024-01-05", "12", "x"] * 3,
+        ["nan", "05 Jan 2024", "2024-01-05", "06 Jan 2024", "06 Jan 2024"],
+        ["soon", "Jan 5 2024", "2024-01-05T10:00", "1.5", "1.5", "tomorrow"],
+    ],
+    ids=["learned-format", "skips-nat-string", "dateutil-fallback"],
+)
+def test_parseable_counts_match_per_cell_parsing(values):
+    candidate = pd.Series(values, dtype=object)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=UserWarning)
+        expected_datetime = int(pd.to_datetime(candidate, errors="coerce").notna().sum())
+    expected_numeric = int(pd.to_numeric(candidate, errors="coerce").notna().sum())
+
+    tokens, weights = distinct_tokens(candidate)
+    assert weights.sum() == len(values)
+    assert parseable_counts(tokens, weights, infer_datetime_format(tokens)) == (
+        expected_numeric,
+        expected_datetime,
+    )
+
+
+def test_compute_quantiles_exact_matches_series_quantile(outliers_csv):
+    df = load_csv(outliers_csv)
+    quantiles = compute_quantiles(df)
+
+    numeric = df.select_dtypes(include="number")
+    assert list(quantiles.columns) == list(numeric.columns)
+    for col in numeric.columns:
+        for prob in (0.25, 0.5, 0.75):
+            assert quantiles.at[prob, col] == pytest.approx(numeric[col].dropna().quantile(prob))
+
+
+def test_compute_quantiles_sketch_within_rank_error():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"u": rng.uniform(0, 1, 100_000), "label": "x"})
+    quantiles = compute_quantiles(df, rank_error=0.005)
+
+    assert list(quantiles.columns) == ["u"]
+    for prob in (0.25, 0.5, 0.75):
+        assert quantiles.at[prob, "u"] == pytest.approx(prob, abs=3 * 0.005)
+
+    outliers = compute_outliers(df, quantiles)
+    assert outliers.loc[0, "q1"] == quantiles.at[0.25, "u"]
+
+
 def test_large_dataset_smoke():
     rows = 10_000
     df = pd.DataFrame(
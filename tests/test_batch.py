@@ -0,0 +1,79 @@
+"""Tests for batch analysis (analyze-many)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import CSVLoadError, read_csv_checked
+from dataset_insights.batch import BatchOptions, output_dirs, read_manifest, run_batch
+from dataset_insights.cli import main
+
+
+def test_read_csv_checked_raises_instead_of_exiting(empty_csv, tmp_path):
+    with pytest.raises(CSVLoadError, match="empty|parse"):
+        read_csv_checked(empty_csv)
+    with pytest.raises(CSVLoadError, match="file not found"):
+        read_csv_checked(tmp_path / "nonexistent.csv")
+
+
+def test_output_dirs_mirror_paths_and_manifest_is_relative(tmp_path):
+    paths = [tmp_path / "a" / "x.csv", tmp_path / "b" / "x.csv", tmp_path / "b" / "x.tsv"]
+    assert output_dirs(paths, Path("out")) == [Path("out/a/x"), Path("out/b/x"), Path("out/b/x-2")]
+
+    manifest = tmp_path / "files.txt"
+    manifest.write_text("# nightly\na/x.csv\n\n  b/x.csv  \n")
+    assert read_manifest(manifest) == [tmp_path / "a" / "x.csv", tmp_path / "b" / "x.csv"]
+
+
+def test_run_batch_isolates_failures(sample_csv, empty_csv, messy_csv, tmp_path):
+    paths = [sample_csv, empty_csv, tmp_path / "missing.csv", messy_csv]
+    outdir = tmp_path / "batch"
+    seen = []
+    records = run_batch(paths, outdir, BatchOptions(plots=False), jobs=2, on_record=seen.append)
+
+    assert [record["csv"] for record in records] == [str(path) for path in paths]
+    assert len(seen) == 4
+    assert [record["status"] for record in records] == ["ok", "failed", "failed", "ok"]
+    assert records[2]["error"] == f"file not found: {tmp_path / 'missing.csv'}"
+    assert records[0]["rows"] == 10
+    assert (outdir / "sample" / "schema.json").exists()
+    assert (outdir / "messy" / "data_quality.json").exists()
+
+
+def test_cli_analyze_many_writes_index(sample_csv, outliers_csv, empty_csv, tmp_path):
+    runner = CliRunner()
+    outdir = tmp_path / "batch"
+    pattern = str(tmp_path / "*.csv")
+
+    result = runner.invoke(main, ["analyze-many", pattern, "--outdir", str(outdir), "--no-plots", "--jobs", "1"])
+    assert result.exit_code == 1
+    assert "2 of 3 files analyzed" in result.output
+    index = json.loads((outdir / "index.json").read_text())
+    assert (index["files"], index["ok"], index["failed"]) == (3, 2, 1)
+    assert (outdir / "index.csv").read_text().splitlines()[0].startswith("csv,outdir,status,error")
+
+    empty_csv.unlink()
+    result = runner.invoke(main, ["analyze-many", pattern, "--outdir", str(outdir), "--jobs", "2"])
+    assert result.exit_code == 0, result.output
+    assert "(cached)" in result.output
+    assert (outdir / "outliers" / "plots" / "box_plot.png").exists()
+
+
+def test_batch_shares_the_analyze_cache_key(sample_csv, tmp_path, isolated_result_cache):
+    runner = CliRunner()
+    options = BatchOptions(plots=False, cache_dir=str(isolated_result_cache))
+    args = ["analyze", str(sample_csv), "--outdir", str(tmp_path / "sampled"), "--no-plots"]
+    assert runner.invoke(main, [*args, "--sample", "3"]).exit_code == 0
+    # A sampled result must not answer a full batch run ...
+    [record] = run_batch([sample_csv], tmp_path / "batch", options)
+    assert (record["status"], record["cached"], record["rows"]) == ("ok", False, 10)
+
+    # ... while a plain analyze run and the batch share one entry.
+    [record] = run_batch([sample_csv], tmp_path / "again", options)
+    assert record["cached"]
+    result = runner.invoke(main, ["analyze", str(sample_csv), "--outdir", str(tmp_path / "cli"), "--no-plots"])
+    assert "from cache" in result.output
@@ -0,0 +1,94 @@
+"""Tests for memory-budget planning (--memory-budget)."""
+
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import ColumnSelection, analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.budget import downcast_integers, plan_memory
+from dataset_insights.cli import main
+
+
+@pytest.fixture()
+def wide_csv(tmp_path, monkeypatch):
+    """CSV past the planning prefix, with small ints, low- and high-cardinality text."""
+    monkeypatch.setattr("dataset_insights.budget.PLAN_PREFIX_BYTES", 2**16)
+    path = tmp_path / "wide.csv"
+    rows = 20_000
+    pd.DataFrame(
+        {
+            "id": range(rows),
+            "count": [i % 100 for i in range(rows)],
+            "value": [None if i % 10 == 0 else i * 0.5 for i in range(rows)],
+            "city": [("Oslo", "Lima", "Pune", "N/A")[i % 4] for i in range(rows)],
+            "note": [f"note {i}" for i in range(rows)],
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_plan_reads_low_cardinality_text_as_category(wide_csv):
+    plan = plan_memory(wide_csv, 2**30)
+    assert plan.mode == "memory" and not plan.rows_exact
+    assert 18_000 < plan.rows < 22_000
+    assert plan.categories == ["city"]
+    assert plan.downcast == {"id": "int16", "count": "int8"}
+    assert plan.projected_bytes < plan.default_bytes
+
+    # A declared dtype wins over the planned category.
+    selection = plan.selection(ColumnSelection(dtypes={"city": "str"}))
+    assert selection.dtypes == {"city": "str"}
+    assert plan.selection(None).dtypes == {"city": "category"}
+
+
+def test_plan_streams_when_the_projection_exceeds_the_budget(wide_csv):
+    plan = plan_memory(wide_csv, 2**20)
+    assert plan.mode == "stream"
+    assert 1_000 <= plan.chunksize < 20_000
+    assert (plan.categories, plan.downcast) == ([], {})
+    assert "Plan: stream in chunks of" in plan.describe()[-1]
+
+
+def test_planned_dtypes_give_the_same_analysis(wide_csv):
+    plan = plan_memory(wide_csv, 2**30)
+    df = load_csv(wide_csv, selection=plan.selection(None))
+    assert downcast_integers(df) == {"id": "int16", "count": "int8"}
+    assert str(df["city"].dtype) == "category"
+
+    expected = analyze_frame(*coerce_suspicious_to_nan(load_csv(wide_csv)))
+    result = analyze_frame(*coerce_suspicious_to_nan(df))
+    assert {**result.summary, "dtypes": None} == {**expected.summary, "dtypes": None}
+    assert result.duplicates == expected.duplicates
+    assert [i.to_dict() for i in result.quality_issues] == [i.to_dict() for i in expected.quality_issues]
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers)
+
+
+def test_cli_prints_and_records_the_plan(wide_csv, tmp_path):
+    runner = CliRunner()
+    outdir = tmp_path / "out"
+    result = runner.invoke(
+        main,
+        ["analyze", str(wide_csv), "--outdir", str(outdir), "--memory-budget", "1", "--profile-run", "--no-plots"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Memory plan:" in result.output
+    assert "Streaming" in result.output
+    metrics = json.loads((outdir / "run_metrics.json").read_text())
+    assert metrics["mode"] == "stream"
+    assert metrics["options"]["memory_plan"]["mode"] == "stream"
+
+    result = runner.invoke(
+        main, ["analyze", str(wide_csv), "--outdir", str(outdir), "--memory-budget", "1024", "--no-plots"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Text as category: city" in result.output
+    schema = {entry["column"]: entry["dtype"] for entry in json.loads((outdir / "schema.json").read_text())}
+    assert (schema["city"], schema["count"]) == ("category", "int8")
+
+    result = runner.invoke(main, ["analyze", str(wide_csv), "--memory-budget", "64", "--stream"])
+    assert result.exit_code == 2
@@ -0,0 +1,106 @@
+"""Tests for the content-addressed analyze result cache."""
+
+from __future__ import annotations
+
+import os
+
+from click.testing import CliRunner
+
+from dataset_insights.analyze import analyze_frame, load_csv
+from dataset_insights.cache import ResultCache
+from dataset_insights.cli import main
+
+
+REPORTS = ("summary.md", "schema.json", "missingness.csv", "duplicates.csv", "data_quality.json")
+
+
+def test_cache_key_tracks_content_and_options(sample_csv, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(sample_csv, {"engine": "c"})
+    assert cache.key(sample_csv, {"engine": "c"}) == key
+    assert cache.key(sample_csv, {"engine": "arrow"}) != key
+
+    copy = tmp_path / "copy.csv"
+    copy.write_bytes(sample_csv.read_bytes())
+    assert cache.key(copy, {"engine": "c"}) == key
+    copy.write_bytes(sample_csv.read_bytes() + b"11,50,1,HR,2.0\n")
+    assert cache.key(copy, {"engine": "c"}) != key
+
+
+def test_cache_roundtrip_and_lru_eviction(sample_csv, tmp_path):
+    df = load_csv(sample_csv)
+    result = analyze_frame(df)
+    cache = ResultCache(tmp_path / "cache")
+    cache.put("a", result)
+    entry_size = os.path.getsize(cache._entry("a"))
+
+    restored = cache.get("a")
+    assert restored is not None
+    assert restored.summary == result.summary
+    assert cache.get("missing") is None
+
+    cache.max_bytes = 2 * entry_size
+    cache.put("b", result)
+    os.utime(cache._entry("a"), (1, 1))
+    os.utime(cache._entry("b"), (2, 2))
+    cache.get("a")  # "a" becomes the most recently used entry
+    cache.put("c", result)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_cache_drops_corrupt_entries(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.directory.mkdir()
+    cache._entry("bad").write_bytes(b"not a pickle")
+    assert cache.get("bad") is None
+    assert not cache._entry("bad").exists()
+
+
+def test_cli_repeat_run_uses_cache(sample_csv, tmp_path):
+    runner = CliRunner()
+    first, second, uncached = (tmp_path / name for name in ("first", "second", "uncached"))
+
+    result = runner.invoke(main, ["analyze", str(sample_csv), "--outdir", str(first)])
+    assert result.exit_code == 0, result.output
+    assert "from cache" not in result.output
+
+    result = runner.invoke(main, ["analyze", str(sample_csv), "--outdir", str(second)])
+    assert result.exit_code == 0, result.output
+    assert "from cache" in result.output
+    for name in REPORTS:
+        assert (second / name).read_bytes() == (first / name).read_bytes()
+    assert (second / "plots" / "box_plot.png").exists()
+
+    result = runner.invoke(
+        main, ["analyze", str(sample_csv), "--outdir", str(uncached), "--no-cache"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "from cache" not in result.output
+
+    result = runner.invoke(
+        main, ["analyze", str(sample_csv), "--outdir", str(uncached), "--stream"]
+    )
+    assert "from cache" not in result.output
+
+
+def test_streamed_runs_use_the_cache_only_when_asked(sample_csv, tmp_path, monkeypatch):
+    import dataset_insights.cache as cache_module
+
+    hashed = []
+    file_digest = cache_module.file_digest
+    monkeypatch.setattr(cache_module, "file_digest", lambda path: hashed.append(path) or file_digest(path))
+    runner = CliRunner()
+    args = ["analyze", str(sample_csv), "--outdir", str(tmp_path / "out"), "--no-plots", "--stream"]
+
+    for _ in range(2):
+        result = runner.invoke(main, args)
+        assert result.exit_code == 0, result.output
+        assert "from cache" not in result.output
+    assert not hashed
+
+    for _ in range(2):
+        result = runner.invoke(main, [*args, "--cache"])
+        assert result.exit_code == 0, result.output
+    assert "from cache" in result.output
+    assert len(hashed) == 2
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import subprocess
 import sys
 
@@ -44,6 +45,56 @@ def test_python_module_help_invocation():
     assert "Usage:" in combined_output
 
 
+HEAVY_MODULES = {"numpy", "pandas", "matplotlib", "seaborn", "pyarrow"}
+
+
+def _imported_top_level_modules(code: str) -> set[str]:
+    """Top-level packages imported by ``code``, from ``python -X importtime`` output."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return modules
+
+
+def test_cli_import_skips_heavy_dependencies():
+    """Building the CLI (--help, --version) must not import pandas or matplotlib."""
+    modules = _imported_top_level_modules("import dataset_insights.cli")
+    assert "click" in modules
+    assert not modules & HEAVY_MODULES
+
+
+def test_reports_import_only_the_checks():
+    """Report writers format results; they import no loading or analysis module."""
+    code = "import json, sys, dataset_insights.reports; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    loaded = {name for name in json.loads(result.stdout) if name.startswith("dataset_insights.")}
+    assert loaded == {"dataset_insights.checks", "dataset_insights.reports"}
+
+
+def test_analyze_no_plots_never_imports_matplotlib(sample_csv, tmp_path):
+    outdir = tmp_path / "reports"
+    code = (
+        "import sys\n"
+        "from click.testing import CliRunner\n"
+        "from dataset_insights.cli import main\n"
+        f"result = CliRunner().invoke(main, ['analyze', {str(sample_csv)!r}, '--outdir', "
+        f"{str(outdir)!r}, '--no-plots'])\n"
+        "assert result.exit_code == 0, result.output\n"
+        "assert not {'matplotlib', 'seaborn'} & set(sys.modules), 'plotting libraries imported'\n"
+    )
+    modules = _imported_top_level_modules(code)
+    assert "pandas" in modules
+    assert (outdir / "summary.md").exists()
+    assert not (outdir / "plots").exists()
+
+
 def test_analyze_output_files(runner, sample_csv, tmp_path):
     """All expected output files are created for a valid CSV."""
     outdir = tmp_path / "reports"
@@ -148,3 +199,59 @@ def test_cli_quality_warnings(runner, duplicates_csv, tmp_path):
     assert result.exit_code == 0
     assert "Quality issues:" in result.output
     assert "WARN" in result.output
+
+
+def test_analyze_quantile_error_option(runner, outliers_csv, tmp_path):
+    """--quantile-error is accepted in memory and in streaming mode."""
+    for extra in ([], ["--stream"]):
+        outdir = tmp_path / ("stream" if extra else "memory")
+        result = runner.invoke(
+            main,
+            ["analyze", str(outliers_csv), "--outdir", str(outdir), "--quantile-error", "0.01", *extra],
+        )
+        assert result.exit_code == 0, result.output
+        assert (outdir / "outliers.csv").exists()
+
+    result = runner.invoke(main, ["analyze", str(outliers_csv), "--quantile-error", "0"])
+    assert result.exit_code != 0
+
+
+def test_analyze_approx_distinct_option(runner, high_cardinality_csv, tmp_path):
+    """--approx-distinct keeps the schema and high-cardinality warning intact."""
+    for extra in ([], ["--stream"]):
+        outdir = tmp_path / ("stream" if extra else "memory")
+        result = runner.invoke(
+            main, ["analyze", str(high_cardinality_csv), "--outdir", str(outdir), "--approx-distinct", *extra]
+        )
+        assert result.exit_code == 0, result.output
+        quality = json.loads((outdir / "data_quality.json").read_text())
+        rules = {issue["rule"] for issue in quality["issues"]}
+        assert "high_cardinality_column" in rules
+
+
+def test_analyze_column_selection_records_skipped_columns(runner, sample_csv, tmp_path):
+    first = tmp_path / "first"
+    result = runner.invoke(main, ["analyze", str(sample_csv), "--outdir", str(first), "--no-plots"])
+    assert result.exit_code == 0, result.output
+
+    # The earlier run's schema.json pins the dtypes of the second.
+    outdir = tmp_path / "out"
+    result = runner.invoke(
+        main,
+        [
+            "analyze", str(sample_csv), "--outdir", str(outdir), "--no-plots",
+            "--columns", "id,age,s*", "--exclude-columns", "score",
+            "--dtypes", str(first / "schema.json"),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Skipped 2 columns" in result.output
+    schema = json.loads((outdir / "schema.json").read_text())
+    assert [entry["column"] for entry in schema] == ["id", "age", "salary", "department", "score"]
+    assert [entry.get("skipped", False) for entry in schema] == [False, False, False, True, True]
+
+    bad = tmp_path / "bad.json"
+    bad.write_text('["not", "a", "mapping"]')
+    result = runner.invoke(main, ["analyze", str(sample_csv), "--outdir", str(outdir), "--dtypes", str(bad)])
+    assert result.exit_code != 0
+    assert "--dtypes" in result.output
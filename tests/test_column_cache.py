@@ -0,0 +1,59 @@
+"""Tests for the column-level incremental result cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_insights import parallel
+from dataset_insights.analyze import analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.cache import ResultCache
+from dataset_insights.column_cache import analyze_frame_cached
+
+from test_parallel import _assert_same_result
+
+
+@pytest.fixture
+def profiled_columns(monkeypatch):
+    """Names of the columns each ``analyze_frame_cached`` call actually profiles."""
+    seen: list[str] = []
+    original = parallel._profile_subset
+
+    def recording(sub, *args, **kwargs):
+        seen.extend(map(str, sub.columns))
+        return original(sub, *args, **kwargs)
+
+    monkeypatch.setattr(parallel, "_profile_subset", recording)
+    return seen
+
+
+@pytest.mark.parametrize("fixture", ["sample_csv", "messy_csv", "mixed_type_csv", "duplicates_csv"])
+def test_cached_analysis_matches_analyze_frame(fixture, request, tmp_path, profiled_columns):
+    df, audit = coerce_suspicious_to_nan(load_csv(request.getfixturevalue(fixture)))
+    cache = ResultCache(tmp_path / "cache")
+    expected = analyze_frame(df, audit)
+
+    _assert_same_result(analyze_frame_cached(df, cache, audit), expected)
+    assert len(profiled_columns) == df.shape[1]
+    _assert_same_result(analyze_frame_cached(df, cache, audit), expected)
+    assert len(profiled_columns) == df.shape[1]  # second run reused every column
+
+
+def test_only_changed_columns_are_reprofiled(tmp_path, profiled_columns):
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({name: rng.normal(size=200) for name in "abcdef"})
+    df["label"] = rng.choice(["x", "y"], 200)
+    df.loc[::7, "c"] = np.nan
+    cache = ResultCache(tmp_path / "cache")
+    analyze_frame_cached(df, cache)
+    profiled_columns.clear()
+
+    edited = df.copy()
+    edited.loc[10:40, "b"] = rng.normal(size=31) * 5
+    result = analyze_frame_cached(edited, cache)
+
+    assert profiled_columns == ["b"]
+    expected = analyze_frame(edited)
+    _assert_same_result(result, expected)
+    np.testing.assert_array_equal(result.correlation.to_numpy(), expected.correlation.to_numpy())
@@ -0,0 +1,109 @@
+"""Tests for row-hash duplicate detection."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from dataset_insights.analyze import compute_duplicates, load_csv
+from dataset_insights.duplicates import (
+    DistinctRowCounter,
+    DuplicateCounter,
+    count_duplicates,
+    hash_rows,
+)
+
+
+def test_hash_rows_treats_missing_and_signed_zero_as_equal():
+    df = pd.DataFrame(
+        {
+            "x": [0.0, -0.0, np.nan, np.nan],
+            "label": pd.Series(["a", "a", None, np.nan], dtype=object),
+        }
+    )
+    hashes = hash_rows(df)
+    assert hashes[0] == hashes[1]
+    assert hashes[2] == hashes[3]
+    assert hashes[0] != hashes[2]
+
+
+def test_hash_rows_depends_on_column_order():
+    df = pd.DataFrame({"a": [1, 2], "b": [2, 1]})
+    hashes = hash_rows(df)
+    assert hashes[0] != hashes[1]
+
+
+def test_compute_duplicates_matches_pandas(duplicates_csv):
+    df = load_csv(duplicates_csv)
+    result = compute_duplicates(df)
+
+    assert result["duplicate_rows_excluding_first"] == int(df.duplicated().sum())
+    assert result["duplicate_group_count"] == int((df.value_counts(dropna=False) > 1).sum())
+    expected_examples = df.loc[df.duplicated()].head(result["example_limit"])
+    assert len(result["example_rows"]) == len(expected_examples)
+
+
+def test_counter_spills_and_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 40, 5_000), "b": rng.choice(["x", "y", None], 5_000)})
+    expected = count_duplicates(hash_rows(df), max_examples=5)
+
+    with DuplicateCounter(memory_budget=4_096, max_examples=5, spill_dir=tmp_path) as counter:
+        for start in range(0, len(df), 700):
+            counter.update(df.iloc[start : start + 700])
+        stats = counter.finish()
+        assert counter.spilled
+        assert any(tmp_path.iterdir())
+
+    assert stats == expected
+    assert stats.example_positions == np.flatnonzero(df.duplicated().to_numpy())[:5].tolist()
+    assert not any(tmp_path.iterdir())
+
+
+def test_counter_splits_partitions_larger_than_the_budget(tmp_path, monkeypatch):
+    import dataset_insights.duplicates as duplicates
+
+    loaded = []
+    count_partition = duplicates._count_partition
+
+    def recording(hashes, positions, max_examples, stats):
+        loaded.append(len(hashes))
+        count_partition(hashes, positions, max_examples, stats)
+
+    monkeypatch.setattr(duplicates, "_count_partition", recording)
+    rng = np.random.default_rng(2)
+    # Skewed: a third of the rows are one repeated row.
+    df = pd.DataFrame({"a": rng.integers(0, 4_000, 6_000)})
+    df.loc[::3, "a"] = -1
+    budget = 512  # 32 rows
+    with DuplicateCounter(memory_budget=budget, max_examples=5, spill_dir=tmp_path) as counter:
+        for start in range(0, len(df), 500):
+            counter.update(df.iloc[start : start + 500])
+        stats = counter.finish()
+
+    assert max(loaded) * 16 <= budget
+    assert stats == count_duplicates(hash_rows(df), max_examples=5)
+    assert stats.example_positions == np.flatnonzero(df.duplicated().to_numpy())[:5].tolist()
+
+
+def test_distinct_row_counter_matches_pandas_and_keeps_few_runs():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"a": rng.integers(0, 3_000, 20_000), "b": rng.choice(["x", "y"], 20_000)})
+    counter = DistinctRowCounter()
+    repeats = []
+    for start in range(0, len(df), 250):
+        repeats.extend(start + counter.update(df.iloc[start : start + 250]))
+        assert len(counter._runs) <= 12
+
+    assert repeats == np.flatnonzero(df.duplicated().to_numpy()).tolist()
+    unique, counts = np.unique(hash_rows(df), return_counts=True)
+    np.testing.assert_array_equal(counter.hashes, unique)
+    np.testing.assert_array_equal(counter.counts, counts)
+    stats = counter.stats()
+    assert stats.duplicate_rows == int(df.duplicated().sum())
+    assert stats.group_count == int((df.value_counts() > 1).sum())
+
+    # A counter restored from saved arrays carries on where it stopped.
+    restored = DistinctRowCounter(counter.hashes.copy(), counter.counts.copy())
+    assert restored.total_rows == len(df)
+    assert restored.update(df.iloc[:3]).tolist() == [0, 1, 2]
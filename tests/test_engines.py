@@ -0,0 +1,77 @@
+"""Tests for the optional pyarrow CSV engine."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.cli import main
+
+pytest.importorskip("pyarrow")
+
+
+def _analyze(path, engine):
+    df, audit = coerce_suspicious_to_nan(load_csv(path, engine=engine))
+    return df, analyze_frame(df, audit)
+
+
+@pytest.mark.parametrize(
+    "fixture",
+    [
+        "sample_csv",
+        "messy_csv",
+        "mixed_type_csv",
+        "outliers_csv",
+        "duplicates_csv",
+        "whitespace_csv",
+        "high_missing_csv",
+        "latin1_csv",
+        "blank_colname_csv",
+        "semicolon_csv",
+    ],
+)
+def test_arrow_engine_matches_c_engine(fixture, request):
+    path = request.getfixturevalue(fixture)
+    c_df, expected = _analyze(path, "c")
+    arrow_df, result = _analyze(path, "arrow")
+
+    assert list(arrow_df.columns) == list(c_df.columns)
+    assert result.summary["numeric_summary"].keys() == expected.summary["numeric_summary"].keys()
+    for col, stats in expected.summary["numeric_summary"].items():
+        assert result.summary["numeric_summary"][col] == pytest.approx(stats, nan_ok=True)
+    assert result.suspicious_audit == expected.suspicious_audit
+    assert result.duplicates == expected.duplicates
+    assert [i.to_dict() for i in result.quality_issues] == [i.to_dict() for i in expected.quality_issues]
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers, check_dtype=False)
+    pd.testing.assert_frame_equal(result.parseability, expected.parseability, check_dtype=False)
+    for arrow_col, c_col in zip(result.schema, expected.schema):
+        assert {k: v for k, v in arrow_col.items() if k != "dtype"} == {
+            k: v for k, v in c_col.items() if k != "dtype"
+        }
+
+
+def test_arrow_engine_stores_text_as_arrow_strings(sample_csv):
+    df = load_csv(sample_csv, engine="arrow")
+    assert df["department"].dtype == pd.StringDtype("pyarrow")
+    assert df["age"].dtype == "float64"
+    assert df["id"].dtype == "int64"
+
+
+def test_arrow_engine_keeps_dates_as_text(tmp_path):
+    path = tmp_path / "dates.csv"
+    path.write_text("when,flag\n2024-01-01,true\n2024-02-30,false\n")
+    df = load_csv(path, engine="arrow")
+    assert df["when"].tolist() == ["2024-01-01", "2024-02-30"]
+    assert df["flag"].dtype == "bool"
+
+
+def test_cli_engine_arrow(sample_csv, tmp_path):
+    outdir = tmp_path / "reports"
+    result = CliRunner().invoke(
+        main, ["analyze", str(sample_csv), "--outdir", str(outdir), "--engine", "arrow"]
+    )
+    assert result.exit_code == 0, result.output
+    assert (outdir / "schema.json").exists()
@@ -0,0 +1,93 @@
+"""Tests for append-only incremental analysis."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.cli import main
+from dataset_insights.incremental import CHECKPOINT_DIRNAME, analyze_incremental
+from dataset_insights.stream import analyze_stream
+
+
+def _log_frame(rows: int = 1_200) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    return pd.DataFrame(
+        {
+            "id": rng.integers(0, 200, rows),
+            "latency": rng.normal(100, 15, rows).round(1),
+            "level": rng.choice(["INFO", "WARN", "N/A"], rows),
+            "when": pd.date_range("2024-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M"),
+        }
+    )
+
+
+def _append(path, frame: pd.DataFrame) -> None:
+    with open(path, "a", newline="") as handle:
+        frame.to_csv(handle, index=False, header=False)
+
+
+def test_appended_rows_match_full_stream(tmp_path):
+    frame = _log_frame()
+    csv = tmp_path / "log.csv"
+    frame.iloc[:800].to_csv(csv, index=False)
+
+    _, note = analyze_incremental(csv, tmp_path / "ck", chunksize=250)
+    assert note == "Full analysis (no usable checkpoint)"
+    # Repeats of earlier rows and of rows within the appended batch.
+    _append(csv, pd.concat([frame.iloc[800:], frame.iloc[:3], frame.iloc[900:902]]))
+    result, note = analyze_incremental(csv, tmp_path / "ck", chunksize=250)
+    assert note.startswith("Appended 405 rows")
+
+    expected = analyze_stream(csv, chunksize=250)
+    assert result.schema == expected.schema
+    assert result.duplicates == expected.duplicates
+    assert result.duplicates["duplicate_rows_excluding_first"] == 5
+    assert [i.to_dict() for i in result.quality_issues] == [i.to_dict() for i in expected.quality_issues]
+    for col, stats in expected.summary["numeric_summary"].items():
+        assert result.summary["numeric_summary"][col] == pytest.approx(stats)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers)
+    pd.testing.assert_frame_equal(result.parseability, expected.parseability)
+    pd.testing.assert_frame_equal(result.correlation, expected.correlation)
+
+
+def test_falls_back_to_full_run_when_earlier_bytes_or_types_change(tmp_path):
+    frame = _log_frame(300)
+    csv = tmp_path / "log.csv"
+    frame.to_csv(csv, index=False)
+    checkpoint = tmp_path / "ck"
+    analyze_incremental(csv, checkpoint)
+
+    assert analyze_incremental(csv, checkpoint)[1] == "No new bytes since the last run"
+
+    _append(csv, frame.assign(id=0.5).iloc[:1])  # an int column gains a float
+    result, note = analyze_incremental(csv, checkpoint)
+    assert note == "Full analysis (appended rows do not fit the stored column types)"
+    assert result.summary["dtypes"]["id"] == "float64"
+
+    csv.write_bytes(csv.read_bytes().replace(b"INFO", b"info", 1))
+    result, note = analyze_incremental(csv, checkpoint)
+    assert note == "Full analysis (bytes before the last offset changed)"
+    assert result.summary["shape"]["rows"] == 301
+
+
+def test_cli_incremental_reemits_reports(tmp_path):
+    frame = _log_frame(400)
+    csv = tmp_path / "log.csv"
+    outdir = tmp_path / "out"
+    frame.iloc[:300].to_csv(csv, index=False)
+    runner = CliRunner()
+    args = ["analyze", str(csv), "--outdir", str(outdir), "--incremental", "--no-plots"]
+
+    first = runner.invoke(main, args)
+    assert first.exit_code == 0, first.output
+    assert "Full analysis" in first.output
+    _append(csv, frame.iloc[300:])
+    second = runner.invoke(main, args)
+    assert second.exit_code == 0, second.output
+    assert "Appended 100 rows" in second.output
+    assert "400 rows x 4 columns" in second.output
+    assert (outdir / CHECKPOINT_DIRNAME / "checkpoint.json").exists()
+    assert (outdir / "schema.json").exists()
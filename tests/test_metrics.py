@@ -0,0 +1,50 @@
+"""Tests for per-stage run metrics (--profile-run)."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.cli import main
+from dataset_insights.metrics import RUN_METRICS_SCHEMA_VERSION, RunMetrics, format_stage_table
+
+
+def test_run_metrics_records_stages_in_order():
+    metrics = RunMetrics()
+    with metrics.stage("first"):
+        sum(range(10_000))
+    with metrics.stage("second"):
+        with pytest.raises(RuntimeError, match="inside stage 'second'"):
+            with metrics.stage("nested"):
+                pass
+
+    payload = metrics.finish(csv="x.csv", rows=1)
+    assert payload["schema_version"] == RUN_METRICS_SCHEMA_VERSION
+    assert payload["csv"] == "x.csv"
+    assert [stage["name"] for stage in payload["stages"]] == ["first", "second"]
+    stage = payload["stages"][0]
+    assert set(stage) == {"name", "wall_seconds", "cpu_seconds", "peak_rss_bytes", "rss_growth_bytes"}
+    assert stage["wall_seconds"] >= 0
+    assert payload["total"]["wall_seconds"] >= sum(s["wall_seconds"] for s in payload["stages"])
+
+    lines = format_stage_table(payload)
+    assert lines[0].split()[:3] == ["Stage", "Wall", "s"]
+    assert [line.split()[0] for line in lines[1:]] == ["first", "second", "total"]
+
+
+def test_cli_profile_run_writes_run_metrics(sample_csv, tmp_path):
+    outdir = tmp_path / "out"
+    result = CliRunner().invoke(
+        main, ["analyze", str(sample_csv), "--outdir", str(outdir), "--profile-run", "--no-plots"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Run metrics:" in result.output
+
+    payload = json.loads((outdir / "run_metrics.json").read_text())
+    names = [stage["name"] for stage in payload["stages"]]
+    assert names[:4] == ["load.sniff", "load.read_csv", "load.inspect_header", "coerce_suspicious"]
+    assert "analyze.compute_correlation" in names
+    assert names[-1] == "report.data_quality.json"
+    assert (payload["mode"], payload["rows"], payload["options"]["plots"]) == ("memory", 10, False)
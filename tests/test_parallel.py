@@ -0,0 +1,55 @@
+"""Tests for column-parallel analysis."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.cli import main
+from dataset_insights.parallel import _partition_columns, analyze_frame_parallel
+
+
+def _assert_same_result(result, expected):
+    assert result.summary == expected.summary
+    assert result.schema == expected.schema
+    assert result.duplicates == expected.duplicates
+    assert result.suspicious_audit == expected.suspicious_audit
+    assert [i.to_dict() for i in result.quality_issues] == [i.to_dict() for i in expected.quality_issues]
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers, check_dtype=False)
+    pd.testing.assert_frame_equal(result.parseability, expected.parseability, check_dtype=False)
+    if expected.correlation is None:
+        assert result.correlation is None
+    else:
+        pd.testing.assert_frame_equal(result.correlation, expected.correlation)
+
+
+@pytest.mark.parametrize(
+    "fixture",
+    ["sample_csv", "messy_csv", "mixed_type_csv", "outliers_csv", "duplicates_csv", "whitespace_csv", "high_missing_csv"],
+)
+def test_parallel_matches_sequential(fixture, request):
+    df, audit = coerce_suspicious_to_nan(load_csv(request.getfixturevalue(fixture)))
+    expected = analyze_frame(df, audit)
+    result = analyze_frame_parallel(df, audit, jobs=2)
+    _assert_same_result(result, expected)
+
+
+def test_partition_columns_is_contiguous_and_complete():
+    groups = _partition_columns(10, jobs=2)
+    assert [pos for group in groups for pos in group] == list(range(10))
+    assert len(groups) <= 8
+    assert _partition_columns(3, jobs=8) == [[0], [1], [2]]
+
+
+def test_cli_jobs_matches_single_process(messy_csv, tmp_path):
+    runner = CliRunner()
+    for jobs in ("1", "2"):
+        outdir = tmp_path / f"jobs{jobs}"
+        result = runner.invoke(main, ["analyze", str(messy_csv), "--outdir", str(outdir), "--jobs", jobs])
+        assert result.exit_code == 0, result.output
+
+    for name in ("schema.json", "missingness.csv", "outliers.csv", "data_quality.json"):
+        assert (tmp_path / "jobs1" / name).read_text() == (tmp_path / "jobs2" / name).read_text()
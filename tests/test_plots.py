@@ -0,0 +1,73 @@
+"""Tests for precomputed plot inputs and pooled rendering."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+
+from dataset_insights.analyze import analyze_frame, load_csv
+from dataset_insights.plotdata import box_data, histogram_data, plot_inputs_from_frame
+from dataset_insights.stream import analyze_stream
+from dataset_insights.plots import PLOT_NAMES, plot_executor, submit_plots
+
+
+def test_plot_inputs_match_raw_data():
+    rng = np.random.default_rng(5)
+    values = np.append(rng.normal(size=2_000), [25.0, -30.0])
+    df = pd.DataFrame({"x": values, "label": "a"})
+    df.loc[::50, "x"] = np.nan
+    present = df["x"].dropna().to_numpy()
+
+    (hist,) = histogram_data(df)
+    expected_counts, expected_edges = np.histogram(present, bins=30)
+    np.testing.assert_array_equal(hist.counts, expected_counts)
+    np.testing.assert_allclose(hist.edges, expected_edges)
+
+    (box,), sampled = box_data(df)
+    (expected,) = cbook.boxplot_stats(present)
+    assert not sampled
+    assert (box.q1, box.median, box.q3) == (expected["q1"], expected["med"], expected["q3"])
+    assert (box.whisker_low, box.whisker_high) == (expected["whislo"], expected["whishi"])
+    np.testing.assert_array_equal(np.sort(box.fliers), np.sort(expected["fliers"]))
+
+
+def test_streaming_plot_inputs_match_in_memory(outliers_csv):
+    df = load_csv(outliers_csv)
+    expected = plot_inputs_from_frame(df, analyze_frame(df))
+    actual = analyze_stream(outliers_csv, chunksize=3).plot_inputs
+
+    assert actual is not None
+    assert actual.numeric_column_count == expected.numeric_column_count
+    pd.testing.assert_series_equal(actual.missing_pct, expected.missing_pct)
+    for got, want in zip(actual.histograms, expected.histograms, strict=True):
+        assert got.column == want.column
+        np.testing.assert_array_equal(got.counts, want.counts)
+        np.testing.assert_allclose(got.edges, want.edges)
+    for got, want in zip(actual.boxes, expected.boxes, strict=True):
+        assert (got.column, got.whisker_low, got.whisker_high) == (
+            want.column,
+            want.whisker_low,
+            want.whisker_high,
+        )
+        assert [got.q1, got.median, got.q3] == pytest.approx([want.q1, want.median, want.q3])
+        np.testing.assert_array_equal(np.sort(got.fliers), np.unique(want.fliers))
+
+
+def test_submit_plots_renders_from_inputs(sample_csv, no_numeric_csv, tmp_path):
+    df = load_csv(sample_csv)
+    inputs = plot_inputs_from_frame(df, analyze_frame(df))
+    assert inputs.numeric_column_count == 4
+    with plot_executor(2) as executor:
+        paths = {name: f.result() for name, f in submit_plots(executor, inputs, tmp_path).items()}
+    assert list(paths) == list(PLOT_NAMES)
+    assert all(path is not None and path.exists() for path in paths.values())
+
+    text_only = load_csv(no_numeric_csv)
+    inputs = plot_inputs_from_frame(text_only, analyze_frame(text_only))
+    with plot_executor(1) as executor:
+        futures = submit_plots(executor, inputs, tmp_path / "text")
+        paths = {name: future.result() for name, future in futures.items()}
+    assert paths["missingness_bar"] is not None
+    assert paths["distribution_histogram"] is paths["correlation_heatmap"] is paths["box_plot"] is None
@@ -0,0 +1,155 @@
+"""Tests for compressed CSV and columnar (Parquet / Arrow IPC) input."""
+
+from __future__ import annotations
+
+import bz2
+import datetime
+import decimal
+import gzip
+import json
+import lzma
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.cli import main
+from dataset_insights.readers import open_columnar
+from dataset_insights.stream import analyze_stream
+
+
+def _analyze(path):
+    df, audit = coerce_suspicious_to_nan(load_csv(path))
+    return df, analyze_frame(df, audit)
+
+
+def _assert_same_result(result, expected):
+    assert result.schema == expected.schema
+    assert result.summary == expected.summary
+    assert result.duplicates == expected.duplicates
+    assert [i.to_dict() for i in result.quality_issues] == [i.to_dict() for i in expected.quality_issues]
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers)
+
+
+@pytest.mark.parametrize("suffix, opener", [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)])
+def test_compressed_csv_matches_plain_csv(suffix, opener, latin1_csv, tmp_path):
+    compressed = tmp_path / f"data.csv{suffix}"
+    with opener(compressed, "wb") as handle:
+        handle.write(latin1_csv.read_bytes())
+
+    expected_df, expected = _analyze(latin1_csv)
+    df, result = _analyze(compressed)
+    pd.testing.assert_frame_equal(df, expected_df)
+    _assert_same_result(result, expected)
+    _assert_same_result(analyze_stream(compressed, chunksize=3), analyze_stream(latin1_csv, chunksize=3))
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".feather"])
+def test_columnar_input_matches_csv(suffix, duplicates_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    columnar = tmp_path / f"data{suffix}"
+    frame = pd.read_csv(duplicates_csv)
+    if suffix == ".parquet":
+        frame.to_parquet(columnar, row_group_size=3)
+    else:
+        frame.to_feather(columnar)
+
+    _, expected = _analyze(duplicates_csv)
+    _, result = _analyze(columnar)
+    _assert_same_result(result, expected)
+    # Batches smaller than a row group, and int / bool columns pinned across them.
+    _assert_same_result(analyze_stream(columnar, chunksize=2), analyze_stream(duplicates_csv, chunksize=2))
+
+
+def test_columnar_types_convert_like_a_csv_parse(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    table = pa.table(
+        {
+            "count": pa.array([1, None, 3]),
+            "flag": pa.array([True, False, None]),
+            "day": pa.array([datetime.date(2024, 1, d) for d in (1, 2, 3)]),
+            "at": pa.array([datetime.datetime(2024, 1, 1, h) for h in (1, 2, 3)], pa.timestamp("ms", "UTC")),
+            "price": pa.array([decimal.Decimal("1.50")] * 3),
+            "kind": pa.array(["a", "b", "a"]).dictionary_encode(),
+        }
+    )
+    path = tmp_path / "typed.parquet"
+    pq.write_table(table, path, row_group_size=1)
+
+    source = open_columnar(path)
+    df = source.read()
+    assert pd.api.types.is_datetime64_dtype(df["day"])
+    assert df["day"].dt.day.tolist() == [1, 2, 3]
+    assert str(df["at"].dt.tz) == "UTC"
+    assert df["price"].dtype == "float64"
+    assert df["kind"].tolist() == ["a", "b", "a"]
+    assert source.dtypes() == df.dtypes.to_dict()
+    assert str(source.dtypes()["count"]) == "float64" and str(source.dtypes()["flag"]) == "object"
+    for frame in source.iter_frames(1, dtypes=source.dtypes()):
+        assert frame.dtypes.to_dict() == df.dtypes.to_dict()
+    assert source.read(columns=["kind"]).columns.tolist() == ["kind"]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrows"])
+def test_typed_datetimes_count_as_fully_parseable(suffix, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table(
+        {
+            "day": pa.array([datetime.date(2024, 1, d) if d % 4 else None for d in range(1, 13)]),
+            "note": pa.array(["2024-01-01", "soon", "2024-02-01"] * 4),
+        }
+    )
+    path = tmp_path / f"typed{suffix}"
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, row_group_size=5)
+    else:
+        with pa.ipc.new_stream(path, table.schema) as writer:  # stream format, not file
+            writer.write_table(table, max_chunksize=5)
+
+    df, result = _analyze(path)
+    streamed = analyze_stream(path, chunksize=4)
+    for parseability in (result.parseability, streamed.parseability):
+        row = parseability.set_index("column").loc["day"]
+        assert row["non_empty_count"] == row["datetime_parseable_count"] == 9
+        assert row["datetime_parse_pct"] == 100.0
+        assert parseability.set_index("column").loc["note", "datetime_parseable_count"] == 8
+    assert open_columnar(path).num_rows == 12
+
+    result = CliRunner().invoke(
+        main, ["analyze", str(path), "--outdir", str(tmp_path / "out"), "--no-plots", "--no-cache"]
+    )
+    assert result.exit_code == 0, result.output
+    schema = json.loads((tmp_path / "out" / "schema.json").read_text(encoding="utf-8"))
+    assert schema[0]["sample_values"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def test_cli_reads_gzip_and_rejects_incremental_on_it(sample_csv, tmp_path):
+    compressed = tmp_path / "sample.csv.gz"
+    compressed.write_bytes(gzip.compress(sample_csv.read_bytes()))
+
+    result = CliRunner().invoke(
+        main, ["analyze", str(compressed), "--outdir", str(tmp_path / "out"), "--no-plots"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "10 rows x" in result.output
+
+    result = CliRunner().invoke(
+        main, ["analyze", str(compressed), "--incremental", "--outdir", str(tmp_path / "inc")]
+    )
+    assert result.exit_code == 1
+    assert "needs an uncompressed CSV" in result.output
+
+
+def test_normalize_column_does_not_need_string_view(monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    from dataset_insights.readers import _normalize_column
+
+    monkeypatch.delattr(pa.types, "is_string_view", raising=False)  # as on pyarrow < 16
+    for values in (pa.array([1, 2]), pa.array(["a", None]), pa.array([1.5, None])):
+        assert _normalize_column(values).equals(values)
@@ -0,0 +1,95 @@
+"""Tests for sampled analysis (--sample / --sample-frac) and its confidence intervals."""
+
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import load_csv
+from dataset_insights.cli import main
+from dataset_insights.sample import SampleInfo, read_sample
+
+
+@pytest.fixture()
+def long_csv(tmp_path):
+    """CSV past the sniffed prefix, so sampling by seeking pays off."""
+    path = tmp_path / "long.csv"
+    frame = pd.DataFrame(
+        {
+            "id": range(100_000),
+            "value": [None if i % 10 == 0 else i * 0.5 for i in range(100_000)],
+            "label": [f"label_{i % 7}" for i in range(100_000)],
+        }
+    )
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_wilson_interval_with_finite_population_correction():
+    sample = SampleInfo("reservoir", rows=100, population_rows=10**9, population_exact=True, seed=0)
+    assert sample.interval(10, 100) == (5.52, 17.44)
+    assert sample.interval(0, 100)[0] == 0.0
+    assert sample.interval(5, 0) == (0.0, 100.0)
+
+    whole = SampleInfo("reservoir", rows=100, population_rows=100, population_exact=True, seed=0)
+    assert whole.interval(10, 100) == (10.0, 10.0)
+
+
+def test_reservoir_sample_is_a_seeded_subset_in_file_order(sample_csv):
+    full = load_csv(sample_csv)
+    df, sample = read_sample(sample_csv, rows=4, seed=3)
+    assert (sample.method, sample.rows, sample.population_rows, sample.population_exact) == (
+        "reservoir", 4, 10, True,
+    )
+    assert df["id"].is_monotonic_increasing
+    assert set(df["id"]) <= set(full["id"])
+    assert read_sample(sample_csv, rows=4, seed=3)[0].equals(df)
+
+    whole, sample = read_sample(sample_csv, rows=100)
+    pd.testing.assert_frame_equal(whole, full)
+    assert sample.fraction == 1.0
+
+
+def test_seek_sample_on_a_long_csv(long_csv, tmp_path):
+    df, sample = read_sample(long_csv, rows=50, seed=1)
+    assert (sample.method, sample.rows, sample.population_exact) == ("seek", 50, False)
+    assert 70_000 < sample.population_rows < 130_000
+    assert df.dtypes.to_dict() == load_csv(long_csv).dtypes.to_dict()
+    assert df["id"].is_unique and df["id"].is_monotonic_increasing
+
+    df, sample = read_sample(long_csv, fraction=0.001, seed=1)
+    assert sample.method == "seek" and 50 < sample.rows < 150
+
+    # Line breaks inside quoted fields: rows cannot be found by seeking.
+    quoted = tmp_path / "quoted.csv"
+    quoted.write_text(long_csv.read_text().replace("label_3", '"label\n3"'))
+    df, sample = read_sample(quoted, rows=50, seed=1)
+    assert (sample.method, sample.population_rows) == ("reservoir", 100_000)
+
+
+def test_cli_sample_annotates_reports(long_csv, tmp_path):
+    runner = CliRunner()
+    outdir = tmp_path / "out"
+    result = runner.invoke(
+        main, ["analyze", str(long_csv), "--outdir", str(outdir), "--sample", "50", "--no-plots"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "50 rows x 3 columns" in result.output
+    assert "Random sample of an estimated" in result.output
+
+    missingness = pd.read_csv(outdir / "missingness.csv")
+    row = missingness.set_index("column").loc["value"]
+    assert row["missing_pct_ci_low"] <= 10 <= row["missing_pct_ci_high"]
+    assert "outlier_pct_ci_low" in pd.read_csv(outdir / "outliers.csv").columns
+    quality = json.loads((outdir / "data_quality.json").read_text())
+    assert quality["sample"]["rows"] == 50
+    assert all("pct_ci" in issue for issue in quality["issues"])
+    assert "## Sample" in (outdir / "summary.md").read_text()
+
+    result = runner.invoke(main, ["analyze", str(long_csv), "--sample", "5", "--stream"])
+    assert result.exit_code == 2
+    assert "drop --stream" in result.output
+
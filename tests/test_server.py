@@ -0,0 +1,180 @@
+"""Tests for the profiling daemon (serve)."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from dataset_insights.batch import BatchOptions
+from dataset_insights.server import JobQueue, check_loopback, make_server
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def _request(connection, method, path, body=None, headers=None):
+    payload = json.dumps(body).encode() if body is not None else None
+    connection.request(
+        method, path, body=payload, headers={"Content-Type": "application/json", **(headers or {})}
+    )
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+@pytest.fixture
+def serving(tmp_path):
+    """Start a server in a thread; yields a function returning fresh connections."""
+    servers = []
+
+    def start(socket_path=None, data_dirs=None):
+        queue = JobQueue(
+            tmp_path / "root",
+            workers=1,
+            defaults=BatchOptions(plots=False, cache=False),
+            data_dirs=data_dirs,
+        )
+        server = make_server(queue, port=0, socket_path=socket_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append((server, queue))
+        if socket_path is not None:
+            return lambda: _UnixConnection(str(socket_path))
+        host, port = server.server_address[:2]
+        return lambda: http.client.HTTPConnection(host, port, timeout=60)
+
+    yield start
+    for server, queue in servers:
+        server.shutdown()
+        server.server_close()
+        queue.close()
+
+
+def test_analyze_waits_and_returns_paths_and_reports(serving, sample_csv, tmp_path):
+    connect = serving()
+    outdir = tmp_path / "root" / "jobs" / "named"
+    status, job = _request(
+        connect(),
+        "POST",
+        "/analyze",
+        {"csv": str(sample_csv), "outdir": "named", "include_reports": True},
+    )
+    assert status == 200, job
+    assert job["state"] == "ok"
+    assert job["rows"] == 10
+    assert job["files"]["schema.json"] == str(outdir / "schema.json")
+    assert job["files"]["summary.md"] == str(outdir / "summary.md")
+    assert job["reports"]["schema.json"] == json.loads((outdir / "schema.json").read_text())
+    assert job["reports"]["data_quality.json"] == json.loads((outdir / "data_quality.json").read_text())
+
+    status, polled = _request(connect(), "GET", f"/jobs/{job['id']}")
+    assert status == 200 and polled["state"] == "ok" and "reports" not in polled
+    polled = _request(connect(), "GET", f"/jobs/{job['id']}?include_reports=1")[1]
+    assert polled["reports"] == job["reports"]
+
+
+def test_async_jobs_failures_and_bad_requests(serving, sample_csv, tmp_path):
+    connect = serving()
+    status, job = _request(
+        connect(), "POST", "/analyze", {"csv": str(sample_csv), "wait": False, "options": {"stream": True}}
+    )
+    assert status in (200, 202)
+    deadline = time.time() + 60
+    while job["state"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.05)
+        _, job = _request(connect(), "GET", f"/jobs/{job['id']}")
+    assert job["state"] == "ok"
+    assert job["outdir"] == str(tmp_path / "root" / "jobs" / job["id"])
+
+    status, failed = _request(connect(), "POST", "/analyze", {"csv": str(tmp_path / "missing.csv")})
+    assert status == 200 and failed["state"] == "failed"
+    assert failed["error"].startswith("file not found")
+
+    for body, message in [
+        ({}, "csv must be a file path"),
+        ({"csv": "x.csv", "options": {"engine": "perl"}}, "engine must be one of"),
+        ({"csv": "x.csv", "options": {"colour": 1}}, "unknown options: colour"),
+        ({"csv": "x.csv", "options": {"stream": "no"}}, "stream must be true or false"),
+        ({"csv": "x.csv", "options": {"plots": 0}}, "plots must be true or false"),
+        ({"csv": "x.csv", "options": {"approx_distinct": None}}, "approx_distinct must be"),
+        ({"csv": "x.csv", "options": {"cache": "off"}}, "cache must be true, false or null"),
+        ({"csv": "x.csv", "options": {"chunksize": True}}, "chunksize must be a positive"),
+        ({"csv": "x.csv", "timeout": "x"}, "timeout must be"),
+        ({"csv": "x.csv", "wait": "yes"}, "wait must be"),
+    ]:
+        status, error = _request(connect(), "POST", "/analyze", body)
+        assert status == 400 and error["error"].startswith(message)
+    assert _request(connect(), "GET", "/jobs/nope")[0] == 404
+
+    status, health = _request(connect(), "GET", "/health")
+    assert status == 200 and health["status"] == "ok" and health["workers"] == 1
+
+
+def test_unix_socket_and_loopback_only(serving, sample_csv, tmp_path):
+    path = tmp_path / "di.sock"
+    connect = serving(socket_path=path)
+    assert path.stat().st_mode & 0o777 == 0o600
+    status, job = _request(connect(), "POST", "/analyze", {"csv": str(sample_csv)})
+    assert status == 200 and job["state"] == "ok"
+
+    check_loopback("::1")
+    with pytest.raises(ValueError, match="non-loopback"):
+        check_loopback("0.0.0.0")
+
+
+def test_socket_path_that_is_not_a_socket_is_left_alone(serving, tmp_path):
+    precious = tmp_path / "precious.txt"
+    precious.write_text("keep me")
+    queue = JobQueue(tmp_path / "root", workers=1)
+    try:
+        with pytest.raises(ValueError, match="not a socket"):
+            make_server(queue, socket_path=precious)
+    finally:
+        queue.close()
+    assert precious.read_text() == "keep me"
+
+    stale = tmp_path / "stale.sock"
+    serving(socket_path=stale)
+    status, health = _request(serving(socket_path=stale)(), "GET", "/health")
+    assert status == 200 and health["status"] == "ok"
+
+
+def test_outdir_confinement_and_browser_requests_are_refused(serving, sample_csv, tmp_path):
+    connect = serving()
+    for outdir in ["../escape", str(tmp_path / "elsewhere"), "."]:
+        status, error = _request(connect(), "POST", "/analyze", {"csv": str(sample_csv), "outdir": outdir})
+        assert status == 400 and error["error"].startswith("outdir must be a directory under")
+    assert not (tmp_path / "root" / "escape").exists() and not (tmp_path / "elsewhere").exists()
+
+    body = {"csv": str(sample_csv)}
+    assert _request(connect(), "POST", "/analyze", body, {"Content-Type": "text/plain"})[0] == 415
+    assert _request(connect(), "POST", "/analyze", body, {"Host": "evil.example:8765"})[0] == 403
+    assert _request(connect(), "GET", "/health", headers={"Host": "evil.example"})[0] == 403
+    assert _request(connect(), "GET", "/health", headers={"Host": "[::1]:8765"})[0] == 200
+    # None of the refused requests queued a job.
+    assert _request(connect(), "GET", "/health")[1]["pending"] == 0
+
+
+def test_data_dirs_limit_readable_files(serving, sample_csv, tmp_path):
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    inside = allowed / "data.csv"
+    inside.write_bytes(sample_csv.read_bytes())
+    connect = serving(data_dirs=[allowed])
+
+    status, error = _request(connect(), "POST", "/analyze", {"csv": str(sample_csv)})
+    assert status == 400 and "data directories" in error["error"]
+    status, error = _request(connect(), "POST", "/analyze", {"csv": str(allowed / ".." / sample_csv.name)})
+    assert status == 400
+    status, job = _request(connect(), "POST", "/analyze", {"csv": str(inside)})
+    assert status == 200 and job["state"] == "ok"
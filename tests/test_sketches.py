@@ -0,0 +1,142 @@
+"""Tests for mergeable sketches."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_insights.sketches import (
+    ExactDistinctCounter,
+    HyperLogLog,
+    KLLSketch,
+    distinct_counter_from_dict,
+    hash_values,
+    k_for_error,
+)
+
+PROBS = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+
+def _fill(sketch, values, step=10_000):
+    for start in range(0, len(values), step):
+        sketch.update(values[start : start + step])
+    return sketch
+
+
+def test_kll_bounded_and_accurate():
+    values = np.random.default_rng(11).uniform(0, 1, 200_000)
+    sketch = _fill(KLLSketch(k=512), values)
+
+    assert not sketch.is_exact
+    assert sum(len(level) for level in sketch._levels) < 3 * 512
+    q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+    assert q1 == pytest.approx(0.25, abs=0.02)
+    assert median == pytest.approx(0.5, abs=0.02)
+    assert q3 == pytest.approx(0.75, abs=0.02)
+
+
+def test_kll_exact_below_capacity_matches_numpy():
+    values = np.random.default_rng(3).normal(size=1_000)
+    sketch = _fill(KLLSketch(k=2048), values, step=97)
+
+    assert sketch.is_exact
+    assert sketch.rank_error == 0.0
+    assert sketch.quantiles(PROBS) == pytest.approx(np.quantile(values, PROBS).tolist())
+
+
+@pytest.mark.parametrize("rank_error", [0.01, 0.002])
+def test_kll_for_error_meets_requested_error(rank_error):
+    values = np.random.default_rng(5).uniform(0, 1, 200_000)
+    sketch = _fill(KLLSketch.for_error(rank_error), values, step=7_000)
+
+    assert sketch.k == k_for_error(rank_error)
+    assert sketch.rank_error <= rank_error
+    assert np.abs(np.array(sketch.quantiles(PROBS)) - PROBS).max() <= 3 * rank_error
+
+
+def test_kll_merge_matches_single_sketch_accuracy():
+    values = np.random.default_rng(7).uniform(0, 1, 120_000)
+    parts = [_fill(KLLSketch(k=256, seed=i), chunk) for i, chunk in enumerate(np.split(values, 4))]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.count == len(values)
+    assert np.abs(np.array(merged.quantiles(PROBS)) - PROBS).max() <= 3 * merged.rank_error
+
+
+def test_kll_histogram_matches_numpy():
+    values = np.random.default_rng(9).exponential(size=50_000)
+    edges = np.linspace(values.min(), values.max(), 31)
+    expected, _ = np.histogram(values, bins=edges)
+
+    exact = _fill(KLLSketch(k=100_000), values)
+    np.testing.assert_array_equal(exact.histogram(edges), expected)
+
+    compacted = _fill(KLLSketch(k=1024), values)
+    counts = compacted.histogram(edges)
+    assert counts.sum() == len(values)
+    assert np.abs(np.cumsum(counts) - np.cumsum(expected)).max() <= 3 * compacted.rank_error * len(values)
+
+
+def test_kll_for_error_rejects_invalid_error():
+    with pytest.raises(ValueError):
+        KLLSketch.for_error(0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 50, 5_000, 300_000])
+def test_hll_estimate_within_error_bound(n):
+    sketch = HyperLogLog()
+    sketch.update(pd.Series(np.arange(n)).map(lambda v: f"id-{v}") if n < 10_000 else pd.Series(np.arange(n)))
+
+    assert abs(sketch.count() - n) <= 3 * sketch.relative_error * n + 1
+
+
+def test_hll_merge_equals_union():
+    values = pd.Series(np.random.default_rng(2).integers(0, 50_000, 200_000))
+    whole = HyperLogLog()
+    whole.update(values)
+
+    left, right = HyperLogLog(), HyperLogLog()
+    left.update(values.iloc[:120_000])
+    right.update(values.iloc[120_000:])
+    left.merge(right)
+
+    np.testing.assert_array_equal(left.registers, whole.registers)
+    assert left.count() == whole.count()
+
+
+def test_hash_values_keeps_integers_beyond_float_precision_apart(tmp_path):
+    ids = pd.Series(np.arange(2**60, 2**60 + 2000, dtype=np.int64))
+    assert len(np.unique(hash_values(ids))) == 2000
+
+    # Integers float64 holds exactly hash like the equal floats, as before.
+    small = pd.Series([3, -7, 2**60], dtype=np.int64)
+    np.testing.assert_array_equal(hash_values(small), hash_values(small.astype(np.float64)))
+
+    from dataset_insights.stream import analyze_stream
+
+    path = tmp_path / "ids.csv"
+    pd.DataFrame({"id": ids}).to_csv(path, index=False)
+    schema = analyze_stream(path, chunksize=300).schema
+    assert schema[0]["unique_count"] == 2000
+
+
+def test_hll_absorbs_exact_counter_and_roundtrips():
+    exact = ExactDistinctCounter()
+    exact.update(pd.Series(["a", "b", "c"]))
+    sketch = HyperLogLog()
+    sketch.update(pd.Series(["c", "d"]))
+    sketch.merge(exact)
+    assert sketch.count() == 4
+
+    restored = distinct_counter_from_dict(sketch.to_dict())
+    assert isinstance(restored, HyperLogLog)
+    assert restored.count() == 4
+    assert isinstance(distinct_counter_from_dict({"hashes": exact.hashes()}), ExactDistinctCounter)
+
+
+def test_hll_rejects_mismatched_precision():
+    with pytest.raises(ValueError, match="precision"):
+        HyperLogLog(precision=12).merge(HyperLogLog(precision=14))
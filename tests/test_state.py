@@ -0,0 +1,145 @@
+"""Tests for mergeable, serializable profile state."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.cli import main
+from dataset_insights.state import (
+    ColumnProfileState,
+    DatasetProfileState,
+    _CorrelationState,
+)
+from dataset_insights.stream import analyze_stream, profile_csv
+
+
+def _write_shards(source, tmp_path, parts):
+    df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    bounds = np.linspace(0, len(df), parts + 1, dtype=int)
+    paths = []
+    for idx, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        shard = tmp_path / f"shard_{idx}.csv"
+        df.iloc[start:stop].to_csv(shard, index=False)
+        paths.append(shard)
+    return paths
+
+
+def test_column_state_merge_matches_single_pass():
+    rng = np.random.default_rng(7)
+    series = pd.Series(rng.normal(size=1_000))
+    series[::17] = np.nan
+
+    whole = ColumnProfileState("x", series.dtype)
+    whole.update(series)
+    left = ColumnProfileState("x", series.dtype)
+    left.update(series.iloc[:400])
+    right = ColumnProfileState("x", series.dtype)
+    right.update(series.iloc[400:])
+    left.merge(right)
+
+    assert left.missing_count == whole.missing_count
+    assert left.distinct.count() == whole.distinct.count()
+    assert left.numeric_summary() == pytest.approx(whole.numeric_summary())
+
+
+def test_correlation_state_merge_handles_different_shifts():
+    rng = np.random.default_rng(3)
+    frame = pd.DataFrame({"a": rng.normal(100, 5, 200), "b": rng.normal(-3, 1, 200)})
+    frame.loc[5, "a"] = np.nan
+
+    left = _CorrelationState(["a", "b"])
+    left.update(frame.iloc[:50])
+    # Offset the second half so the two accumulators pick different shifts.
+    tail = frame.iloc[50:] + 1_000
+    right = _CorrelationState(["a", "b"])
+    right.update(tail)
+    left.merge(right)
+
+    combined = pd.concat([frame.iloc[:50], tail])
+    pd.testing.assert_frame_equal(left.result(), combined.corr(), rtol=1e-9)
+
+
+def test_state_save_load_roundtrip(sample_csv, tmp_path):
+    state = profile_csv(sample_csv, chunksize=3)
+    path = state.save(tmp_path / "sample.state.npz")
+    restored = DatasetProfileState.load(path)
+
+    original = state.to_result()
+    result = restored.to_result()
+    assert result.summary == original.summary
+    assert result.schema == original.schema
+    assert [i.to_dict() for i in result.quality_issues] == [
+        i.to_dict() for i in original.quality_issues
+    ]
+
+
+def test_merged_shards_match_single_pass(sample_csv, tmp_path):
+    expected = analyze_stream(sample_csv)
+
+    states = []
+    for shard in _write_shards(sample_csv, tmp_path, 3):
+        saved = profile_csv(shard).save(shard.with_suffix(".npz"))
+        states.append(DatasetProfileState.load(saved))
+    merged = states[0]
+    for other in states[1:]:
+        merged.merge(other)
+    result = merged.to_result()
+
+    assert result.summary["shape"] == expected.summary["shape"]
+    assert result.schema == expected.schema
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.correlation, expected.correlation, rtol=1e-9)
+    for col, stats in expected.summary["numeric_summary"].items():
+        assert result.summary["numeric_summary"][col] == pytest.approx(stats, nan_ok=True)
+
+
+def test_approx_distinct_shards_merge_and_roundtrip(tmp_path):
+    source = tmp_path / "ids.csv"
+    ids = np.random.default_rng(4).integers(0, 20_000, 30_000)
+    pd.DataFrame({"user": [f"u{v}" for v in ids], "value": ids % 7}).to_csv(source, index=False)
+    exact_counts = {"user": len(np.unique(ids)), "value": 7}
+
+    shards = _write_shards(source, tmp_path, 3)
+    merged = profile_csv(shards[0])  # exact state upgraded by approximate shards
+    for shard in shards[1:]:
+        saved = profile_csv(shard, approx_distinct=True).save(shard.with_suffix(".npz"))
+        merged.merge(DatasetProfileState.load(saved))
+
+    schema = {entry["column"]: entry["unique_count"] for entry in merged.to_result().schema}
+    assert schema["value"] == 7
+    assert schema["user"] == pytest.approx(exact_counts["user"], rel=0.03)
+
+
+def test_merge_rejects_different_columns(sample_csv, duplicates_csv):
+    with pytest.raises(ValueError, match="different columns"):
+        profile_csv(sample_csv).merge(profile_csv(duplicates_csv))
+
+
+def test_merge_rejects_numeric_text_mismatch():
+    numeric = ColumnProfileState("amount", "int64")
+    numeric.update(pd.Series([1, 2, 3]))
+    text = ColumnProfileState("amount", "object")
+    text.update(pd.Series(["1", "oops"], dtype=object))
+    with pytest.raises(ValueError, match="incompatible"):
+        numeric.merge(text)
+
+
+def test_cli_profile_and_merge(sample_csv, tmp_path):
+    runner = CliRunner()
+    state_paths = []
+    for shard in _write_shards(sample_csv, tmp_path, 2):
+        state_path = tmp_path / f"{shard.stem}.state.npz"
+        result = runner.invoke(main, ["profile", str(shard), "--state-out", str(state_path)])
+        assert result.exit_code == 0, result.output
+        state_paths.append(str(state_path))
+
+    outdir = tmp_path / "reports"
+    result = runner.invoke(main, ["merge", *state_paths, "--outdir", str(outdir)])
+    assert result.exit_code == 0, result.output
+    assert "10 rows x 5 columns" in result.output
+    assert (outdir / "summary.md").exists()
+    assert (outdir / "data_quality.json").exists()
+    assert (outdir / "plots" / "box_plot.png").exists()
@@ -0,0 +1,122 @@
+"""Tests for chunked streaming analysis."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from dataset_insights.analyze import ColumnSelection, analyze_frame, coerce_suspicious_to_nan, load_csv
+from dataset_insights.cli import main
+from dataset_insights.stream import analyze_stream
+
+
+def _in_memory(path, selection=None):
+    df, audit = coerce_suspicious_to_nan(load_csv(path, selection=selection))
+    return analyze_frame(df, audit)
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100])
+def test_stream_matches_in_memory(sample_csv, chunksize):
+    expected = _in_memory(sample_csv)
+    result = analyze_stream(sample_csv, chunksize=chunksize)
+
+    assert result.summary["shape"] == expected.summary["shape"]
+    assert result.summary["dtypes"] == expected.summary["dtypes"]
+    assert result.schema == expected.schema
+    pd.testing.assert_frame_equal(result.missingness, expected.missingness)
+    pd.testing.assert_frame_equal(result.outliers, expected.outliers, check_dtype=False)
+    pd.testing.assert_frame_equal(result.correlation, expected.correlation, rtol=1e-9)
+    for col, stats in expected.summary["numeric_summary"].items():
+        assert result.summary["numeric_summary"][col] == pytest.approx(stats, nan_ok=True)
+
+
+def test_stream_column_selection_matches_in_memory(duplicates_csv):
+    selection = ColumnSelection(exclude=["n*"], dtypes={"id": "float64"})
+    expected = _in_memory(duplicates_csv, selection)
+    result = analyze_stream(duplicates_csv, chunksize=2, selection=selection)
+
+    assert result.skipped_columns == expected.skipped_columns != []
+    assert result.schema == expected.schema
+    assert result.duplicates == expected.duplicates
+    assert result.summary["dtypes"]["id"] == "float64"
+
+
+def test_stream_quality_issues_and_audit_match(messy_csv):
+    expected = _in_memory(messy_csv)
+    result = analyze_stream(messy_csv, chunksize=3)
+
+    assert result.suspicious_audit == expected.suspicious_audit
+    assert [i.to_dict() for i in result.quality_issues] == [
+        i.to_dict() for i in expected.quality_issues
+    ]
+
+
+def test_stream_uses_sniffed_delimiter(semicolon_csv):
+    expected = _in_memory(semicolon_csv)
+    result = analyze_stream(semicolon_csv, chunksize=2)
+
+    assert result.summary["shape"] == {"rows": 3, "columns": 5}
+    assert result.schema == expected.schema
+    assert [i.rule for i in result.quality_issues] == [i.rule for i in expected.quality_issues]
+    assert {"blank_column_names", "duplicate_column_names"} <= {i.rule for i in result.quality_issues}
+
+
+@pytest.mark.parametrize("budget", [10**9, 64])
+def test_stream_duplicates_match_in_memory(duplicates_csv, budget):
+    """Duplicate stats and examples match, whether row hashes stay in memory or spill."""
+    expected = _in_memory(duplicates_csv)
+    result = analyze_stream(duplicates_csv, chunksize=2, duplicate_memory_budget=budget)
+
+    assert result.duplicates == expected.duplicates
+
+
+def test_stream_settles_dtype_across_chunks(mixed_type_csv):
+    """A column that is numeric in early chunks but text later is treated as text."""
+    expected = _in_memory(mixed_type_csv)
+    result = analyze_stream(mixed_type_csv, chunksize=2)
+
+    assert result.summary["dtypes"]["amount"] == expected.summary["dtypes"]["amount"]
+    pd.testing.assert_frame_equal(result.parseability, expected.parseability, check_dtype=False)
+
+
+def test_stream_keeps_bools_among_missing_values(tmp_path):
+    """Chunks of bools, of bools and gaps, and of gaps only still give the bools
+    (not "True"/"False" strings) of a whole-file parse, in the schema and examples."""
+    path = tmp_path / "flags.csv"
+    path.write_text("flag,n\nTrue,1\nFalse,2\nTrue,1\n,3\n,4\n,5\nFalse,2\n,3\n")
+    expected = _in_memory(path)
+    result = analyze_stream(path, chunksize=2)
+
+    assert result.schema == expected.schema
+    assert result.schema[0]["sample_values"] == [True, False, True]
+    assert result.duplicates == expected.duplicates
+    assert {row["flag"] for row in result.duplicates["example_rows"]} >= {True, False}
+
+
+def test_stream_empty_csv_exits(empty_csv):
+    with pytest.raises(SystemExit) as exc_info:
+        analyze_stream(empty_csv)
+    assert exc_info.value.code != 0
+
+
+def test_cli_stream_writes_reports(sample_csv, tmp_path):
+    outdir = tmp_path / "reports"
+    result = CliRunner().invoke(
+        main, ["analyze", str(sample_csv), "--outdir", str(outdir), "--stream", "--chunksize", "4"]
+    )
+    assert result.exit_code == 0, result.output
+
+    for name in (
+        "summary.md",
+        "summary_statistics.csv",
+        "schema.json",
+        "missingness.csv",
+        "duplicates.csv",
+        "correlation.csv",
+        "outliers.csv",
+        "data_quality.json",
+    ):
+        assert (outdir / name).exists()
+    for name in ("distribution_histogram", "correlation_heatmap", "missingness_bar", "box_plot"):
+        assert (outdir / "plots" / f"{name}.png").exists()